@@ -65,8 +65,9 @@ class TextToNEIAdapter(Adapter):
             text = str(raw)
             source_ref = {"kind": "text", "note": "string-input"}
 
-        resp = self.llm.respond(text, system=self.system_prompt)
-        obj = extract_nei_from_tagged_or_json(resp.text)
+        # Stream and stop at </nei>: small models often keep generating after the block.
+        reply = "".join(self.llm.stream(text, system=self.system_prompt, stop=["</nei>"]))
+        obj = extract_nei_from_tagged_or_json(reply)
 
         label = obj.get("label", "unknown")
         if label not in ("success", "failure", "unknown"):
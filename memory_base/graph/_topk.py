@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, Sequence
+
+from .metrics import BlockSimilarityMetric, NodeAccessor, SimilarityMetric, prefetch_nodes
+from .types import NodeRef
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .edge_builders import BuildEdgesConfig
+
+
+def _score_block(
+    nodes: Sequence[NodeRef],
+    metric: SimilarityMetric,
+    accessor: NodeAccessor,
+    r0: int,
+    r1: int,
+    c0: int,
+    c1: int,
+) -> Any:
+    """
+    Score rows [r0, r1) x cols [c0, c1) as a float64 array with self-pairs set to -inf.
+    """
+
+    import numpy as np
+
+    rows, cols = nodes[r0:r1], nodes[c0:c1]
+    prefetch_nodes(accessor, [*rows, *cols])
+    if isinstance(metric, BlockSimilarityMetric):
+        block = np.array(metric.similarity_block(rows=rows, cols=cols, accessor=accessor), dtype=np.float64)
+    else:
+        block = np.empty((len(rows), len(cols)), dtype=np.float64)
+        for di, u in enumerate(rows):
+            for dj, v in enumerate(cols):
+                if r0 + di != c0 + dj:
+                    block[di, dj] = metric.similarity(u=u, v=v, accessor=accessor)
+    lo, hi = max(r0, c0), min(r1, c1)
+    if lo < hi:
+        diag = np.arange(lo, hi)
+        block[diag - r0, diag - c0] = -np.inf
+    return block
+
+
+def _block_candidates(block: Any, config: BuildEdgesConfig, c0: int) -> list[tuple[Any, Any]]:
+    """
+    Per-row (column indices, scores) worth keeping from one block.
+
+    For top-k this is the k best of the block plus anything tied with the k-th,
+    so that a later (score desc, column asc) merge matches the pairwise path.
+    """
+
+    import numpy as np
+
+    width = block.shape[1]
+    if config.top_k is not None:
+        k = int(config.top_k)
+        if width > k:
+            kth = np.partition(block, width - k, axis=1)[:, width - k]
+            mask = block >= kth[:, None]
+        else:
+            mask = np.ones_like(block, dtype=bool)
+    else:
+        assert config.min_similarity is not None
+        mask = block >= config.min_similarity
+
+    out: list[tuple[Any, Any]] = []
+    for di in range(block.shape[0]):
+        js = np.nonzero(mask[di])[0]
+        out.append((js + c0, block[di, js]))
+    return out
+
+
+def _merge_candidates(cj: Any, cs: Any, js: Any, ss: Any, config: BuildEdgesConfig) -> tuple[Any, Any]:
+    import numpy as np
+
+    cj = np.concatenate([cj, js])
+    cs = np.concatenate([cs, ss])
+    if config.top_k is not None:
+        order = np.lexsort((cj, -cs))[: int(config.top_k)]
+        return cj[order], cs[order]
+    return cj, cs
+
+
+def _finalize_row(i: int, cj: Any, cs: Any, config: BuildEdgesConfig) -> list[tuple[int, float]]:
+    """
+    Emission order for row i: top-k candidates are already ranked by the merge;
+    threshold candidates are put back into column order.
+    """
+
+    import numpy as np
+
+    if config.top_k is None:
+        order = np.argsort(cj, kind="stable")
+        cj, cs = cj[order], cs[order]
+    return [(j, s) for j, s in zip(cj.tolist(), cs.tolist()) if j != i]
@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Mapping, Sequence
+
+from .metrics import NodeAccessor, fetch_nodes
+from .types import NodeRef
+
+
+@dataclass
+class CachingNodeAccessor:
+    """
+    Bounded LRU cache in front of another NodeAccessor.
+
+    - misses are fetched with one `fetch_nodes()` call (a single `get_nodes()`
+      when the inner accessor is a BulkNodeAccessor)
+    - `fields` projects cached records to what the metrics actually read
+      (e.g. ("embedding",) or ("situation", "attempt", "reflection"))
+    - `prefetch()` is called by the edge builders once per tile, so a
+      DB-backed accessor sees O(n^2 / tile_size) bulk queries instead of
+      O(n^2) single-node lookups
+
+    Keep `max_entries` at least 2 * tile_size so a row tile and a column tile
+    fit together.
+    """
+
+    accessor: NodeAccessor
+    max_entries: int = 10_000
+    fields: Sequence[str] | None = None
+    hits: int = field(default=0, init=False)
+    misses: int = field(default=0, init=False)
+    _lru: OrderedDict[NodeRef, Mapping[str, Any]] = field(default_factory=OrderedDict, init=False, repr=False)
+
+    def get_node(self, node: NodeRef) -> Mapping[str, Any]:
+        return self.get_nodes([node])[0]
+
+    def get_nodes(self, nodes: Sequence[NodeRef]) -> Sequence[Mapping[str, Any]]:
+        missing = [n for n in dict.fromkeys(nodes) if n not in self._lru]
+        fetched: dict[NodeRef, Mapping[str, Any]] = {}
+        if missing:
+            self.misses += len(missing)
+            for n, data in zip(missing, fetch_nodes(self.accessor, missing)):
+                fetched[n] = self._project(data)
+
+        out: list[Mapping[str, Any]] = []
+        for n in nodes:
+            data = fetched.get(n)
+            if data is None:
+                data = self._lru[n]
+                self._lru.move_to_end(n)
+                self.hits += 1
+            out.append(data)
+        for n, data in fetched.items():
+            self._lru[n] = data
+        while len(self._lru) > self.max_entries:
+            self._lru.popitem(last=False)
+        return out
+
+    def prefetch(self, nodes: Sequence[NodeRef]) -> None:
+        missing = [n for n in dict.fromkeys(nodes) if n not in self._lru]
+        if missing:
+            self.misses += len(missing)
+            for n, data in zip(missing, fetch_nodes(self.accessor, missing)):
+                self._lru[n] = self._project(data)
+        for n in nodes:
+            if n in self._lru:
+                self._lru.move_to_end(n)
+        while len(self._lru) > self.max_entries:
+            self._lru.popitem(last=False)
+
+    def _project(self, data: Mapping[str, Any]) -> Mapping[str, Any]:
+        if self.fields is None:
+            return data
+        return {f: data[f] for f in self.fields if f in data}
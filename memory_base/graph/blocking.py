@@ -0,0 +1,157 @@
+from __future__ import annotations
+
+import random
+import zlib
+from dataclasses import dataclass
+from itertools import combinations
+from typing import Any, Sequence
+
+from .metrics import NodeAccessor, SimilarityMetric, fetch_nodes, node_tokens
+from .types import NodeRef
+
+
+# Mersenne prime 2^31 - 1: a * x + b stays below 2^63 for 31-bit a, b, x.
+_PRIME = (1 << 31) - 1
+
+
+@dataclass
+class MinHashLSH:
+    """
+    MinHash + banded LSH candidate generation (blocking) over NEI text fields.
+
+    Each node's token set is summarized by `bands * rows` MinHash values; two
+    nodes become a candidate pair when all `rows` values of at least one band
+    agree. For Jaccard similarity s, the pair is proposed with probability
+    1 - (1 - s^rows)^bands, i.e. the S-curve is steepest around
+    (1 / bands) ** (1 / rows) (see `threshold`).
+
+    Use `lsh_recall_report()` to check recall against exact scores before
+    feeding the candidates to `iter_similarity_edges(candidates=...)`.
+    """
+
+    fields: Sequence[str] = ("situation", "attempt", "reflection")
+    bands: int = 16
+    rows: int = 4
+    seed: int = 0
+    # Buckets larger than this are skipped (e.g. boilerplate text shared by many nodes).
+    max_bucket_size: int | None = None
+
+    @property
+    def num_perm(self) -> int:
+        return self.bands * self.rows
+
+    @property
+    def threshold(self) -> float:
+        return (1.0 / self.bands) ** (1.0 / self.rows)
+
+    def signatures(self, nodes: Sequence[NodeRef], accessor: NodeAccessor) -> Any:
+        """
+        MinHash signatures of shape (len(nodes), num_perm), dtype uint64.
+        Nodes without tokens get an all-max row and never become candidates.
+        """
+
+        import numpy as np
+
+        rng = random.Random(self.seed)
+        a = np.array([rng.randrange(1, _PRIME) for _ in range(self.num_perm)], dtype=np.uint64)
+        b = np.array([rng.randrange(0, _PRIME) for _ in range(self.num_perm)], dtype=np.uint64)
+
+        sig = np.full((len(nodes), self.num_perm), _PRIME, dtype=np.uint64)
+        for i, data in enumerate(fetch_nodes(accessor, nodes)):
+            tokens = node_tokens(data, self.fields)
+            if not tokens:
+                continue
+            x = np.fromiter(
+                (zlib.crc32(t.encode("utf-8")) % _PRIME for t in tokens),
+                dtype=np.uint64,
+                count=len(tokens),
+            )
+            sig[i] = ((x[:, None] * a[None, :] + b[None, :]) % _PRIME).min(axis=0)
+        return sig
+
+    def candidate_pairs(self, nodes: Sequence[NodeRef], accessor: NodeAccessor) -> list[tuple[int, int]]:
+        """
+        Sorted list of candidate index pairs (i, j) with i < j.
+        """
+
+        import numpy as np
+
+        sig = self.signatures(nodes, accessor)
+        empty = (sig == _PRIME).all(axis=1)
+        pairs: set[tuple[int, int]] = set()
+        for band in range(self.bands):
+            chunk = np.ascontiguousarray(sig[:, band * self.rows : (band + 1) * self.rows])
+            buckets: dict[bytes, list[int]] = {}
+            for i in range(len(nodes)):
+                if not empty[i]:
+                    buckets.setdefault(chunk[i].tobytes(), []).append(i)
+            for members in buckets.values():
+                if len(members) < 2:
+                    continue
+                if self.max_bucket_size is not None and len(members) > self.max_bucket_size:
+                    continue
+                pairs.update(combinations(members, 2))
+        return sorted(pairs)
+
+
+@dataclass(frozen=True)
+class LSHRecallReport:
+    """
+    Recall of LSH candidates against exact scores on a node sample.
+    - true_pairs: sampled pairs with exact score >= min_similarity
+    - recalled_pairs: how many of those the LSH proposed
+    - candidate_fraction: candidates / all pairs on the full node set
+    """
+
+    sample_size: int
+    min_similarity: float
+    true_pairs: int
+    recalled_pairs: int
+    recall: float
+    candidate_pairs: int
+    candidate_fraction: float
+    lsh_threshold: float
+
+
+def lsh_recall_report(
+    *,
+    lsh: MinHashLSH,
+    nodes: Sequence[NodeRef],
+    accessor: NodeAccessor,
+    metric: SimilarityMetric,
+    min_similarity: float,
+    sample_size: int = 500,
+    seed: int = 0,
+    candidates: Sequence[tuple[int, int]] | None = None,
+) -> LSHRecallReport:
+    """
+    Compare LSH candidates with exact `metric` scores over all pairs of a random
+    node sample (O(sample_size^2) metric calls). Pass precomputed `candidates`
+    to avoid re-running the LSH.
+    """
+
+    if candidates is None:
+        candidates = lsh.candidate_pairs(nodes, accessor)
+    cand = set(candidates)
+
+    n = len(nodes)
+    sample = sorted(random.Random(seed).sample(range(n), min(sample_size, n)))
+    true_pairs = 0
+    recalled = 0
+    for i, j in combinations(sample, 2):
+        if metric.similarity(u=nodes[i], v=nodes[j], accessor=accessor) >= min_similarity:
+            true_pairs += 1
+            if (i, j) in cand:
+                recalled += 1
+
+    all_pairs = n * (n - 1) // 2
+    return LSHRecallReport(
+        sample_size=len(sample),
+        min_similarity=min_similarity,
+        true_pairs=true_pairs,
+        recalled_pairs=recalled,
+        recall=recalled / true_pairs if true_pairs else 1.0,
+        candidate_pairs=len(cand),
+        candidate_fraction=len(cand) / all_pairs if all_pairs else 0.0,
+        lsh_threshold=lsh.threshold,
+    )
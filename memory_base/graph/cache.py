@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any
+
+from .metrics import MetricSpec, NodeAccessor, SimilarityMetric
+from .types import NodeRef
+
+
+@dataclass
+class CachedSimilarityMetric(SimilarityMetric):
+    """
+    Memoizing wrapper around any SimilarityMetric.
+
+    Scores are keyed by (MetricSpec, u, v); for symmetric metrics (u, v) and
+    (v, u) share one entry. The in-memory tier is an LRU bounded by
+    `max_entries`. With `path` set, scores are also persisted to a SQLite file
+    so later processes (e.g. a rebuild with another `top_k`/`min_similarity`)
+    only rerun edge selection, not scoring. Disk writes are committed every
+    `commit_every` new scores and on `flush()` / `close()`.
+
+    The wrapper scores per pair, so it is meant for expensive non-vectorized
+    metrics; block metrics are usually cheaper to recompute.
+    """
+
+    metric: SimilarityMetric
+    spec: MetricSpec
+    max_entries: int = 1_000_000
+    path: str | None = None
+    commit_every: int = 1000
+    hits: int = field(default=0, init=False)
+    misses: int = field(default=0, init=False)
+    _lru: OrderedDict[tuple[str, str, str, str], float] = field(default_factory=OrderedDict, init=False, repr=False)
+    _spec_key: str = field(default="", init=False, repr=False)
+    _db: sqlite3.Connection | None = field(default=None, init=False, repr=False)
+    _pending: int = field(default=0, init=False, repr=False)
+    _lock: Any = field(default_factory=threading.Lock, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self.name = self.metric.name
+        self.symmetric = self.metric.symmetric
+        self._spec_key = json.dumps(
+            {"name": self.spec.name, "params": self.spec.params}, sort_keys=True, default=repr
+        )
+        self._connect()
+
+    def __getstate__(self) -> dict[str, Any]:
+        # Picklable for process pools: workers reopen the SQLite file themselves.
+        self.flush()
+        state = dict(self.__dict__)
+        state["_db"] = None
+        state["_lock"] = None
+        return state
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+        self._connect()
+
+    def _connect(self) -> None:
+        if self.path is None:
+            return
+        self._db = sqlite3.connect(self.path, check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS similarity ("
+            "spec TEXT, u_layer TEXT, u_id TEXT, v_layer TEXT, v_id TEXT, score REAL, "
+            "PRIMARY KEY (spec, u_layer, u_id, v_layer, v_id))"
+        )
+        self._db.commit()
+
+    def similarity(self, *, u: NodeRef, v: NodeRef, accessor: NodeAccessor) -> float:
+        if self.symmetric and (v.layer, v.id) < (u.layer, u.id):
+            u, v = v, u
+        key = (u.layer, u.id, v.layer, v.id)
+
+        with self._lock:
+            score = self._lru.get(key)
+            if score is not None:
+                self._lru.move_to_end(key)
+                self.hits += 1
+                return score
+            if self._db is not None:
+                row = self._db.execute(
+                    "SELECT score FROM similarity WHERE spec=? AND u_layer=? AND u_id=? AND v_layer=? AND v_id=?",
+                    (self._spec_key, *key),
+                ).fetchone()
+                if row is not None:
+                    self.hits += 1
+                    self._remember(key, float(row[0]))
+                    return float(row[0])
+            self.misses += 1
+
+        score = float(self.metric.similarity(u=u, v=v, accessor=accessor))
+        with self._lock:
+            self._remember(key, score)
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO similarity VALUES (?, ?, ?, ?, ?, ?)",
+                    (self._spec_key, *key, score),
+                )
+                self._pending += 1
+                if self._pending >= self.commit_every:
+                    self._db.commit()
+                    self._pending = 0
+        return score
+
+    def flush(self) -> None:
+        """
+        Commit pending disk writes.
+        """
+
+        with self._lock:
+            if self._db is not None:
+                self._db.commit()
+                self._pending = 0
+
+    def close(self) -> None:
+        with self._lock:
+            if self._db is not None:
+                self._db.commit()
+                self._db.close()
+                self._db = None
+
+    def clear(self) -> None:
+        """
+        Drop the in-memory tier (the disk tier is kept).
+        """
+
+        with self._lock:
+            self._lru.clear()
+
+    def _remember(self, key: tuple[str, str, str, str], score: float) -> None:
+        self._lru[key] = score
+        self._lru.move_to_end(key)
+        while len(self._lru) > self.max_entries:
+            self._lru.popitem(last=False)
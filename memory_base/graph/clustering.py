@@ -0,0 +1,200 @@
+from __future__ import annotations
+
+import random
+from dataclasses import dataclass
+from typing import Any, Iterable, Literal, Mapping, Sequence
+
+from .metrics import MetricSpec
+from .types import Edge, Layer, NodeRef
+
+
+ClusterMethod = Literal["components", "label_propagation"]
+
+
+@dataclass(frozen=True)
+class ClusterEdgesConfig:
+    """
+    How to turn a sparse similarity graph into L2 clusters + member_of edges.
+
+    - components: union-find over edges with weight >= min_similarity
+    - label_propagation: weighted label propagation (community detection),
+      at most `max_iter` sweeps over the edges
+    - max_memberships > 1 enables soft multi-membership: a node also joins the
+      clusters holding at least `min_membership` of its neighbor weight
+    """
+
+    method: ClusterMethod = "label_propagation"
+    min_similarity: float | None = None
+    max_iter: int = 20
+    min_cluster_size: int = 2
+    max_memberships: int = 1
+    min_membership: float = 0.0
+    edge_type: str = "member_of"
+    cluster_layer: Layer = "L2"
+    cluster_prefix: str = "cluster"
+    seed: int = 0
+
+
+@dataclass(frozen=True)
+class ClusteringResult:
+    """
+    - clusters: new cluster nodes, ordered by their first member
+    - members: cluster -> member nodes (primary and secondary)
+    - edges: member_of edges (member -> cluster) weighted by membership share
+    """
+
+    clusters: list[NodeRef]
+    members: dict[NodeRef, list[NodeRef]]
+    edges: list[Edge]
+
+
+def build_cluster_edges(
+    *,
+    edges: Iterable[Edge],
+    config: ClusterEdgesConfig,
+    nodes: Sequence[NodeRef] = (),
+    metric_spec: MetricSpec | None = None,
+) -> ClusteringResult:
+    """
+    Cluster nodes over a sparse (e.g. top-k) similarity graph — the clustering
+    EdgeBuilder strategy. Runs in O(iterations * edges); no dense matrix.
+
+    Edges are treated as undirected (directed input is symmetrized, keeping
+    the larger weight); edges without weight count as 1.0. `nodes` pins the
+    node order and includes isolated nodes.
+    """
+
+    pos: dict[NodeRef, int] = {}
+    node_list: list[NodeRef] = []
+
+    def intern(n: NodeRef) -> int:
+        i = pos.get(n)
+        if i is None:
+            i = pos[n] = len(node_list)
+            node_list.append(n)
+        return i
+
+    for n in nodes:
+        intern(n)
+    adj: list[dict[int, float]] = [{} for _ in node_list]
+    for e in edges:
+        w = 1.0 if e.weight is None else float(e.weight)
+        if config.min_similarity is not None and w < config.min_similarity:
+            continue
+        i, j = intern(e.src), intern(e.dst)
+        adj.extend({} for _ in range(len(node_list) - len(adj)))
+        if i == j:
+            continue
+        if w > adj[i].get(j, float("-inf")):
+            adj[i][j] = w
+            adj[j][i] = w
+
+    if config.method == "components":
+        labels = _components(adj)
+    elif config.method == "label_propagation":
+        labels = _label_propagation(adj, max_iter=config.max_iter, seed=config.seed)
+    else:
+        raise ValueError(f"unknown clustering method: {config.method!r}")
+
+    # Materialize clusters large enough, numbered by their first member.
+    sizes: dict[int, int] = {}
+    for lab in labels:
+        sizes[lab] = sizes.get(lab, 0) + 1
+    cluster_of_label: dict[int, NodeRef] = {}
+    for lab in labels:
+        if lab not in cluster_of_label and sizes[lab] >= config.min_cluster_size:
+            cluster_of_label[lab] = NodeRef(
+                id=f"{config.cluster_prefix}:{len(cluster_of_label)}", layer=config.cluster_layer
+            )
+
+    meta: dict[str, Any] = {"clustering": config.method}
+    if metric_spec is not None:
+        meta.update({"metric": metric_spec.name, "metric_params": metric_spec.params})
+
+    members: dict[NodeRef, list[NodeRef]] = {c: [] for c in cluster_of_label.values()}
+    out: list[Edge] = []
+    for i, node in enumerate(node_list):
+        for lab, share in _memberships(i, labels, adj, config):
+            cluster = cluster_of_label.get(lab)
+            if cluster is None:
+                continue
+            members[cluster].append(node)
+            out.append(Edge(src=node, dst=cluster, edge_type=config.edge_type, weight=share, meta=meta))
+
+    return ClusteringResult(clusters=list(cluster_of_label.values()), members=members, edges=out)
+
+
+def _memberships(
+    i: int,
+    labels: Sequence[int],
+    adj: Sequence[Mapping[int, float]],
+    config: ClusterEdgesConfig,
+) -> list[tuple[int, float]]:
+    """
+    (label, share of neighbor weight) for node i; its own label always comes first.
+    """
+
+    own = labels[i]
+    total = sum(adj[i].values())
+    if total <= 0:
+        return [(own, 1.0)]
+    by_label: dict[int, float] = {}
+    for j, w in adj[i].items():
+        by_label[labels[j]] = by_label.get(labels[j], 0.0) + w
+
+    out = [(own, by_label.pop(own, 0.0) / total if config.max_memberships > 1 else 1.0)]
+    if config.max_memberships > 1:
+        ranked = sorted(by_label.items(), key=lambda t: (-t[1], t[0]))
+        for lab, w in ranked[: config.max_memberships - 1]:
+            share = w / total
+            if share >= config.min_membership:
+                out.append((lab, share))
+    return out
+
+
+def _components(adj: Sequence[Mapping[int, float]]) -> list[int]:
+    parent = list(range(len(adj)))
+
+    def find(x: int) -> int:
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    for i, nbrs in enumerate(adj):
+        for j in nbrs:
+            ri, rj = find(i), find(j)
+            if ri != rj:
+                # Smallest index becomes the root, so labels are order-stable.
+                if ri < rj:
+                    parent[rj] = ri
+                else:
+                    parent[ri] = rj
+    return [find(i) for i in range(len(adj))]
+
+
+def _label_propagation(adj: Sequence[Mapping[int, float]], *, max_iter: int, seed: int) -> list[int]:
+    """
+    Asynchronous weighted label propagation; ties go to the smallest label and
+    the sweep order is a seeded shuffle, so results are deterministic.
+    """
+
+    labels = list(range(len(adj)))
+    order = list(range(len(adj)))
+    rng = random.Random(seed)
+    for _ in range(max_iter):
+        rng.shuffle(order)
+        changed = False
+        for i in order:
+            if not adj[i]:
+                continue
+            score: dict[int, float] = {}
+            for j, w in adj[i].items():
+                score[labels[j]] = score.get(labels[j], 0.0) + w
+            best = max(score.items(), key=lambda t: (t[1], -t[0]))[0]
+            if best != labels[i] and score[best] > score.get(labels[i], float("-inf")):
+                labels[i] = best
+                changed = True
+        if not changed:
+            break
+    return labels
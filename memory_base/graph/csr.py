@@ -0,0 +1,194 @@
+from __future__ import annotations
+
+import json
+import math
+from dataclasses import dataclass, field
+from typing import Any, Iterable, Iterator, Mapping, Sequence
+
+from .metrics import MetricSpec
+from .types import Edge, NodeRef
+
+
+@dataclass(frozen=True)
+class CSRAdjacency:
+    """
+    Out-edges of one edge type in CSR form.
+    - indptr: int64, shape (num_nodes + 1,); row i is indptr[i]:indptr[i + 1]
+    - indices: int32 destination node ids
+    - weights: float32 (NaN for edges without weight); Edge weights are rounded to float32
+    - meta_ids: int32 row in CSRGraph.meta_table (-1 for no metadata)
+    """
+
+    indptr: Any
+    indices: Any
+    weights: Any
+    meta_ids: Any
+
+    @property
+    def nbytes(self) -> int:
+        return int(self.indptr.nbytes + self.indices.nbytes + self.weights.nbytes + self.meta_ids.nbytes)
+
+
+@dataclass
+class CSRGraph:
+    """
+    Compact, read-only adjacency store for large edge sets.
+
+    Node refs and edge types are interned to integers; each edge type keeps its
+    own CSR arrays, and edge metadata is stored once per distinct value in
+    `meta_table` (builders emit one value per MetricSpec). An edge costs
+    12 bytes (+ 8 per node for indptr) instead of a dataclass with a dict.
+
+    Neighbor lookups are O(degree) array slices. Convert with `from_edges()` /
+    `to_edges()`; the edge order within each source node is preserved.
+    Weights are stored as float32 to keep edges small, so the conversion is
+    lossy: `to_edges()` returns weights rounded to float32 (exact only for
+    float32-representable values such as 0.5). Keep the Edge list where
+    full-precision weights matter.
+    """
+
+    nodes: list[NodeRef] = field(default_factory=list)
+    edge_types: list[str] = field(default_factory=list)
+    adjacency: dict[str, CSRAdjacency] = field(default_factory=dict)
+    meta_table: list[Mapping[str, Any]] = field(default_factory=list)
+    _node_pos: dict[NodeRef, int] = field(default_factory=dict, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self._node_pos = {n: i for i, n in enumerate(self.nodes)}
+
+    @classmethod
+    def from_edges(cls, edges: Iterable[Edge], *, nodes: Sequence[NodeRef] = ()) -> "CSRGraph":
+        """
+        Build from Edge objects. `nodes` pins the id order of (possibly isolated)
+        nodes; other endpoints are interned in first-seen order.
+        """
+
+        import numpy as np
+
+        node_pos: dict[NodeRef, int] = {}
+        node_list: list[NodeRef] = []
+
+        def intern(n: NodeRef) -> int:
+            pos = node_pos.get(n)
+            if pos is None:
+                pos = node_pos[n] = len(node_list)
+                node_list.append(n)
+            return pos
+
+        for n in nodes:
+            intern(n)
+
+        meta_pos: dict[str, int] = {}
+        meta_table: list[Mapping[str, Any]] = []
+        # edge_type -> parallel columns (src, dst, weight, meta_id)
+        cols: dict[str, tuple[list[int], list[int], list[float], list[int]]] = {}
+        for e in edges:
+            src, dst, w, m = cols.setdefault(e.edge_type, ([], [], [], []))
+            src.append(intern(e.src))
+            dst.append(intern(e.dst))
+            w.append(math.nan if e.weight is None else float(e.weight))
+            if e.meta is None:
+                m.append(-1)
+            else:
+                key = _meta_key(e.meta)
+                mid = meta_pos.get(key)
+                if mid is None:
+                    mid = meta_pos[key] = len(meta_table)
+                    meta_table.append(e.meta)
+                m.append(mid)
+
+        num_nodes = len(node_list)
+        adjacency: dict[str, CSRAdjacency] = {}
+        for edge_type, (src, dst, w, m) in cols.items():
+            src_arr = np.asarray(src, dtype=np.int64)
+            order = np.argsort(src_arr, kind="stable")
+            counts = np.bincount(src_arr, minlength=num_nodes)
+            indptr = np.zeros(num_nodes + 1, dtype=np.int64)
+            np.cumsum(counts, out=indptr[1:])
+            adjacency[edge_type] = CSRAdjacency(
+                indptr=indptr,
+                indices=np.asarray(dst, dtype=np.int32)[order],
+                weights=np.asarray(w, dtype=np.float32)[order],
+                meta_ids=np.asarray(m, dtype=np.int32)[order],
+            )
+
+        return cls(nodes=node_list, edge_types=list(cols), adjacency=adjacency, meta_table=meta_table)
+
+    @property
+    def num_edges(self) -> int:
+        return sum(int(a.indices.shape[0]) for a in self.adjacency.values())
+
+    @property
+    def nbytes(self) -> int:
+        """
+        Bytes held by the CSR arrays (excludes the interned node/meta tables).
+        """
+
+        return sum(a.nbytes for a in self.adjacency.values())
+
+    def node_id(self, node: NodeRef) -> int | None:
+        return self._node_pos.get(node)
+
+    def metric_spec(self, meta_id: int) -> MetricSpec | None:
+        """
+        MetricSpec stored in a builder-style meta entry ({"metric", "metric_params"}).
+        """
+
+        if meta_id < 0:
+            return None
+        meta = self.meta_table[meta_id]
+        if "metric" not in meta:
+            return None
+        return MetricSpec(name=str(meta["metric"]), params=meta.get("metric_params"))
+
+    def neighbors(self, node: NodeRef, edge_type: str) -> tuple[Any, Any]:
+        """
+        (destination ids, weights) array slices for one node and edge type.
+        Map ids back with `graph.nodes[i]`.
+        """
+
+        import numpy as np
+
+        adj = self.adjacency.get(edge_type)
+        i = self._node_pos.get(node)
+        if adj is None or i is None:
+            return np.empty(0, dtype=np.int32), np.empty(0, dtype=np.float32)
+        lo, hi = int(adj.indptr[i]), int(adj.indptr[i + 1])
+        return adj.indices[lo:hi], adj.weights[lo:hi]
+
+    def out_edges(self, node: NodeRef, edge_types: Iterable[str] | None = None) -> Iterator[Edge]:
+        """
+        Materialize a node's out-edges as Edge objects (for small neighborhoods only).
+        """
+
+        i = self._node_pos.get(node)
+        if i is None:
+            return
+        types = self.edge_types if edge_types is None else [t for t in edge_types if t in self.adjacency]
+        for edge_type in types:
+            adj = self.adjacency[edge_type]
+            yield from self._row_edges(adj, edge_type, i)
+
+    def to_edges(self) -> Iterator[Edge]:
+        for edge_type in self.edge_types:
+            adj = self.adjacency[edge_type]
+            for i in range(len(self.nodes)):
+                yield from self._row_edges(adj, edge_type, i)
+
+    def _row_edges(self, adj: CSRAdjacency, edge_type: str, i: int) -> Iterator[Edge]:
+        lo, hi = int(adj.indptr[i]), int(adj.indptr[i + 1])
+        src = self.nodes[i]
+        for dst, w, mid in zip(
+            adj.indices[lo:hi].tolist(), adj.weights[lo:hi].tolist(), adj.meta_ids[lo:hi].tolist()
+        ):
+            yield Edge(
+                src=src,
+                dst=self.nodes[dst],
+                edge_type=edge_type,
+                weight=None if math.isnan(w) else w,
+                meta=None if mid < 0 else self.meta_table[mid],
+            )
+
+
+def _meta_key(meta: Mapping[str, Any]) -> str:
+    return json.dumps(meta, sort_keys=True, default=repr)
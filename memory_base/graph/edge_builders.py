@@ -1,11 +1,18 @@
 from __future__ import annotations
 
+import heapq
+import os
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
-from typing import Any, Iterable, Mapping, Sequence
+from typing import TYPE_CHECKING, Any, Iterable, Iterator, Mapping, Sequence
 
-from .metrics import MetricSpec, NodeAccessor, SimilarityMetric
+from ._topk import _block_candidates, _finalize_row, _merge_candidates, _score_block
+from .metrics import BlockSimilarityMetric, MetricSpec, NodeAccessor, SimilarityMetric, prefetch_nodes
 from .types import Edge, NodeRef
 
+if TYPE_CHECKING:  # pragma: no cover
+    from memory_base.indexing.vector_store import VectorStore
+
 
 @dataclass(frozen=True)
 class BuildEdgesConfig:
@@ -26,60 +33,400 @@ def build_similarity_edges(
     metric_spec: MetricSpec | None,
     accessor: NodeAccessor,
     config: BuildEdgesConfig,
+    tile_size: int = 1024,
+    candidates: Iterable[tuple[int, int]] | None = None,
 ) -> list[Edge]:
     """
     Build intra-layer (or any-layer) edges based on a SimilarityMetric.
 
-    MVP implementation is O(n^2) and intended for small-scale bootstrapping.
+    Materializing wrapper around `iter_similarity_edges()`; see there for details.
+    """
+
+    return list(
+        iter_similarity_edges(
+            nodes=nodes,
+            metric=metric,
+            metric_spec=metric_spec,
+            accessor=accessor,
+            config=config,
+            tile_size=tile_size,
+            candidates=candidates,
+        )
+    )
+
+
+def iter_similarity_edges(
+    *,
+    nodes: Sequence[NodeRef],
+    metric: SimilarityMetric,
+    metric_spec: MetricSpec | None,
+    accessor: NodeAccessor,
+    config: BuildEdgesConfig,
+    tile_size: int = 1024,
+    candidates: Iterable[tuple[int, int]] | None = None,
+) -> Iterator[Edge]:
+    """
+    Stream edges row by row without materializing the n x n similarity matrix.
+
+    Compute is still O(n^2), but peak memory is O(tile_size^2 + tile_size * top_k):
+    - BlockSimilarityMetric: scores (tile_size x tile_size) blocks and keeps only
+      the top-k candidates per row between column tiles
+    - plain SimilarityMetric: calls `similarity()` per pair, tile by tile,
+      through a bounded per-row heap
+
+    Edges for a row tile are yielded as soon as that tile is done. Before each
+    (row tile x column tile) the accessor is asked to prefetch both tiles
+    (see `graph.accessors.CachingNodeAccessor`).
+
+    `candidates` restricts scoring to the given index pairs (either order; e.g.
+    from `graph.blocking.MinHashLSH.candidate_pairs()`), so cost is linear in
+    the number of candidates instead of n^2. Selection semantics are unchanged,
+    only non-candidate pairs are treated as absent.
     When you need scale:
-    - use vector indexing (FAISS) for embedding metrics
+    - use vector indexing for embedding metrics (`build_similarity_edges_from_store()`)
     - or use blocking/candidate generation for non-embedding metrics
     """
 
     if config.min_similarity is None and config.top_k is None:
         raise ValueError("Either min_similarity or top_k must be set.")
+    if tile_size <= 0:
+        raise ValueError("tile_size must be positive.")
+
+    meta: Mapping[str, Any] | None = None
+    if metric_spec is not None:
+        meta = {"metric": metric_spec.name, "metric_params": metric_spec.params}
+
+    if candidates is not None:
+        for i, scored in enumerate(_score_candidates(nodes, metric, accessor, candidates)):
+            yield from _row_edges(nodes, i, _select_scored(scored, config), config, meta)
+        return
+
+    n = len(nodes)
+    for r0 in range(0, n, tile_size):
+        r1 = min(n, r0 + tile_size)
+        if isinstance(metric, BlockSimilarityMetric):
+            selected = _select_tile_block(nodes, metric, accessor, config, r0, r1, tile_size)
+        else:
+            selected = _select_tile_pairwise(nodes, metric, accessor, config, r0, r1, tile_size)
+        for i, ranked in zip(range(r0, r1), selected):
+            yield from _row_edges(nodes, i, ranked, config, meta)
+
+
+def build_similarity_edges_from_store(
+    *,
+    nodes: Sequence[NodeRef],
+    store: VectorStore,
+    metric_spec: MetricSpec | None,
+    config: BuildEdgesConfig,
+    vectors: Any | None = None,
+    record_ids: Sequence[str] | None = None,
+    batch_size: int = 1024,
+) -> list[Edge]:
+    """
+    `build_similarity_edges()` for embedding metrics, answered by a
+    VectorStore index instead of O(n^2) scoring.
+
+    nodes[i] is stored under record_ids[i] (default: node.id). Query vectors
+    are `vectors` (n, dim, aligned with nodes) or fetched with
+    `store.get_vectors()`. Per batch of `batch_size` nodes:
+    - top_k: `search_batch()` with top_k + 1, dropping the node itself; rows
+      whose hits are crowded out by records outside `nodes` are searched
+      again with k doubled until they have top_k node hits
+    - threshold only: `range_search_batch(radius=min_similarity)`
+
+    Output semantics match `build_similarity_edges()` (row order, ranking,
+    min_similarity filter, directed/undirected, meta from `metric_spec`).
+    Weights are the store's inner products, i.e. cosine similarity for
+    normalized vectors as in `EmbeddingCosineMetric`. An exact store gives the
+    same edges up to ties at the top-k boundary; approximate indexes trade
+    recall through their knobs. Hits on records outside `nodes` are dropped.
+    """
+
+    if config.min_similarity is None and config.top_k is None:
+        raise ValueError("Either min_similarity or top_k must be set.")
+    if getattr(store, "metric", "ip") != "ip":
+        raise ValueError("similarity edges need an inner-product store (metric='ip').")
+
+    meta: Mapping[str, Any] | None = None
+    if metric_spec is not None:
+        meta = {"metric": metric_spec.name, "metric_params": metric_spec.params}
+
+    ids = [str(n.id) for n in nodes] if record_ids is None else [str(r) for r in record_ids]
+    if len(ids) != len(nodes):
+        raise ValueError(f"got {len(ids)} record_ids for {len(nodes)} nodes")
+    pos = {rid: i for i, rid in enumerate(ids)}
 
     edges: list[Edge] = []
+    for r0 in range(0, len(nodes), batch_size):
+        r1 = min(len(nodes), r0 + batch_size)
+        q = store.get_vectors(ids[r0:r1]) if vectors is None else vectors[r0:r1]
+        if config.top_k is not None:
+            rows = iter(_store_top_k(store, q, int(config.top_k), pos, r0, config.min_similarity))
+        else:
+            assert config.min_similarity is not None
+            found = store.range_search_batch(query_matrix=q, radius=config.min_similarity)
+            lims = found.lims.tolist()
+            hit_ids, hit_scores = found.ids.tolist(), found.scores.tolist()
+            rows = ((hit_ids[a:b], hit_scores[a:b]) for a, b in zip(lims[:-1], lims[1:]))
+
+        for i, (row_ids, row_scores) in zip(range(r0, r1), rows):
+            scored = [
+                (pos[rid], float(s))
+                for rid, s in zip(row_ids, row_scores)
+                if rid is not None and rid in pos and pos[rid] != i
+            ]
+            if config.top_k is not None:
+                ranked = _select_scored(scored, config)
+            else:
+                ranked = sorted(scored)
+            edges.extend(_row_edges(nodes, i, ranked, config, meta))
+    return edges
+
+
+def _store_top_k(
+    store: VectorStore,
+    q: Any,
+    top_k: int,
+    pos: Mapping[str, int],
+    row0: int,
+    min_similarity: float | None,
+) -> list[tuple[list[Any], list[float]]]:
+    """
+    (ids, scores) per query row with at least `top_k` hits on nodes other than
+    the row itself, or every hit the store has (above `min_similarity`).
+    """
+    import numpy as np
+
+    q = np.asarray(q)
+    rows: list[tuple[list[Any], list[float]]] = [([], [])] * len(q)
+    todo = list(range(len(q)))
+    k = top_k + 1
+    while todo:
+        batch = store.search_batch(query_matrix=q[todo], top_k=k)
+        again = []
+        for t, row_ids, row_scores in zip(todo, batch.ids.tolist(), batch.scores.tolist()):
+            rows[t] = (row_ids, row_scores)
+            found = sum(rid is not None for rid in row_ids)
+            useful = sum(rid is not None and pos.get(rid, row0 + t) != row0 + t for rid in row_ids)
+            exhausted = found < k or (min_similarity is not None and row_scores[-1] < min_similarity)
+            if useful < top_k and not exhausted:
+                again.append(t)
+        todo = again
+        k *= 2
+    return rows
+
+
+def build_similarity_edges_parallel(
+    *,
+    nodes: Sequence[NodeRef],
+    metric: SimilarityMetric,
+    metric_spec: MetricSpec | None,
+    accessor: NodeAccessor,
+    config: BuildEdgesConfig,
+    tile_size: int = 1024,
+    workers: int | None = None,
+) -> list[Edge]:
+    """
+    Process-parallel variant of `build_similarity_edges()` with identical output.
+
+    The pairwise space is split into (tile_size x tile_size) tiles scored in a
+    process pool (`workers` defaults to os.cpu_count()). For undirected edges
+    with a `symmetric` metric only tiles on or above the diagonal are scored;
+    each off-diagonal block also feeds the mirrored rows through its transpose.
+    Per-row candidates are merged under a total (score desc, column asc) order,
+    so the result does not depend on worker scheduling.
+
+    `metric` and `accessor` must be picklable; they are sent to each worker once.
+    """
+
+    import numpy as np
+
+    if config.min_similarity is None and config.top_k is None:
+        raise ValueError("Either min_similarity or top_k must be set.")
+    if tile_size <= 0:
+        raise ValueError("tile_size must be positive.")
+
     meta: Mapping[str, Any] | None = None
     if metric_spec is not None:
         meta = {"metric": metric_spec.name, "metric_params": metric_spec.params}
 
-    # Compute full pairwise similarity (naive).
-    sims: list[list[float]] = [[0.0 for _ in nodes] for _ in nodes]
-    for i, u in enumerate(nodes):
-        for j, v in enumerate(nodes):
-            if i == j:
-                continue
-            sims[i][j] = float(metric.similarity(u=u, v=v, accessor=accessor))
+    n = len(nodes)
+    mirror = not config.directed and metric.symmetric
+    starts = list(range(0, n, tile_size))
+    tasks = [(r0, c0) for r0 in starts for c0 in starts if not mirror or c0 >= r0]
+
+    cand_j: list[Any] = [np.empty(0, dtype=np.int64) for _ in range(n)]
+    cand_s: list[Any] = [np.empty(0, dtype=np.float64) for _ in range(n)]
+    state = (nodes, metric, accessor, config, tile_size, mirror)
+
+    def merge(result: list[tuple[int, Any, Any]]) -> None:
+        for i, js, ss in result:
+            cand_j[i], cand_s[i] = _merge_candidates(cand_j[i], cand_s[i], js, ss, config)
+
+    workers = workers or os.cpu_count() or 1
+    if workers <= 1 or len(tasks) <= 1:
+        for r0, c0 in tasks:
+            merge(_score_tile(state, r0, c0))
+    else:
+        with ProcessPoolExecutor(
+            max_workers=min(workers, len(tasks)),
+            initializer=_init_tile_worker,
+            initargs=(state,),
+        ) as ex:
+            for result in ex.map(_score_tile_task, tasks):
+                merge(result)
+
+    edges: list[Edge] = []
+    for i in range(n):
+        edges.extend(_row_edges(nodes, i, _finalize_row(i, cand_j[i], cand_s[i], config), config, meta))
+    return edges
+
+
+# Per-process state for build_similarity_edges_parallel workers (set by the pool initializer).
+_TILE_STATE: tuple[Any, ...] | None = None
+
+
+def _init_tile_worker(state: tuple[Any, ...]) -> None:
+    global _TILE_STATE
+    _TILE_STATE = state
+
+
+def _score_tile_task(task: tuple[int, int]) -> list[tuple[int, Any, Any]]:
+    assert _TILE_STATE is not None
+    return _score_tile(_TILE_STATE, *task)
+
+
+def _score_tile(state: tuple[Any, ...], r0: int, c0: int) -> list[tuple[int, Any, Any]]:
+    """
+    Score one tile and return (row, columns, scores) candidates, including the
+    mirrored rows when only the upper triangle is being computed.
+    """
+
+    nodes, metric, accessor, config, tile_size, mirror = state
+    n = len(nodes)
+    r1, c1 = min(n, r0 + tile_size), min(n, c0 + tile_size)
+    block = _score_block(nodes, metric, accessor, r0, r1, c0, c1)
+
+    out = [(r0 + di, js, ss) for di, (js, ss) in enumerate(_block_candidates(block, config, c0))]
+    if mirror and c0 != r0:
+        out.extend((c0 + dj, js, ss) for dj, (js, ss) in enumerate(_block_candidates(block.T, config, r0)))
+    return out
+
+
+def _row_edges(
+    nodes: Sequence[NodeRef],
+    i: int,
+    ranked: Iterable[tuple[int, float]],
+    config: BuildEdgesConfig,
+    meta: Mapping[str, Any] | None,
+) -> Iterator[Edge]:
+    u = nodes[i]
+    for j, score in ranked:
+        if config.min_similarity is not None and score < config.min_similarity:
+            continue
+        v = nodes[j]
+        yield Edge(src=u, dst=v, edge_type=config.edge_type, weight=score, meta=meta)
+        if not config.directed:
+            yield Edge(src=v, dst=u, edge_type=config.edge_type, weight=score, meta=meta)
+
+
+def _select_tile_pairwise(
+    nodes: Sequence[NodeRef],
+    metric: SimilarityMetric,
+    accessor: NodeAccessor,
+    config: BuildEdgesConfig,
+    r0: int,
+    r1: int,
+    tile_size: int,
+) -> list[list[tuple[int, float]]]:
+    """
+    Candidates of rows [r0, r1) in emission order: best-first for top-k (ties
+    keep the lower column index), column order for threshold-only.
+    """
+
+    n = len(nodes)
+    selected: list[list[tuple[int, float]]] = [[] for _ in range(r0, r1)]
+    for c0 in range(0, n, tile_size):
+        c1 = min(n, c0 + tile_size)
+        prefetch_nodes(accessor, [*nodes[r0:r1], *nodes[c0:c1]])
+        for di, u in enumerate(nodes[r0:r1]):
+            i = r0 + di
+            scored = [
+                (j, float(metric.similarity(u=u, v=nodes[j], accessor=accessor)))
+                for j in range(c0, c1)
+                if j != i
+            ]
+            if config.top_k is not None:
+                selected[di] = _select_scored(selected[di] + scored, config)
+            else:
+                selected[di].extend(_select_scored(scored, config))
+    return selected
+
+
+def _select_scored(scored: Iterable[tuple[int, float]], config: BuildEdgesConfig) -> list[tuple[int, float]]:
+    """
+    Apply the selection strategy to (column, score) pairs.
+    """
 
     if config.top_k is not None:
-        k = int(config.top_k)
-        for i, u in enumerate(nodes):
-            ranked = sorted(
-                ((j, sims[i][j]) for j in range(len(nodes)) if j != i),
-                key=lambda t: t[1],
-                reverse=True,
-            )[:k]
-            for j, score in ranked:
-                if config.min_similarity is not None and score < config.min_similarity:
-                    continue
-                v = nodes[j]
-                edges.append(Edge(src=u, dst=v, edge_type=config.edge_type, weight=score, meta=meta))
-                if not config.directed:
-                    edges.append(Edge(src=v, dst=u, edge_type=config.edge_type, weight=score, meta=meta))
-        return edges
-
-    # threshold-only
+        # (score desc, column asc) is a total order, so merging partial results is exact.
+        return heapq.nlargest(int(config.top_k), scored, key=lambda t: (t[1], -t[0]))
     assert config.min_similarity is not None
-    for i, u in enumerate(nodes):
-        for j, v in enumerate(nodes):
-            if i == j:
-                continue
-            score = sims[i][j]
-            if score >= config.min_similarity:
-                edges.append(Edge(src=u, dst=v, edge_type=config.edge_type, weight=score, meta=meta))
-                if not config.directed:
-                    edges.append(Edge(src=v, dst=u, edge_type=config.edge_type, weight=score, meta=meta))
-    return edges
+    return [(j, s) for j, s in scored if s >= config.min_similarity]
+
+
+def _score_candidates(
+    nodes: Sequence[NodeRef],
+    metric: SimilarityMetric,
+    accessor: NodeAccessor,
+    candidates: Iterable[tuple[int, int]],
+) -> list[list[tuple[int, float]]]:
+    """
+    Per-row (column, score) lists in column order, scoring only candidate pairs.
+    Symmetric metrics are evaluated once per unordered pair.
+    """
+
+    rows: list[list[tuple[int, float]]] = [[] for _ in nodes]
+    seen: set[tuple[int, int]] = set()
+    for i, j in candidates:
+        a, b = (i, j) if i < j else (j, i)
+        if a == b or (a, b) in seen:
+            continue
+        seen.add((a, b))
+        score = float(metric.similarity(u=nodes[a], v=nodes[b], accessor=accessor))
+        rows[a].append((b, score))
+        if not metric.symmetric:
+            score = float(metric.similarity(u=nodes[b], v=nodes[a], accessor=accessor))
+        rows[b].append((a, score))
+    for row in rows:
+        row.sort(key=lambda t: t[0])
+    return rows
+
+
+def _select_tile_block(
+    nodes: Sequence[NodeRef],
+    metric: BlockSimilarityMetric,
+    accessor: NodeAccessor,
+    config: BuildEdgesConfig,
+    r0: int,
+    r1: int,
+    tile_size: int,
+) -> list[list[tuple[int, float]]]:
+    """
+    Block counterpart of `_select_tile_pairwise()` for rows [r0, r1).
+    """
+
+    import numpy as np
+
+    n = len(nodes)
+    t = r1 - r0
+    cand_j: list[Any] = [np.empty(0, dtype=np.int64) for _ in range(t)]
+    cand_s: list[Any] = [np.empty(0, dtype=np.float64) for _ in range(t)]
 
+    for c0 in range(0, n, tile_size):
+        c1 = min(n, c0 + tile_size)
+        block = _score_block(nodes, metric, accessor, r0, r1, c0, c1)
+        for di, (js, ss) in enumerate(_block_candidates(block, config, c0)):
+            cand_j[di], cand_s[di] = _merge_candidates(cand_j[di], cand_s[di], js, ss, config)
 
+    return [_finalize_row(r0 + di, cand_j[di], cand_s[di], config) for di in range(t)]
@@ -0,0 +1,233 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Any, Iterable, Mapping, Sequence
+
+from ._topk import _block_candidates, _finalize_row, _merge_candidates, _score_block
+from .edge_builders import BuildEdgesConfig
+from .metrics import MetricSpec, NodeAccessor, SimilarityMetric
+from .types import Edge, NodeRef
+
+
+@dataclass(frozen=True)
+class EdgeDelta:
+    """
+    Edge changes caused by one `IncrementalEdgeIndex.add()` call.
+    Removed edges carry the weight they had before removal.
+    """
+
+    added: list[Edge]
+    removed: list[Edge]
+
+
+@dataclass
+class IncrementalEdgeIndex:
+    """
+    Keeps similarity edges up to date as new nodes arrive.
+
+    Each `add()` scores only new x all pairs (plus all x new when the metric is
+    not symmetric), in column tiles of `tile_size`, and returns an EdgeDelta:
+    - new nodes get their own top-k / threshold neighbors
+    - existing nodes' top-k lists are updated when a newcomer beats their
+      current k-th neighbor; the displaced neighbor's edge is removed
+
+    Selection follows `iter_similarity_edges()` (score desc, earlier node wins
+    ties), so adding nodes in batches yields the same edge set as one rebuild
+    over all nodes in insertion order. Undirected edges are kept once per
+    direction even when both endpoints select each other.
+    """
+
+    metric: SimilarityMetric
+    metric_spec: MetricSpec | None
+    accessor: NodeAccessor
+    config: BuildEdgesConfig
+    tile_size: int = 1024
+    _nodes: list[NodeRef] = field(default_factory=list, init=False, repr=False)
+    _pos: dict[NodeRef, int] = field(default_factory=dict, init=False, repr=False)
+    # Selected neighbors per node: column -> score (only scores passing min_similarity).
+    _sel: list[dict[int, float]] = field(default_factory=list, init=False, repr=False)
+    # How many rows select each edge key; key is (src, dst), or (min, max) when undirected.
+    _support: dict[tuple[int, int], int] = field(default_factory=dict, init=False, repr=False)
+    # Score a newcomer must beat to enter a row's top-k (-inf while the row has room).
+    _worst: Any = field(default=None, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        import numpy as np
+
+        if self.config.min_similarity is None and self.config.top_k is None:
+            raise ValueError("Either min_similarity or top_k must be set.")
+        self._worst = np.empty(0, dtype=np.float64)
+
+    @classmethod
+    def from_edges(
+        cls,
+        *,
+        nodes: Sequence[NodeRef],
+        edges: Iterable[Edge],
+        metric: SimilarityMetric,
+        metric_spec: MetricSpec | None,
+        accessor: NodeAccessor,
+        config: BuildEdgesConfig,
+        tile_size: int = 1024,
+    ) -> "IncrementalEdgeIndex":
+        """
+        Seed the index from edges previously built with the same metric/config,
+        without rescoring. Edges of other types or touching unknown nodes are ignored.
+
+        For undirected top-k, each node's list is the best k of its incident
+        edges, which equals its original top-k for symmetric metrics.
+        """
+
+        import numpy as np
+
+        index = cls(metric=metric, metric_spec=metric_spec, accessor=accessor, config=config, tile_size=tile_size)
+        index._append_nodes(nodes)
+        incident: list[dict[int, float]] = [{} for _ in index._nodes]
+        for e in edges:
+            if e.edge_type != config.edge_type or e.src not in index._pos or e.dst not in index._pos:
+                continue
+            i, j = index._pos[e.src], index._pos[e.dst]
+            if i != j:
+                incident[i][j] = float(e.weight if e.weight is not None else 0.0)
+
+        for i, cand in enumerate(incident):
+            ranked = sorted(cand.items(), key=lambda t: (-t[1], t[0]))
+            if config.top_k is not None:
+                ranked = ranked[: int(config.top_k)]
+            for j, s in ranked:
+                index._select(i, j, s, touched={})
+        index._worst = np.array([index._row_worst(i) for i in range(len(index._nodes))], dtype=np.float64)
+        return index
+
+    @property
+    def nodes(self) -> Sequence[NodeRef]:
+        return tuple(self._nodes)
+
+    def edges(self) -> list[Edge]:
+        """
+        Current edge set, ordered by (src, dst) insertion position.
+        """
+
+        out: list[Edge] = []
+        for key in sorted(self._support):
+            out.extend(self._key_edges(key, self._key_weight(key)))
+        return out
+
+    def add(self, new_nodes: Sequence[NodeRef]) -> EdgeDelta:
+        import numpy as np
+
+        for node in new_nodes:
+            if node in self._pos:
+                raise ValueError(f"node already indexed: {node!r}")
+        if len(set(new_nodes)) != len(new_nodes):
+            raise ValueError("duplicate nodes in batch")
+        if not new_nodes:
+            return EdgeDelta(added=[], removed=[])
+
+        n0 = len(self._nodes)
+        self._append_nodes(new_nodes)
+        n1 = len(self._nodes)
+        self._worst = np.concatenate([self._worst, np.full(n1 - n0, -np.inf)])
+
+        config = self.config
+        k = int(config.top_k) if config.top_k is not None else None
+        # key -> weight before this batch (None if the edge did not exist)
+        touched: dict[tuple[int, int], float | None] = {}
+
+        cand_j: list[Any] = [np.empty(0, dtype=np.int64) for _ in range(n1 - n0)]
+        cand_s: list[Any] = [np.empty(0, dtype=np.float64) for _ in range(n1 - n0)]
+        for c0 in range(0, n1, self.tile_size):
+            c1 = min(n1, c0 + self.tile_size)
+            block = _score_block(self._nodes, self.metric, self.accessor, n0, n1, c0, c1)
+            for di, (js, ss) in enumerate(_block_candidates(block, config, c0)):
+                cand_j[di], cand_s[di] = _merge_candidates(cand_j[di], cand_s[di], js, ss, config)
+
+            # Existing rows in this column tile vs. the newcomers.
+            o1 = min(c1, n0)
+            if c0 >= o1:
+                continue
+            if self.metric.symmetric:
+                old_block = block[:, : o1 - c0].T
+            else:
+                old_block = _score_block(self._nodes, self.metric, self.accessor, c0, o1, n0, n1)
+            mask = old_block > self._worst[c0:o1, None]
+            if config.min_similarity is not None:
+                mask &= old_block >= config.min_similarity
+            for di, dj in zip(*np.nonzero(mask)):
+                i, j, s = c0 + int(di), n0 + int(dj), float(old_block[di, dj])
+                if k is None:
+                    self._select(i, j, s, touched)
+                    continue
+                row = self._sel[i]
+                if len(row) >= k:
+                    worst_j = min(row, key=lambda c: (row[c], -c))
+                    if (s, -j) <= (row[worst_j], -worst_j):
+                        continue
+                    self._unselect(i, worst_j, touched)
+                self._select(i, j, s, touched)
+                self._worst[i] = self._row_worst(i)
+
+        for di in range(n1 - n0):
+            i = n0 + di
+            for j, s in _finalize_row(i, cand_j[di], cand_s[di], config):
+                if config.min_similarity is None or s >= config.min_similarity:
+                    self._select(i, j, s, touched)
+            self._worst[i] = self._row_worst(i)
+
+        added: list[Edge] = []
+        removed: list[Edge] = []
+        for key in sorted(touched):
+            before, present = touched[key], key in self._support
+            if before is None and present:
+                added.extend(self._key_edges(key, self._key_weight(key)))
+            elif before is not None and not present:
+                removed.extend(self._key_edges(key, before))
+        return EdgeDelta(added=added, removed=removed)
+
+    def _append_nodes(self, nodes: Sequence[NodeRef]) -> None:
+        for node in nodes:
+            self._pos[node] = len(self._nodes)
+            self._nodes.append(node)
+            self._sel.append({})
+
+    def _row_worst(self, i: int) -> float:
+        row = self._sel[i]
+        if self.config.top_k is None or len(row) < int(self.config.top_k):
+            return float("-inf")
+        return min(row.values())
+
+    def _key(self, i: int, j: int) -> tuple[int, int]:
+        if self.config.directed:
+            return (i, j)
+        return (i, j) if i < j else (j, i)
+
+    def _key_weight(self, key: tuple[int, int]) -> float:
+        a, b = key
+        scores = [s for s in (self._sel[a].get(b), self._sel[b].get(a)) if s is not None]
+        return max(scores)
+
+    def _select(self, i: int, j: int, score: float, touched: dict[tuple[int, int], float | None]) -> None:
+        key = self._key(i, j)
+        if key not in touched:
+            touched[key] = self._key_weight(key) if key in self._support else None
+        self._sel[i][j] = score
+        self._support[key] = self._support.get(key, 0) + 1
+
+    def _unselect(self, i: int, j: int, touched: dict[tuple[int, int], float | None]) -> None:
+        key = self._key(i, j)
+        if key not in touched:
+            touched[key] = self._key_weight(key)
+        del self._sel[i][j]
+        self._support[key] -= 1
+        if not self._support[key]:
+            del self._support[key]
+
+    def _key_edges(self, key: tuple[int, int], weight: float) -> list[Edge]:
+        meta: Mapping[str, Any] | None = None
+        if self.metric_spec is not None:
+            meta = {"metric": self.metric_spec.name, "metric_params": self.metric_spec.params}
+        u, v = self._nodes[key[0]], self._nodes[key[1]]
+        out = [Edge(src=u, dst=v, edge_type=self.config.edge_type, weight=weight, meta=meta)]
+        if not self.config.directed:
+            out.append(Edge(src=v, dst=u, edge_type=self.config.edge_type, weight=weight, meta=meta))
+        return out
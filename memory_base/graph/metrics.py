@@ -2,10 +2,15 @@ from __future__ import annotations
 
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
-from typing import Any, Mapping, Protocol
+from typing import TYPE_CHECKING, Any, Mapping, Protocol, Sequence
+
+from memory_base.utils.text import tokenize
 
 from .types import NodeRef
 
+if TYPE_CHECKING:  # pragma: no cover
+    import numpy as np
+
 
 class NodeAccessor(Protocol):
     """
@@ -17,6 +22,42 @@ class NodeAccessor(Protocol):
         ...
 
 
+class BulkNodeAccessor(NodeAccessor, Protocol):
+    """
+    Optional extension of NodeAccessor: fetch many nodes in one round trip
+    (DB-backed stores). Call it through `fetch_nodes()`.
+    """
+
+    def get_nodes(self, nodes: Sequence[NodeRef]) -> Sequence[Mapping[str, Any]]:
+        """
+        Bulk variant of `get_node()` (same order as `nodes`).
+        """
+
+        ...
+
+
+def fetch_nodes(accessor: NodeAccessor, nodes: Sequence[NodeRef]) -> list[Mapping[str, Any]]:
+    """
+    Fetch node data with one `get_nodes()` call when the accessor is a
+    BulkNodeAccessor, else with `get_node()` per node.
+    """
+
+    bulk = getattr(accessor, "get_nodes", None)
+    if bulk is None:
+        return [accessor.get_node(n) for n in nodes]
+    return list(bulk(nodes))
+
+
+def prefetch_nodes(accessor: NodeAccessor, nodes: Sequence[NodeRef]) -> None:
+    """
+    Warm a caching accessor (see `graph.accessors.CachingNodeAccessor`); no-op otherwise.
+    """
+
+    prefetch = getattr(accessor, "prefetch", None)
+    if prefetch is not None:
+        prefetch(nodes)
+
+
 class SimilarityMetric(ABC):
     """
     Compute similarity between nodes.
@@ -27,12 +68,107 @@ class SimilarityMetric(ABC):
     """
 
     name: str
+    # Set to True when sim(u, v) == sim(v, u); builders may then score only half the pairs.
+    symmetric: bool = False
 
     @abstractmethod
     def similarity(self, *, u: NodeRef, v: NodeRef, accessor: NodeAccessor) -> float:
         raise NotImplementedError
 
 
+class BlockSimilarityMetric(SimilarityMetric):
+    """
+    A SimilarityMetric that can score a whole (rows x cols) block at once.
+
+    Edge builders detect this subclass and call `similarity_block()` on tiles
+    instead of looping over pairs in Python. Per-pair `similarity()` is derived
+    from the block call so both paths always agree.
+    """
+
+    @abstractmethod
+    def similarity_block(
+        self,
+        *,
+        rows: Sequence[NodeRef],
+        cols: Sequence[NodeRef],
+        accessor: NodeAccessor,
+    ) -> "np.ndarray":
+        """
+        Return a float array of shape (len(rows), len(cols)).
+        """
+
+        raise NotImplementedError
+
+    def similarity(self, *, u: NodeRef, v: NodeRef, accessor: NodeAccessor) -> float:
+        return float(self.similarity_block(rows=[u], cols=[v], accessor=accessor)[0, 0])
+
+
+@dataclass
+class EmbeddingCosineMetric(BlockSimilarityMetric):
+    """
+    Cosine similarity between precomputed node embeddings.
+
+    The accessor must expose the embedding under `field` (any 1-D sequence of
+    floats). Blocks are computed as one matrix product of L2-normalized rows.
+    """
+
+    field: str = "embedding"
+    name: str = "embedding_cosine"
+    symmetric = True
+
+    def _matrix(self, nodes: Sequence[NodeRef], accessor: NodeAccessor) -> "np.ndarray":
+        import numpy as np
+
+        mat = np.asarray([d[self.field] for d in fetch_nodes(accessor, nodes)], dtype="float32")
+        if mat.ndim != 2:
+            raise ValueError(f"expected 1-D embeddings under {self.field!r}, got shape {mat.shape}")
+        norms = np.linalg.norm(mat, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return mat / norms
+
+    def similarity_block(
+        self,
+        *,
+        rows: Sequence[NodeRef],
+        cols: Sequence[NodeRef],
+        accessor: NodeAccessor,
+    ) -> "np.ndarray":
+        return self._matrix(rows, accessor) @ self._matrix(cols, accessor).T
+
+
+def node_tokens(data: Mapping[str, Any], fields: Sequence[str]) -> frozenset[str]:
+    """
+    Token set over the given text fields of a node (missing/empty fields are skipped).
+    """
+
+    out: set[str] = set()
+    for f in fields:
+        val = data.get(f)
+        if val:
+            out.update(tokenize(str(val)))
+    return frozenset(out)
+
+
+@dataclass
+class TokenJaccardMetric(SimilarityMetric):
+    """
+    Jaccard similarity of the token sets of selected NEI text fields.
+
+    Not vectorizable; pair it with candidate generation (`graph.blocking`) at scale.
+    """
+
+    fields: Sequence[str] = ("situation", "attempt", "reflection")
+    name: str = "token_jaccard"
+    symmetric = True
+
+    def similarity(self, *, u: NodeRef, v: NodeRef, accessor: NodeAccessor) -> float:
+        a = node_tokens(accessor.get_node(u), self.fields)
+        b = node_tokens(accessor.get_node(v), self.fields)
+        if not a or not b:
+            return 0.0
+        return len(a & b) / len(a | b)
+
+
 @dataclass(frozen=True)
 class MetricSpec:
     """
@@ -0,0 +1,174 @@
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass, field
+from typing import Iterable, Mapping, Protocol
+
+from .types import Edge, Layer, NodeRef
+
+
+class GraphView(Protocol):
+    """
+    Read access needed by traversal. Implemented by `AdjacencyGraph` and `CSRGraph`.
+    """
+
+    def out_edges(self, node: NodeRef, edge_types: Iterable[str] | None = None) -> Iterable[Edge]:
+        ...
+
+
+@dataclass
+class AdjacencyGraph:
+    """
+    In-memory adjacency over Edge objects (MVP edge table -> GraphView).
+    """
+
+    _out: dict[NodeRef, list[Edge]] = field(default_factory=dict)
+
+    @classmethod
+    def from_edges(cls, edges: Iterable[Edge]) -> "AdjacencyGraph":
+        g = cls()
+        for e in edges:
+            g._out.setdefault(e.src, []).append(e)
+        return g
+
+    def out_edges(self, node: NodeRef, edge_types: Iterable[str] | None = None) -> Iterable[Edge]:
+        edges = self._out.get(node, [])
+        if edge_types is None:
+            return list(edges)
+        allowed = set(edge_types)
+        return [e for e in edges if e.edge_type in allowed]
+
+
+@dataclass(frozen=True)
+class TraversalConfig:
+    """
+    Bounds for `bounded_bfs()`.
+    - max_depth: hops from the seeds
+    - max_width: nodes kept per hop (best scores first when best_first=True)
+    - max_results: cap on returned hits, seeds included (None = all). Applied
+      to the final ranking (score desc, then depth) after traversal, so it
+      trims the output only: exploration is still bounded by max_depth and
+      max_width (at most len(seeds) + max_depth * max_width nodes are
+      reached) and by time_budget_s
+    - edge_types / layers: only follow these edge types / enter these layers (None = all)
+    - time_budget_s: wall-clock budget; traversal stops early when exhausted
+    - default_weight: weight used for edges without one
+
+    A node's score is its seed score times the edge weights along the path that
+    reached it (the best such path within the explored frontier).
+    """
+
+    max_depth: int = 2
+    max_width: int | None = 32
+    max_results: int | None = None
+    edge_types: frozenset[str] | None = None
+    layers: frozenset[Layer] | None = None
+    best_first: bool = True
+    time_budget_s: float | None = None
+    default_weight: float = 1.0
+
+
+@dataclass(frozen=True)
+class TraversalHit:
+    node: NodeRef
+    score: float
+    depth: int
+    path: tuple[Edge, ...]  # seed -> node
+
+
+@dataclass(frozen=True)
+class TraversalResult:
+    """
+    Ranked hits (score desc, then depth) plus whether the time budget cut the search short.
+    """
+
+    hits: list[TraversalHit]
+    timed_out: bool
+    expanded: int
+
+
+def bounded_bfs(
+    *,
+    graph: GraphView,
+    seeds: Mapping[NodeRef, float] | Iterable[NodeRef],
+    config: TraversalConfig = TraversalConfig(),
+) -> TraversalResult:
+    """
+    Depth- and width-bounded BFS from seed nodes (tech notes §6.0).
+
+    Each hop expands the current frontier in score order, collects unseen
+    neighbors through allowed edge types/layers, and keeps the best `max_width`
+    of them as the next frontier. Seeds are returned as depth-0 hits. When
+    `time_budget_s` runs out the hits found so far are returned with
+    `timed_out=True`; expanding best-first means those are the strongest ones.
+    """
+
+    deadline = None if config.time_budget_s is None else time.perf_counter() + config.time_budget_s
+    seed_scores = dict(seeds) if isinstance(seeds, Mapping) else {s: 1.0 for s in seeds}
+
+    # node -> (score, depth, incoming edge, discovery order)
+    best: dict[NodeRef, tuple[float, int, Edge | None, int]] = {}
+    for s, score in seed_scores.items():
+        if config.layers is None or s.layer in config.layers:
+            best[s] = (float(score), 0, None, len(best))
+
+    frontier = _rank(list(best), best, config)
+    timed_out = False
+    expanded = 0
+    for depth in range(1, config.max_depth + 1):
+        if not frontier:
+            break
+        found: dict[NodeRef, tuple[float, int, Edge | None, int]] = {}
+        for u in frontier:
+            if deadline is not None and time.perf_counter() >= deadline:
+                timed_out = True
+                break
+            expanded += 1
+            u_score = best[u][0]
+            for e in graph.out_edges(u, config.edge_types):
+                v = e.dst
+                if v in best or (config.layers is not None and v.layer not in config.layers):
+                    continue
+                w = config.default_weight if e.weight is None else float(e.weight)
+                score = u_score * w
+                prev = found.get(v)
+                if prev is None or score > prev[0]:
+                    order = prev[3] if prev is not None else len(best) + len(found)
+                    found[v] = (score, depth, e, order)
+
+        nxt = _rank(list(found), found, config)
+        if config.max_width is not None:
+            nxt = nxt[: config.max_width]
+        for v in nxt:
+            best[v] = found[v]
+        frontier = nxt
+        if timed_out:
+            break
+
+    hits = [
+        TraversalHit(node=n, score=score, depth=d, path=_path(n, best))
+        for n, (score, d, _, _) in best.items()
+    ]
+    hits.sort(key=lambda h: (-h.score, h.depth, best[h.node][3]))
+    if config.max_results is not None:
+        hits = hits[: config.max_results]
+    return TraversalResult(hits=hits, timed_out=timed_out, expanded=expanded)
+
+
+def _rank(
+    nodes: list[NodeRef],
+    info: Mapping[NodeRef, tuple[float, int, Edge | None, int]],
+    config: TraversalConfig,
+) -> list[NodeRef]:
+    if config.best_first:
+        return sorted(nodes, key=lambda n: (-info[n][0], info[n][3]))
+    return sorted(nodes, key=lambda n: info[n][3])
+
+
+def _path(node: NodeRef, best: Mapping[NodeRef, tuple[float, int, Edge | None, int]]) -> tuple[Edge, ...]:
+    edges: list[Edge] = []
+    e = best[node][2]
+    while e is not None:
+        edges.append(e)
+        e = best[e.src][2]
+    return tuple(reversed(edges))
@@ -1,9 +1,22 @@
 from __future__ import annotations
 
+import json
+import mmap as _mmap
+import os
+import time
 from dataclasses import dataclass, field
 from typing import Any, Iterable, Mapping, Sequence
 
-from .vector_store import VectorRecord, VectorSearchResult, VectorStore
+from .metadata_index import MetadataIndex, rows_to_bitmap
+from .vector_store import (
+    BatchFilters,
+    BatchSearchResult,
+    RangeSearchResult,
+    VectorRecord,
+    VectorSearchResult,
+    VectorStore,
+    search_rows_by_filter,
+)
 
 
 @dataclass
@@ -12,17 +25,61 @@ class FaissVectorStore(VectorStore):
     FAISS-backed VectorStore (optional dependency).
 
     Notes:
-    - This is a thin wrapper scaffold. You can extend it with:
-      - persistence (write/read index + id map)
-      - IVF/HNSW indexes
-      - better metadata filtering (pre-filter candidate ids, then search)
+    - index_type selects the backend:
+      - "flat": exact brute-force scan (default)
+      - "ivf_flat" / "ivf_pq": inverted lists over `nlist` centroids (PQ
+        compresses vectors to `pq_m` x `pq_nbits` bits); need training
+      - "hnsw": graph index with `hnsw_m` links per node, no training
+      Runtime knobs `nprobe` (IVF) and `ef_search` (HNSW) trade recall for
+      latency per search; see `recall_latency_report()`.
+    - IVF indexes are trained on the first upsert (a random sample of up to
+      `train_size` vectors) unless `train()` was called with a sample before.
+    - Records live in an `IndexIDMap2` under stable int64 row ids. Upserting an
+      existing id tombstones its old row and appends a new one; `delete()`
+      tombstones rows. Tombstoned rows are excluded at search time and removed
+      from the index by `compact()` (which also renumbers the live rows), run
+      automatically once tombstones exceed `compact_ratio` of the indexed rows.
+    - `save()` / `load()` persist the index, id table and metadata in one
+      directory; `load(mmap=True)` maps the index and id table read-only so
+      query workers share one page-cached copy.
+    - `search(filter=...)` resolves the filter to row ids through a
+      `MetadataIndex` (built on first use, then kept up to date) and searches
+      only those rows: an exact scan when at most `exact_filter_max` rows match
+      (flat/HNSW), otherwise a FAISS search restricted by an ID selector.
+    - `upsert_arrays()` bulk-loads an id array, a float32 matrix (e.g. a
+      memmap) and columnar metadata without building VectorRecords or
+      per-vector lists; ids and metadata are still kept as one str and one
+      dict per row (the id table and the metadata returned by searches).
+    - `search_batch()` answers a (n, dim) query matrix with one index search
+      and returns `BatchSearchResult` arrays.
     """
 
     dim: int
     metric: str = "ip"  # "ip" (inner product) or "l2"
+    index_type: str = "flat"  # "flat" | "ivf_flat" | "ivf_pq" | "hnsw"
+    nlist: int = 1024
+    pq_m: int = 16
+    pq_nbits: int = 8
+    hnsw_m: int = 32
+    ef_construction: int = 200
+    nprobe: int = 16
+    ef_search: int = 64
+    train_size: int = 100_000
+    compact_ratio: float | None = 0.2
+    exact_filter_max: int = 2048
     _index: Any = field(default=None, init=False, repr=False)
-    _ids: list[str] = field(default_factory=list, init=False, repr=False)
-    _meta: list[Mapping[str, Any] | None] = field(default_factory=list, init=False, repr=False)
+    # Row tables indexed by int64 row id (rows are never reused).
+    _ids: Sequence[str] = field(default_factory=list, init=False, repr=False)
+    _meta: Sequence[Mapping[str, Any] | None] = field(default_factory=list, init=False, repr=False)
+    # record id -> live row id; built lazily for stores loaded from disk.
+    _rows: dict[str, int] | None = field(default_factory=dict, init=False, repr=False)
+    # Rows still in the FAISS index but no longer live.
+    _tombstones: set[int] = field(default_factory=set, init=False, repr=False)
+    # Rows removed from the index by compaction (or never live).
+    _read_only: bool = field(default=False, init=False, repr=False)
+    _meta_index: MetadataIndex | None = field(default=None, init=False, repr=False)
+    # IDSelector excluding the tombstones; rebuilt only after they change.
+    _tombstone_sel: Any = field(default=None, init=False, repr=False)
 
     def __post_init__(self) -> None:
         try:
@@ -32,38 +89,175 @@ class FaissVectorStore(VectorStore):
                 "FaissVectorStore requires optional dependency 'faiss-cpu' (or 'faiss-gpu')."
             ) from e
 
-        if self.metric == "ip":
-            self._index = faiss.IndexFlatIP(self.dim)
-        elif self.metric == "l2":
-            self._index = faiss.IndexFlatL2(self.dim)
-        else:
+        if self.metric not in ("ip", "l2"):
             raise ValueError("metric must be 'ip' or 'l2'")
+        if self.index_type not in _INDEX_TYPES:
+            raise ValueError(f"index_type must be one of {sorted(_INDEX_TYPES)}")
+        self._index = self._new_index()
+
+    def _new_index(self) -> Any:
+        import faiss  # type: ignore
+
+        description = {
+            "flat": "Flat",
+            "ivf_flat": f"IVF{self.nlist},Flat",
+            "ivf_pq": f"IVF{self.nlist},PQ{self.pq_m}x{self.pq_nbits}",
+            "hnsw": f"HNSW{self.hnsw_m},Flat",
+        }[self.index_type]
+        faiss_metric = faiss.METRIC_INNER_PRODUCT if self.metric == "ip" else faiss.METRIC_L2
+        index = faiss.index_factory(self.dim, f"IDMap2,{description}", faiss_metric)
+        if self.index_type == "hnsw":
+            faiss.downcast_index(index.index).hnsw.efConstruction = self.ef_construction
+        return index
+
+    def train(self, vectors: Any) -> None:
+        """
+        Train IVF centroids / PQ codebooks on a representative sample
+        (no-op for flat/HNSW). Must happen before the first add.
+        """
+        import numpy as np
+
+        self._check_writable()
+        if self._index.is_trained:
+            return
+        sample = np.ascontiguousarray(vectors, dtype="float32")
+        if sample.ndim != 2 or sample.shape[1] != self.dim:
+            raise ValueError(f"expected vectors shape (n, {self.dim}), got {sample.shape}")
+        if sample.shape[0] > self.train_size:
+            pick = np.random.default_rng(0).choice(sample.shape[0], self.train_size, replace=False)
+            sample = sample[np.sort(pick)]
+        if sample.shape[0] < self.nlist:
+            raise ValueError(f"need at least nlist={self.nlist} training vectors, got {sample.shape[0]}")
+        self._index.train(sample)
+
+    def __len__(self) -> int:
+        return len(self._ids) - len(self._tombstones)
 
     def upsert(self, records: Iterable[VectorRecord]) -> None:
         """
-        MVP behavior:
-        - append-only (no true update). For updates, delete+rebuild or keep a tombstone map.
+        Insert or replace records by id (the last occurrence wins within a batch).
         """
         import numpy as np
 
+        self._check_writable()
         batch = list(records)
         if not batch:
             return
-
         vecs = np.asarray([r.vector for r in batch], dtype="float32")
+        self._add([r.id for r in batch], vecs, [r.metadata for r in batch])
+
+    def upsert_arrays(
+        self,
+        ids: Any,
+        vectors: Any,
+        metadata: Mapping[str, Sequence[Any]] | None = None,
+    ) -> None:
+        """
+        Bulk upsert from arrays: `ids` (n,), `vectors` an (n, dim) float32
+        buffer (ndarray, memmap, ...) and optional columnar `metadata`
+        (field -> n values). A C-contiguous float32 matrix is handed to FAISS
+        without copying; ids become str and metadata columns are zipped into
+        one dict per row.
+        """
+        import numpy as np
+
+        self._check_writable()
+        id_list = [str(x) for x in (ids.tolist() if hasattr(ids, "tolist") else ids)]
+        vecs = np.ascontiguousarray(vectors, dtype="float32")
+        if len(id_list) != len(vecs):
+            raise ValueError(f"got {len(id_list)} ids for {len(vecs)} vectors")
+        metas: list[Mapping[str, Any] | None]
+        if metadata:
+            columns = {k: (v.tolist() if hasattr(v, "tolist") else list(v)) for k, v in metadata.items()}
+            for k, col in columns.items():
+                if len(col) != len(id_list):
+                    raise ValueError(f"metadata column {k!r} has {len(col)} values for {len(id_list)} ids")
+            metas = [dict(zip(columns, values)) for values in zip(*columns.values())]
+        else:
+            metas = [None] * len(id_list)
+        if id_list:
+            self._add(id_list, vecs, metas)
+
+    def _add(self, ids: list[str], vecs: Any, metas: list[Mapping[str, Any] | None]) -> None:
+        import numpy as np
+
         if vecs.ndim != 2 or vecs.shape[1] != self.dim:
             raise ValueError(f"expected vectors shape (n, {self.dim}), got {vecs.shape}")
 
-        self._index.add(vecs)
-        self._ids.extend([r.id for r in batch])
-        self._meta.extend([r.metadata for r in batch])
+        if not self._index.is_trained:
+            self.train(vecs)
+        rows = self._row_map()
+        start = len(self._ids)
+        for record_id in ids:
+            old = rows.get(record_id)
+            if old is not None:
+                self._retire(old)
+        self._index.add_with_ids(vecs, np.arange(start, start + len(ids), dtype="int64"))
+        assert isinstance(self._ids, list)
+        self._ids.extend(ids)
+        self._meta.extend(metas)
+        if self._meta_index is not None:
+            for offset, m in enumerate(metas):
+                self._meta_index.add(start + offset, m)
+        for offset, record_id in enumerate(ids):
+            old = rows.get(record_id)
+            if old is not None and old >= start:
+                # duplicate id inside this batch
+                self._retire(old)
+            rows[record_id] = start + offset
+        self._maybe_compact()
 
     def delete(self, ids: Iterable[str]) -> None:
         """
-        MVP behavior:
-        - not supported for IndexFlat*. Implement via IDMap2 or maintain a rebuild strategy.
+        Tombstone records by id; unknown ids are ignored.
         """
-        raise NotImplementedError("FaissVectorStore.delete not supported in this MVP scaffold.")
+
+        self._check_writable()
+        rows = self._row_map()
+        for record_id in ids:
+            row = rows.pop(record_id, None)
+            if row is not None:
+                self._retire(row)
+        self._maybe_compact()
+
+    def compact(self) -> None:
+        """
+        Physically remove tombstoned rows from the FAISS index and renumber
+        the live rows 0..n-1, so the row tables (and ID selectors) shrink too.
+        """
+        import faiss  # type: ignore
+        import numpy as np
+
+        self._check_writable()
+        if not self._tombstones:
+            return
+        alive = np.ones(len(self._ids), dtype=bool)
+        alive[np.fromiter(self._tombstones, dtype="int64", count=len(self._tombstones))] = False
+        live = np.flatnonzero(alive)
+        new_row = np.where(alive, np.cumsum(alive) - 1, -1)
+
+        if self.index_type == "hnsw":
+            # HNSW cannot remove vectors: rebuild from the live ones.
+            vecs = self._index.reconstruct_batch(live) if len(live) else np.empty((0, self.dim), dtype="float32")
+            self._index = self._new_index()
+            if len(live):
+                self._index.add_with_ids(vecs, np.arange(len(live), dtype="int64"))
+        elif self.index_type == "flat":
+            self._index.remove_ids(np.fromiter(sorted(self._tombstones), dtype="int64"))
+            id_map = faiss.vector_to_array(self._index.id_map)
+            faiss.copy_array_to_vector(new_row[id_map].astype("int64"), self._index.id_map)
+            self._index.construct_rev_map()
+        else:
+            # IndexIDMap2.remove_ids assumes the wrapped index renumbers its
+            # entries on removal, which IVF does not: rewrite the lists directly.
+            _compact_ivf(self._index, new_row)
+
+        self._ids = [self._ids[r] for r in live.tolist()]
+        self._meta = [self._meta[r] for r in live.tolist()]
+        self._tombstones = set()
+        self._rows = None
+        self._meta_index = None
+        self._tombstone_sel = None
 
     def search(
         self,
@@ -74,23 +268,416 @@ class FaissVectorStore(VectorStore):
     ) -> list[VectorSearchResult]:
         import numpy as np
 
-        if filter:
-            # MVP: no metadata filtering inside FAISS for Flat index.
-            # Recommended approach:
-            # - pre-filter candidate ids using metadata store
-            # - run FAISS on that subset (or use a different index strategy)
-            raise NotImplementedError("metadata filter not supported in this MVP scaffold.")
-
         q = np.asarray([query_vector], dtype="float32")
         if q.shape != (1, self.dim):
             raise ValueError(f"expected query_vector dim {self.dim}, got {q.shape}")
 
-        scores, idxs = self._index.search(q, top_k)
+        scores, rows = self._search_rows(q, top_k, filter)
         out: list[VectorSearchResult] = []
-        for score, idx in zip(scores[0].tolist(), idxs[0].tolist(), strict=False):
-            if idx < 0:
+        for score, row in zip(scores[0].tolist(), rows[0].tolist(), strict=False):
+            if row < 0:
                 continue
-            out.append(VectorSearchResult(id=self._ids[idx], score=float(score), metadata=self._meta[idx]))
+            out.append(VectorSearchResult(id=str(self._ids[row]), score=float(score), metadata=self._meta[row]))
         return out
 
+    def search_batch(
+        self,
+        *,
+        query_matrix: Any,
+        top_k: int,
+        filters: BatchFilters = None,
+    ) -> BatchSearchResult:
+        """
+        One FAISS search over all queries; queries sharing a filter are
+        searched together (one call per distinct filter).
+        """
+        import numpy as np
+
+        q = np.ascontiguousarray(query_matrix, dtype="float32")
+        if q.ndim != 2 or q.shape[1] != self.dim:
+            raise ValueError(f"expected query_matrix shape (n, {self.dim}), got {q.shape}")
+
+        scores, rows = search_rows_by_filter(self._search_rows, q, top_k, filters)
+        return BatchSearchResult.from_rows(scores, rows, self._ids, self._meta)
+
+    def range_search_batch(
+        self,
+        *,
+        query_matrix: Any,
+        radius: float,
+        filter: Mapping[str, Any] | None = None,
+    ) -> RangeSearchResult:
+        """
+        Native FAISS range search: score >= radius ("ip") or squared distance
+        <= radius ("l2"), hits sorted best first per query.
+        """
+        import numpy as np
+
+        q = np.ascontiguousarray(query_matrix, dtype="float32")
+        if q.ndim != 2 or q.shape[1] != self.dim:
+            raise ValueError(f"expected query_matrix shape (n, {self.dim}), got {q.shape}")
+        if filter:
+            allowed = self.metadata_index().resolve(filter)
+            if not len(allowed):
+                return RangeSearchResult.from_rows(np.zeros(len(q) + 1), np.empty(0), np.empty(0, "int64"), [], [])
+            params = self._search_params(allowed)
+        else:
+            params = self._search_params()
+
+        # FAISS range search is strict (> for IP, < for L2): widen by one ulp, then re-check.
+        r = np.float32(radius)
+        wide = np.nextafter(r, np.float32(-np.inf if self.metric == "ip" else np.inf))
+        lims, scores, rows = self._index.range_search(q, float(wide), params=params)
+        keep_lims = [0]
+        keep: list[Any] = []
+        for a, b in zip(lims[:-1].tolist(), lims[1:].tolist()):
+            s = scores[a:b]
+            ok = np.flatnonzero(s >= r) if self.metric == "ip" else np.flatnonzero(s <= r)
+            order = ok[np.lexsort((rows[a:b][ok], -s[ok] if self.metric == "ip" else s[ok]))]
+            keep.append(order + a)
+            keep_lims.append(keep_lims[-1] + len(order))
+        sel = np.concatenate(keep) if keep else np.empty(0, dtype="int64")
+        return RangeSearchResult.from_rows(keep_lims, scores[sel], rows[sel], self._ids, self._meta)
+
+    def get_vectors(self, ids: Sequence[str]) -> Any:
+        """
+        Stored vectors reconstructed from the index (flat / HNSW only; IVF
+        indexes keep no id -> vector map).
+        """
+        import numpy as np
+
+        if self.index_type not in ("flat", "hnsw"):
+            raise NotImplementedError(f"get_vectors is not supported for index_type={self.index_type!r}")
+        rows = self._row_map()
+        missing = [i for i in ids if i not in rows]
+        if missing:
+            raise KeyError(missing[0])
+        return self._index.reconstruct_batch(np.fromiter((rows[i] for i in ids), dtype="int64", count=len(ids)))
+
+    def _search_rows(self, q: Any, top_k: int, filter: Mapping[str, Any] | None) -> tuple[Any, Any]:
+        """
+        (scores, rows) arrays of shape (n, top_k) for query matrix `q`; rows are -1 past the last hit.
+        """
+        import numpy as np
+
+        if not filter:
+            return self._index.search(q, top_k, params=self._search_params())
+        rows = self.metadata_index().resolve(filter)
+        if len(rows) == 0:
+            return np.full((len(q), top_k), np.nan, dtype="float32"), np.full((len(q), top_k), -1, dtype="int64")
+        if len(rows) <= self.exact_filter_max and self.index_type in ("flat", "hnsw"):
+            return self._exact_search(q, rows, top_k)
+        return self._index.search(q, top_k, params=self._search_params(rows))
+
+    def metadata_index(self) -> MetadataIndex:
+        """
+        Inverted metadata index over live rows (built on first call).
+        """
+
+        if self._meta_index is None:
+            index = MetadataIndex()
+            for row, m in enumerate(self._meta):
+                if m is not None and row not in self._tombstones:
+                    index.add(row, m)
+            self._meta_index = index
+        return self._meta_index
+
+    def _exact_search(self, q: Any, rows: Any, top_k: int) -> tuple[Any, Any]:
+        """
+        Brute-force scoring of a small row subset, reconstructed from the index.
+        """
+        import numpy as np
+
+        vecs = self._index.reconstruct_batch(rows)
+        if self.metric == "ip":
+            keys = -(q @ vecs.T)
+        else:
+            keys = (q * q).sum(axis=1)[:, None] - 2.0 * (q @ vecs.T) + (vecs * vecs).sum(axis=1)[None, :]
+        k = min(top_k, len(rows))
+        if k < len(rows):
+            part = np.argpartition(keys, k - 1, axis=1)[:, :k]
+        else:
+            part = np.broadcast_to(np.arange(len(rows)), keys.shape)
+        part_keys = np.take_along_axis(keys, part, axis=1)
+        order = np.take_along_axis(part, np.argsort(part_keys, axis=1, kind="stable"), axis=1)
+        top = np.take_along_axis(keys, order, axis=1)
+
+        scores = np.full((len(q), top_k), np.nan, dtype="float32")
+        out_rows = np.full((len(q), top_k), -1, dtype="int64")
+        scores[:, :k] = -top if self.metric == "ip" else top
+        out_rows[:, :k] = rows[order]
+        return scores, out_rows
+
+    def _search_params(self, allowed: Any = None) -> Any:
+        """
+        SearchParameters carrying the runtime knobs. Excludes tombstoned rows,
+        or with `allowed` (an array of live rows) admits only those rows.
+        """
+        import faiss  # type: ignore
+        import numpy as np
+
+        if self.index_type in ("ivf_flat", "ivf_pq"):
+            params = faiss.SearchParametersIVF(nprobe=self.nprobe)
+        elif self.index_type == "hnsw":
+            params = faiss.SearchParametersHNSW(efSearch=self.ef_search)
+        else:
+            params = faiss.SearchParameters()
+        if allowed is not None:
+            bitmap = rows_to_bitmap(allowed, len(self._ids))
+            sel = faiss.IDSelectorBitmap(len(self._ids), faiss.swig_ptr(bitmap))
+            params.sel = sel
+            params._refs = (bitmap, sel)  # type: ignore[attr-defined]
+        elif self._tombstones:
+            if self._tombstone_sel is None:
+                batch = faiss.IDSelectorBatch(np.fromiter(self._tombstones, dtype="int64"))
+                self._tombstone_sel = (batch, faiss.IDSelectorNot(batch))
+            params.sel = self._tombstone_sel[1]
+            # Keep the wrapped selectors alive as long as the params object.
+            params._refs = self._tombstone_sel  # type: ignore[attr-defined]
+        return params
+
+    def _row_map(self) -> dict[str, int]:
+        if self._rows is None:
+            self._rows = {str(rid): row for row, rid in enumerate(self._ids) if row not in self._tombstones}
+        return self._rows
+
+    def _retire(self, row: int) -> None:
+        if self._meta_index is not None:
+            self._meta_index.remove(row, self._meta[row])
+        self._tombstones.add(row)
+        self._tombstone_sel = None
+        self._meta[row] = None
+
+    def _maybe_compact(self) -> None:
+        if self.compact_ratio is None or not self._tombstones:
+            return
+        if len(self._tombstones) > self.compact_ratio * max(1, self._index.ntotal):
+            self.compact()
+
+    # --- persistence -------------------------------------------------------
+
+    def save(self, path: str | os.PathLike[str]) -> None:
+        """
+        Write the store to directory `path`:
+        - index.faiss: the FAISS index (rows keyed by int64 row id)
+        - ids.npy: fixed-width unicode id table (row id -> record id)
+        - meta.jsonl: one JSON metadata object (or null) per row
+        - tombstones.npy: retired row ids (still in the index until `compact()`)
+        - store.json: manifest (dim, metric, row count)
+        """
+
+        import faiss  # type: ignore
+        import numpy as np
+
+        os.makedirs(path, exist_ok=True)
+        faiss.write_index(self._index, os.path.join(path, _INDEX_FILE))
+        np.save(os.path.join(path, _IDS_FILE), np.asarray(list(self._ids), dtype=str))
+        np.save(os.path.join(path, _TOMBSTONES_FILE), np.fromiter(sorted(self._tombstones), dtype="int64"))
+        with open(os.path.join(path, _META_FILE), "w", encoding="utf-8") as f:
+            for m in self._meta:
+                f.write(json.dumps(None if m is None else dict(m), ensure_ascii=False))
+                f.write("\n")
+        manifest = {
+            "format": 2,
+            "dim": self.dim,
+            "metric": self.metric,
+            "config": {k: getattr(self, k) for k in _CONFIG_FIELDS},
+            "count": len(self._ids),
+        }
+        with open(os.path.join(path, _MANIFEST_FILE), "w", encoding="utf-8") as f:
+            json.dump(manifest, f)
+
+    @classmethod
+    def load(cls, path: str | os.PathLike[str], *, mmap: bool = False) -> "FaissVectorStore":
+        """
+        Load a store written by `save()`.
+
+        With mmap=True the index, id table and metadata file are
+        memory-mapped read-only (pages are shared between processes through
+        the OS page cache) and the returned store rejects writes. Metadata is
+        then parsed per hit, from line offsets found in one scan of the file.
+        """
+
+        import faiss  # type: ignore
+        import numpy as np
+
+        with open(os.path.join(path, _MANIFEST_FILE), "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+        if manifest.get("format") != 2:
+            raise ValueError(f"unsupported FaissVectorStore format: {manifest.get('format')!r}")
+        store = cls(dim=int(manifest["dim"]), metric=str(manifest["metric"]), **manifest.get("config", {}))
+
+        index_path = os.path.join(path, _INDEX_FILE)
+        if mmap:
+            # IO_FLAG_MMAP_IFC (faiss >= 1.8) also maps flat codes, not just IVF lists.
+            flags = getattr(faiss, "IO_FLAG_MMAP_IFC", faiss.IO_FLAG_MMAP) | faiss.IO_FLAG_READ_ONLY
+            store._index = faiss.read_index(index_path, flags)
+            store._ids = np.load(os.path.join(path, _IDS_FILE), mmap_mode="r")
+            store._read_only = True
+        else:
+            store._index = faiss.read_index(index_path)
+            store._ids = np.load(os.path.join(path, _IDS_FILE)).tolist()
+
+        store._tombstones = set(np.load(os.path.join(path, _TOMBSTONES_FILE)).tolist())
+        store._rows = None
+        if mmap:
+            store._meta = _JSONLines(os.path.join(path, _META_FILE))
+        else:
+            with open(os.path.join(path, _META_FILE), "r", encoding="utf-8") as f:
+                store._meta = [json.loads(line) for line in f]
+        if not (
+            len(store._ids) == len(store._meta) == manifest["count"]
+            and store._index.ntotal == len(store._ids)
+        ):
+            raise ValueError(f"inconsistent FaissVectorStore files in {os.fspath(path)!r}")
+        return store
+
+    def _check_writable(self) -> None:
+        if self._read_only:
+            raise RuntimeError("FaissVectorStore was loaded with mmap=True and is read-only.")
+
+
+class _JSONLines(Sequence[Any]):
+    """
+    Read-only sequence over a memory-mapped JSON-lines file; line i is
+    parsed on access.
+    """
+
+    def __init__(self, path: str) -> None:
+        import numpy as np
+
+        with open(path, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            self._data: Any = _mmap.mmap(f.fileno(), 0, access=_mmap.ACCESS_READ) if size else b""
+        # End offset of each line (int64: 8 bytes per row, no Python objects).
+        self._ends = np.flatnonzero(np.frombuffer(self._data, dtype=np.uint8) == ord("\n"))
+
+    def __len__(self) -> int:
+        return len(self._ends)
+
+    def __getitem__(self, i: Any) -> Any:
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        i = int(i) + len(self) if i < 0 else int(i)
+        start = int(self._ends[i - 1]) + 1 if i else 0
+        return json.loads(self._data[start : int(self._ends[i])])
+
+
+def _compact_ivf(index: Any, new_row: Any) -> None:
+    """
+    Drop and renumber the entries of an IndexIDMap2-wrapped IVF index in
+    place: entry for row r becomes row new_row[r] (dropped when -1).
+    """
+    import faiss  # type: ignore
+    import numpy as np
+
+    ivf = faiss.extract_index_ivf(index)
+    invlists = ivf.invlists
+    # IVF entries are keyed by internal ids (positions in the id map).
+    mapping = new_row[faiss.vector_to_array(index.id_map)]
+    code_size = invlists.code_size
+    for list_no in range(ivf.nlist):
+        size = invlists.list_size(list_no)
+        if size == 0:
+            continue
+        ids = faiss.rev_swig_ptr(invlists.get_ids(list_no), size)
+        codes = faiss.rev_swig_ptr(invlists.get_codes(list_no), size * code_size).reshape(size, code_size)
+        new = mapping[ids]
+        keep = new >= 0
+        new_ids = np.ascontiguousarray(new[keep], dtype="int64")
+        new_codes = np.ascontiguousarray(codes[keep])
+        invlists.resize(list_no, len(new_ids))
+        if len(new_ids):
+            invlists.update_entries(list_no, 0, len(new_ids), faiss.swig_ptr(new_ids), faiss.swig_ptr(new_codes))
+    count = int((new_row >= 0).sum())
+    ivf.ntotal = count
+    index.ntotal = count
+    faiss.copy_array_to_vector(np.arange(count, dtype="int64"), index.id_map)
+    index.construct_rev_map()
+
+
+_INDEX_TYPES = frozenset({"flat", "ivf_flat", "ivf_pq", "hnsw"})
+_CONFIG_FIELDS = (
+    "index_type",
+    "nlist",
+    "pq_m",
+    "pq_nbits",
+    "hnsw_m",
+    "ef_construction",
+    "nprobe",
+    "ef_search",
+    "train_size",
+    "compact_ratio",
+    "exact_filter_max",
+)
+
+_INDEX_FILE = "index.faiss"
+_IDS_FILE = "ids.npy"
+_META_FILE = "meta.jsonl"
+_TOMBSTONES_FILE = "tombstones.npy"
+_MANIFEST_FILE = "store.json"
+
+
+@dataclass(frozen=True)
+class RecallLatencyPoint:
+    """
+    One operating point of an approximate index.
+    - params: knob values applied (e.g. {"nprobe": 8})
+    - recall: mean recall@k against the exact reference
+    - latency_ms_mean / latency_ms_p95: single-query search latency
+    """
+
+    params: Mapping[str, Any]
+    recall: float
+    latency_ms_mean: float
+    latency_ms_p95: float
+
+
+def recall_latency_report(
+    *,
+    store: FaissVectorStore,
+    reference: FaissVectorStore,
+    queries: Any,
+    top_k: int = 10,
+    settings: Sequence[Mapping[str, Any]] = ({},),
+) -> list[RecallLatencyPoint]:
+    """
+    Measure recall@top_k and per-query latency of `store` for each knob
+    setting (e.g. [{"nprobe": 1}, {"nprobe": 16}] or [{"ef_search": 32}]),
+    against `reference`, an exact ("flat") store holding the same records.
+    Knob values on `store` are restored afterwards.
+    """
+
+    import numpy as np
+
+    q = np.ascontiguousarray(queries, dtype="float32")
+    truth = [{h.id for h in reference.search(query_vector=row, top_k=top_k)} for row in q]
 
+    saved = {k: getattr(store, k) for k in ("nprobe", "ef_search")}
+    out: list[RecallLatencyPoint] = []
+    try:
+        for setting in settings:
+            for k, v in setting.items():
+                if k not in saved:
+                    raise ValueError(f"unknown search knob: {k!r}")
+                setattr(store, k, v)
+            latencies: list[float] = []
+            recalls: list[float] = []
+            for row, expected in zip(q, truth):
+                t0 = time.perf_counter()
+                hits = store.search(query_vector=row, top_k=top_k)
+                latencies.append((time.perf_counter() - t0) * 1000.0)
+                if expected:
+                    recalls.append(len(expected & {h.id for h in hits}) / len(expected))
+            out.append(
+                RecallLatencyPoint(
+                    params=dict(setting),
+                    recall=float(np.mean(recalls)) if recalls else 1.0,
+                    latency_ms_mean=float(np.mean(latencies)) if latencies else 0.0,
+                    latency_ms_p95=float(np.percentile(latencies, 95)) if latencies else 0.0,
+                )
+            )
+    finally:
+        for k, v in saved.items():
+            setattr(store, k, v)
+    return out
@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Literal, Mapping, Sequence
+
+from .vector_store import VectorSearchResult
+
+
+FusionMethod = Literal["weighted", "rrf"]
+
+
+@dataclass(frozen=True)
+class FusionConfig:
+    """
+    How per-view rankings are merged into one.
+    - weighted: sum of weight * score over the views that returned the id
+      (assumes comparable higher-is-better scores, e.g. cosine / inner product)
+    - rrf: reciprocal-rank fusion, sum of weight / (rrf_k + rank); rank-based,
+      so it works across views with incomparable scores (or l2 distances)
+    - weights: per-view weight (missing views weigh 1.0)
+    """
+
+    method: FusionMethod = "rrf"
+    weights: Mapping[str, float] | None = None
+    rrf_k: int = 60
+
+
+@dataclass(frozen=True)
+class FusedHit:
+    """
+    A fused result; `views` holds the raw score from each view that returned it.
+    """
+
+    id: str
+    score: float
+    views: Mapping[str, float]
+    metadata: Mapping[str, Any] | None = None
+
+
+def fuse_results(
+    results: Mapping[str, Sequence[VectorSearchResult]],
+    *,
+    config: FusionConfig = FusionConfig(),
+    top_k: int | None = None,
+) -> list[FusedHit]:
+    """
+    Merge ranked per-view results (view -> hits, best first). Ties keep the
+    order in which ids were first seen.
+    """
+
+    if config.method not in ("weighted", "rrf"):
+        raise ValueError(f"unknown fusion method: {config.method!r}")
+    weights = config.weights or {}
+
+    score: dict[str, float] = {}
+    views: dict[str, dict[str, float]] = {}
+    metadata: dict[str, Mapping[str, Any] | None] = {}
+    for view, hits in results.items():
+        w = float(weights.get(view, 1.0))
+        for rank, h in enumerate(hits, start=1):
+            if h.id not in score:
+                score[h.id] = 0.0
+                views[h.id] = {}
+                metadata[h.id] = h.metadata
+            if config.method == "weighted":
+                score[h.id] += w * h.score
+            else:
+                score[h.id] += w / (config.rrf_k + rank)
+            views[h.id][view] = h.score
+
+    order = {rid: i for i, rid in enumerate(score)}
+    ranked = sorted(score, key=lambda rid: (-score[rid], order[rid]))
+    if top_k is not None:
+        ranked = ranked[:top_k]
+    return [FusedHit(id=rid, score=score[rid], views=views[rid], metadata=metadata[rid]) for rid in ranked]
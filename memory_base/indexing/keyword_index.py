@@ -0,0 +1,317 @@
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass, field
+from typing import Any, Mapping, Sequence
+
+from memory_base.utils.text import tokenize
+
+from .fusion import FusedHit, FusionConfig, fuse_results
+from .metadata_index import MetadataIndex
+from .vector_store import VectorSearchResult, VectorStore
+
+
+@dataclass
+class BM25Index:
+    """
+    In-process BM25 keyword index over NEI text fields (tech notes §6.1):
+    exact matches on lemma names, file paths and error strings, where
+    embeddings are unreliable.
+
+    Notes:
+    - Text of `fields` is tokenized with `utils.text.tokenize` (identifiers
+      such as `nat.add_comm` split on punctuation, CJK per character).
+    - Posting lists are compressed: per term a bytearray of varint-encoded
+      (doc-number gap, term frequency) pairs. Doc numbers only grow, so adds
+      append to the lists in place.
+    - Queries decode (vectorized, NumPy) and score only the posting lists of
+      their own terms; no scan over documents.
+    - Deleting (or re-adding) a document marks its doc number dead; document
+      frequencies are counted over live postings at query time, so scores stay
+      exact. `compact()` (run once dead documents exceed `compact_ratio` of
+      all documents) purges dead postings and renumbers the live documents,
+      so the per-document tables shrink too.
+    """
+
+    fields: Sequence[str] = ("situation", "goal", "attempt", "result", "reflection")
+    k1: float = 1.2
+    b: float = 0.75
+    compact_ratio: float | None = 0.2
+    _postings: dict[str, bytearray] = field(default_factory=dict, init=False, repr=False)
+    _last: dict[str, int] = field(default_factory=dict, init=False, repr=False)  # term -> last doc number
+    _ids: list[str | None] = field(default_factory=list, init=False, repr=False)  # doc number -> id (None = dead)
+    _meta: list[Mapping[str, Any] | None] = field(default_factory=list, init=False, repr=False)
+    # Doc-number-aligned arrays with spare capacity (replaced, never resized, when growing).
+    _lengths: Any = field(default=None, init=False, repr=False)
+    _alive: Any = field(default=None, init=False, repr=False)
+    _docs: dict[str, int] = field(default_factory=dict, init=False, repr=False)  # id -> live doc number
+    _total_len: int = field(default=0, init=False, repr=False)
+    _dead: int = field(default=0, init=False, repr=False)
+    _meta_index: MetadataIndex = field(default_factory=MetadataIndex, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        import numpy as np
+
+        self._lengths = np.zeros(0, dtype="uint32")
+        self._alive = np.zeros(0, dtype=bool)
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    @property
+    def nbytes(self) -> int:
+        """
+        Size of the compressed posting lists.
+        """
+
+        return sum(len(p) for p in self._postings.values())
+
+    def add(self, id: str, doc: Any, metadata: Mapping[str, Any] | None = None) -> None:
+        """
+        Index (or re-index) a document: a mapping or an object with the text
+        `fields` as keys/attributes (e.g. a NormalizedExperienceInput).
+        """
+        import numpy as np
+
+        self.delete([id])
+        tokens: list[str] = []
+        for name in self.fields:
+            value = doc.get(name) if isinstance(doc, Mapping) else getattr(doc, name, None)
+            if value is not None:
+                tokens.extend(tokenize(str(value)))
+
+        docno = len(self._ids)
+        tf: dict[str, int] = {}
+        for t in tokens:
+            tf[t] = tf.get(t, 0) + 1
+        for term, count in tf.items():
+            buf = self._postings.setdefault(term, bytearray())
+            _write_varint(buf, docno - self._last.get(term, -1))
+            _write_varint(buf, count)
+            self._last[term] = docno
+
+        if docno >= len(self._lengths):
+            capacity = max(1024, 2 * len(self._lengths))
+            lengths = np.zeros(capacity, dtype="uint32")
+            lengths[:docno] = self._lengths[:docno]
+            alive = np.zeros(capacity, dtype=bool)
+            alive[:docno] = self._alive[:docno]
+            self._lengths, self._alive = lengths, alive
+        self._lengths[docno] = len(tokens)
+        self._alive[docno] = True
+        self._ids.append(id)
+        self._meta.append(metadata)
+        self._docs[id] = docno
+        self._total_len += len(tokens)
+        self._meta_index.add(docno, metadata)
+
+    def delete(self, ids: Sequence[str]) -> None:
+        """
+        Remove documents by id; unknown ids are ignored.
+        """
+
+        for record_id in ids:
+            docno = self._docs.pop(record_id, None)
+            if docno is None:
+                continue
+            self._meta_index.remove(docno, self._meta[docno])
+            self._ids[docno] = None
+            self._meta[docno] = None
+            self._alive[docno] = False
+            self._total_len -= int(self._lengths[docno])
+            self._dead += 1
+        if self.compact_ratio is not None and self._dead > self.compact_ratio * max(1, len(self._ids)):
+            self.compact()
+
+    def compact(self) -> None:
+        """
+        Drop dead documents: renumber the live ones 0..n-1 (keeping their
+        order) and re-encode the posting lists.
+        """
+        import numpy as np
+
+        if not self._dead:
+            return
+        alive = self._alive[: len(self._ids)]
+        new_doc = np.cumsum(alive) - 1
+
+        # All posting lists are decoded, filtered and re-encoded in one
+        # vectorized pass (one NumPy call per term would dominate with many
+        # rare terms).
+        terms = list(self._postings)
+        postings: dict[str, bytearray] = {}
+        last: dict[str, int] = {}
+        if terms:
+            bufs = [self._postings[t] for t in terms]
+            sizes = np.fromiter(map(len, bufs), dtype=np.int64, count=len(bufs))
+            a = np.frombuffer(b"".join(bufs), dtype=np.uint8)
+            values = _decode_varints(a)
+            pairs = np.add.reduceat((a < 0x80).astype(np.int64), np.cumsum(sizes) - sizes) // 2
+            term_of = np.repeat(np.arange(len(terms)), pairs)
+            gap_sums = np.cumsum(values[0::2])
+            first = np.cumsum(pairs) - pairs
+            docs = gap_sums - np.repeat(np.concatenate(([0], gap_sums))[first], pairs) - 1
+
+            keep = alive[docs]
+            docs, tfs, term_of = new_doc[docs[keep]], values[1::2][keep], term_of[keep]
+            if len(docs):
+                head = np.flatnonzero(np.concatenate(([True], term_of[1:] != term_of[:-1])))
+                prev = np.concatenate(([-1], docs[:-1]))
+                prev[head] = -1
+                encoded = np.empty(2 * len(docs), dtype=np.int64)
+                encoded[0::2] = docs - prev
+                encoded[1::2] = tfs
+                data, byte_sizes = _encode_varints(encoded)
+                ends = np.cumsum(np.add.reduceat(byte_sizes, 2 * head))
+                starts = np.concatenate(([0], ends[:-1]))
+                tails = np.concatenate((head[1:], [len(docs)])) - 1
+                blob = data.tobytes()
+                for t, b0, b1, d in zip(term_of[head].tolist(), starts.tolist(), ends.tolist(), docs[tails].tolist()):
+                    postings[terms[t]] = bytearray(blob[b0:b1])
+                    last[terms[t]] = d
+        self._postings, self._last = postings, last
+
+        live = np.flatnonzero(alive)
+        self._ids = [self._ids[d] for d in live.tolist()]
+        self._meta = [self._meta[d] for d in live.tolist()]
+        lengths = np.zeros(max(1024, len(live)), dtype="uint32")
+        lengths[: len(live)] = self._lengths[live]
+        self._lengths = lengths
+        self._alive = np.zeros(len(lengths), dtype=bool)
+        self._alive[: len(live)] = True
+        self._docs = {record_id: d for d, record_id in enumerate(self._ids)}
+        self._meta_index = MetadataIndex()
+        for d, m in enumerate(self._meta):
+            self._meta_index.add(d, m)
+        self._dead = 0
+
+    def search(
+        self,
+        *,
+        query: str,
+        top_k: int,
+        filter: Mapping[str, Any] | None = None,
+    ) -> list[VectorSearchResult]:
+        """
+        BM25-ranked documents for `query` (same filter syntax as the vector
+        stores; ties go to the earlier document).
+        """
+        import numpy as np
+
+        n = len(self._docs)
+        if n == 0 or top_k <= 0:
+            return []
+        allowed = None
+        if filter:
+            allowed = self._meta_index.resolve(filter)  # sorted doc numbers
+            if not len(allowed):
+                return []
+        avgdl = self._total_len / n or 1.0
+        lengths, alive = self._lengths, self._alive
+
+        hit_docs: list[Any] = []
+        hit_scores: list[Any] = []
+        for term in dict.fromkeys(tokenize(query)):
+            buf = self._postings.get(term)
+            if buf is None:
+                continue
+            docs, tfs = _decode_postings(buf)
+            live = alive[docs]
+            docs, tfs = docs[live], tfs[live].astype("float64")
+            if not len(docs):
+                continue
+            idf = math.log(1.0 + (n - len(docs) + 0.5) / (len(docs) + 0.5))
+            if allowed is not None:
+                pos = np.minimum(np.searchsorted(allowed, docs), len(allowed) - 1)
+                keep = allowed[pos] == docs
+                docs, tfs = docs[keep], tfs[keep]
+            norm = self.k1 * (1.0 - self.b + self.b * lengths[docs] / avgdl)
+            hit_docs.append(docs)
+            hit_scores.append(idf * tfs * (self.k1 + 1.0) / (tfs + norm))
+        if not hit_docs:
+            return []
+
+        docs, inverse = np.unique(np.concatenate(hit_docs), return_inverse=True)
+        scores = np.bincount(inverse, weights=np.concatenate(hit_scores))
+        if len(docs) > top_k:
+            part = np.argpartition(-scores, top_k - 1)[:top_k]
+            docs, scores = docs[part], scores[part]
+        order = np.lexsort((docs, -scores))
+        return [
+            VectorSearchResult(id=str(self._ids[d]), score=float(s), metadata=self._meta[d])
+            for d, s in zip(docs[order].tolist(), scores[order].tolist())
+        ]
+
+
+def hybrid_search(
+    *,
+    keyword_index: BM25Index,
+    vector_store: VectorStore,
+    query_text: str,
+    query_vector: Sequence[float],
+    top_k: int,
+    filter: Mapping[str, Any] | None = None,
+    fusion: FusionConfig = FusionConfig(),
+    per_source_k: int | None = None,
+) -> list[FusedHit]:
+    """
+    Keyword + vector retrieval fused into one ranking. Each source returns
+    `per_source_k` hits (default 2 * top_k); fused hits carry their "keyword"
+    and "vector" scores in `views`. RRF (the default) is preferred here since
+    BM25 and similarity scores are not on one scale.
+    """
+
+    k = per_source_k or 2 * top_k
+    results = {
+        "keyword": keyword_index.search(query=query_text, top_k=k, filter=filter),
+        "vector": vector_store.search(query_vector=query_vector, top_k=k, filter=filter),
+    }
+    return fuse_results(results, config=fusion, top_k=top_k)
+
+
+def _write_varint(buf: bytearray, x: int) -> None:
+    while x >= 0x80:
+        buf.append((x & 0x7F) | 0x80)
+        x >>= 7
+    buf.append(x)
+
+
+def _encode_varints(values: Any) -> tuple[Any, Any]:
+    """
+    Vectorized varint encode of non-negative int64 values: (uint8 bytes, bytes per value).
+    """
+    import numpy as np
+
+    sizes = np.ones(len(values), dtype=np.int64)
+    for k in range(1, 10):
+        sizes += values >= (1 << (7 * k))
+    starts = np.cumsum(sizes) - sizes
+    byte_no = np.arange(int(sizes.sum())) - np.repeat(starts, sizes)
+    out = (np.repeat(values, sizes) >> (7 * byte_no)) & 0x7F
+    out |= (byte_no < np.repeat(sizes - 1, sizes)).astype(np.int64) << 7
+    return out.astype(np.uint8), sizes
+
+
+def _decode_varints(a: Any) -> Any:
+    """
+    Vectorized varint decode of a uint8 array into int64 values.
+    """
+    import numpy as np
+
+    ends = a < 0x80
+    if ends.all():
+        return a.astype(np.int64)
+    starts = np.flatnonzero(np.concatenate(([True], ends[:-1])))
+    group = np.cumsum(ends) - ends
+    shift = 7 * (np.arange(len(a)) - starts[group])
+    return np.add.reduceat((a & 0x7F).astype(np.int64) << shift, starts)
+
+
+def _decode_postings(buf: bytearray) -> tuple[Any, Any]:
+    """
+    Decode one posting list into (doc numbers, term frequencies) int64 arrays.
+    """
+    import numpy as np
+
+    values = _decode_varints(np.frombuffer(bytes(buf), dtype=np.uint8))
+    return np.cumsum(values[0::2]) - 1, values[1::2]
@@ -0,0 +1,314 @@
+from __future__ import annotations
+
+import math
+from array import array
+from dataclasses import dataclass, field
+from typing import Any, Iterable, Mapping, Sequence
+
+
+# Range operators accepted in a filter value, e.g. {"timestamp": {"gte": t0, "lt": t1}}.
+_RANGE_OPS = frozenset({"gt", "gte", "lt", "lte"})
+
+
+@dataclass
+class MetadataIndex:
+    """
+    Inverted index over record metadata: (field, value) -> posting array of row ids.
+
+    Notes:
+    - Postings are append-only int64 row arrays (adds go to a C array buffer
+      that is folded into a NumPy array on the next read). `remove()` only
+      clears the row in a liveness mask; dead rows are dropped from the
+      postings once they make up half of all adds. Rows must therefore not be
+      re-added after removal (stores number rows sequentially and rebuild the
+      index when they renumber).
+    - List/tuple/set values are indexed per element (e.g. artifacts).
+    - Numeric scalars (e.g. timestamps) go to a per-field value-sorted column
+      plus a short unsorted tail of recent adds instead of per-value postings;
+      ranges (and numeric equality) resolve with `np.searchsorted` on the
+      column and a vectorized scan of the tail.
+    - `resolve()` returns sorted int64 row ids; conditions are intersected
+      with `np.intersect1d`.
+
+    Filter syntax (all fields are ANDed):
+    - {"label": "failure"}: equality (membership for list-valued fields)
+    - {"source_type": ["lean", "text"]}: any of
+    - {"timestamp": {"gte": t0, "lt": t1}}: numeric range
+    """
+
+    fields: Sequence[str] | None = None  # None = index every field
+    _postings: dict[str, dict[Any, _RowList]] = field(default_factory=dict, init=False, repr=False)
+    _numeric: dict[str, _NumericColumn] = field(default_factory=dict, init=False, repr=False)
+    _live: Any = field(default=None, init=False, repr=False)  # row -> bool, with spare capacity
+    _added: int = field(default=0, init=False, repr=False)
+    _removed: int = field(default=0, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        import numpy as np
+
+        self._live = np.zeros(0, dtype=bool)
+
+    def add(self, row: int, metadata: Mapping[str, Any] | None) -> None:
+        import numpy as np
+
+        if row >= len(self._live):
+            live = np.zeros(max(1024, 2 * len(self._live), row + 1), dtype=bool)
+            live[: len(self._live)] = self._live
+            self._live = live
+        self._live[row] = True
+        self._added += 1
+        for name, value in self._indexed(metadata):
+            if _is_number(value):
+                column = self._numeric.get(name)
+                if column is None:
+                    column = self._numeric[name] = _NumericColumn()
+                column.append(row, float(value))
+                continue
+            postings = self._postings.setdefault(name, {})
+            for v in _values(value):
+                rows = postings.get(v)
+                if rows is None:
+                    rows = postings[v] = _RowList()
+                rows.append(row)
+
+    def remove(self, row: int, metadata: Mapping[str, Any] | None) -> None:
+        if row < len(self._live) and self._live[row]:
+            self._live[row] = False
+            self._removed += 1
+            if 2 * self._removed > self._added:
+                self._purge()
+
+    def resolve(self, filter: Mapping[str, Any]) -> Any:
+        """
+        Sorted int64 ids of the live rows matching every condition of `filter`.
+        """
+        import numpy as np
+
+        result = None
+        for name, cond in filter.items():
+            if self.fields is not None and name not in self.fields:
+                raise ValueError(f"metadata field {name!r} is not indexed")
+            rows = self._resolve_one(name, cond)
+            result = rows if result is None else np.intersect1d(result, rows, assume_unique=True)
+            if not len(result):
+                break
+        if result is None:
+            return np.empty(0, dtype="int64")
+        return result
+
+    def _resolve_one(self, name: str, cond: Any) -> Any:
+        import numpy as np
+
+        if isinstance(cond, Mapping):
+            unknown = set(cond) - _RANGE_OPS
+            if unknown:
+                raise ValueError(f"unsupported filter operators for {name!r}: {sorted(unknown)}")
+            column = self._numeric.get(name)
+            rows = np.empty(0, dtype="int64") if column is None else _ascending(column.range(cond))
+            return rows[self._live[rows]]
+
+        values = _values(cond) if isinstance(cond, (list, tuple, set, frozenset)) else _values([cond])
+        postings = self._postings.get(name, {})
+        column = self._numeric.get(name)
+        parts = [postings[v].view() for v in values if v in postings]
+        if column is not None:
+            # Numeric scalars live in the column only: equality is a point range.
+            parts.extend(column.range({"gte": v, "lte": v}) for v in values if _is_number(v))
+        if not parts:
+            return np.empty(0, dtype="int64")
+        rows = _ascending(parts[0]) if len(parts) == 1 else _union(parts)
+        return rows[self._live[rows]]
+
+    def _purge(self) -> None:
+        live = self._live
+        for name, postings in self._postings.items():
+            for v in list(postings):
+                if not postings[v].keep(live):
+                    del postings[v]
+        for name in list(self._numeric):
+            if not self._numeric[name].keep(live):
+                del self._numeric[name]
+        self._added -= self._removed
+        self._removed = 0
+
+    def _indexed(self, metadata: Mapping[str, Any] | None) -> Iterable[tuple[str, Any]]:
+        if not metadata:
+            return ()
+        if self.fields is None:
+            return metadata.items()
+        return ((f, metadata[f]) for f in self.fields if f in metadata)
+
+
+class _RowList:
+    """
+    Append-only int64 row list: a NumPy array with spare capacity plus a C
+    array of rows added since the last read; sorted lazily on read.
+    """
+
+    __slots__ = ("rows", "n", "pending")
+
+    def __init__(self) -> None:
+        self.rows: Any = None
+        self.n = 0
+        self.pending = array("q")
+
+    def append(self, row: int) -> None:
+        self.pending.append(row)
+
+    def view(self) -> Any:
+        import numpy as np
+
+        if self.pending:
+            new = np.frombuffer(self.pending, dtype="int64")
+            k = len(new)
+            if self.rows is None or self.n + k > len(self.rows):
+                rows = np.empty(max(2 * (self.n + k), 4), dtype="int64")
+                if self.n:
+                    rows[: self.n] = self.rows[: self.n]
+                self.rows = rows
+            self.rows[self.n : self.n + k] = new
+            unordered = (self.n and new[0] < self.rows[self.n - 1]) or (k > 1 and bool((np.diff(new) < 0).any()))
+            del new
+            self.n += k
+            self.pending = array("q")
+            if unordered:
+                self.rows[: self.n].sort()
+        if self.rows is None:
+            return np.empty(0, dtype="int64")
+        return self.rows[: self.n]
+
+    def keep(self, live: Any) -> bool:
+        """
+        Drop dead rows; False if none are left.
+        """
+
+        rows = self.view()
+        self.rows = rows[live[rows]]
+        self.n = len(self.rows)
+        return self.n > 0
+
+
+class _NumericColumn:
+    """
+    (value, row) pairs: a value-sorted main part plus an unsorted tail of
+    recent appends, merged into the main part once it grows large.
+    """
+
+    __slots__ = ("values", "rows", "tail_values", "tail_rows")
+
+    def __init__(self) -> None:
+        import numpy as np
+
+        self.values = np.empty(0, dtype="float64")
+        self.rows = np.empty(0, dtype="int64")
+        self.tail_values = array("d")
+        self.tail_rows = array("q")
+
+    def append(self, row: int, value: float) -> None:
+        self.tail_values.append(value)
+        self.tail_rows.append(row)
+
+    def range(self, cond: Mapping[str, Any]) -> Any:
+        """
+        Rows (unordered, possibly dead) with values inside the range.
+        """
+        import numpy as np
+
+        if len(self.tail_rows) > max(1024, len(self.rows) // 16):
+            self._merge()
+        lo, hi = 0, len(self.values)
+        if "gte" in cond:
+            lo = max(lo, int(np.searchsorted(self.values, cond["gte"], side="left")))
+        if "gt" in cond:
+            lo = max(lo, int(np.searchsorted(self.values, cond["gt"], side="right")))
+        if "lte" in cond:
+            hi = min(hi, int(np.searchsorted(self.values, cond["lte"], side="right")))
+        if "lt" in cond:
+            hi = min(hi, int(np.searchsorted(self.values, cond["lt"], side="left")))
+        rows = self.rows[lo:hi] if lo < hi else self.rows[:0]
+        if not self.tail_rows:
+            return rows
+        tv = np.frombuffer(self.tail_values, dtype="float64")
+        mask = np.ones(len(tv), dtype=bool)
+        if "gte" in cond:
+            mask &= tv >= cond["gte"]
+        if "gt" in cond:
+            mask &= tv > cond["gt"]
+        if "lte" in cond:
+            mask &= tv <= cond["lte"]
+        if "lt" in cond:
+            mask &= tv < cond["lt"]
+        return np.concatenate([rows, np.frombuffer(self.tail_rows, dtype="int64")[mask]])
+
+    def keep(self, live: Any) -> bool:
+        """
+        Drop dead rows; False if none are left.
+        """
+
+        self._merge()
+        alive = live[self.rows]
+        self.values, self.rows = self.values[alive], self.rows[alive]
+        return len(self.rows) > 0
+
+    def _merge(self) -> None:
+        import numpy as np
+
+        values = np.concatenate([self.values, np.frombuffer(self.tail_values, dtype="float64")])
+        rows = np.concatenate([self.rows, np.frombuffer(self.tail_rows, dtype="int64")])
+        order = np.argsort(values, kind="stable")
+        self.values, self.rows = values[order], rows[order]
+        self.tail_values, self.tail_rows = array("d"), array("q")
+
+
+def rows_to_bitmap(rows: Any, num_rows: int) -> Any:
+    """
+    LSB-first uint8 bitmap of `rows` covering `num_rows` rows (the layout of
+    faiss.IDSelectorBitmap).
+    """
+
+    import numpy as np
+
+    mask = np.zeros(max(1, num_rows), dtype=bool)
+    mask[rows] = True
+    return np.packbits(mask, bitorder="little")
+
+
+def _ascending(rows: Any) -> Any:
+    """
+    `rows` sorted; column ranges over one value (or rows added in order) usually already are.
+    """
+    import numpy as np
+
+    if len(rows) > 1 and not bool((rows[1:] >= rows[:-1]).all()):
+        return np.sort(rows)
+    return rows
+
+
+def _union(parts: Sequence[Any]) -> Any:
+    """
+    Sorted distinct rows of several arrays (sort + adjacent dedupe; faster than np.unique here).
+    """
+    import numpy as np
+
+    rows = np.sort(np.concatenate(parts))
+    if len(rows) > 1:
+        rows = rows[np.concatenate(([True], rows[1:] != rows[:-1]))]
+    return rows
+
+
+def _values(value: Any) -> Iterable[Any]:
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return list(dict.fromkeys(v for v in value if _hashable(v)))
+    return [value] if _hashable(value) else []
+
+
+def _hashable(value: Any) -> bool:
+    try:
+        hash(value)
+    except TypeError:
+        return False
+    return True
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool) and not math.isnan(value)
@@ -0,0 +1,181 @@
+from __future__ import annotations
+
+import concurrent.futures as cf
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Iterable, Mapping, Sequence
+
+from .fusion import FusedHit, FusionConfig, fuse_results
+from .vector_store import VectorRecord, VectorSearchResult, VectorStore
+
+
+@dataclass(frozen=True)
+class MultiViewRecord:
+    """
+    One event with a vector per view (e.g. situation/goal/attempt/reflection);
+    views without a vector are skipped. Metadata is shared by all views.
+    """
+
+    id: str
+    vectors: Mapping[str, Sequence[float]]
+    metadata: Mapping[str, Any] | None = None
+
+
+@dataclass(frozen=True)
+class MultiViewResult:
+    """
+    Fused hits plus the views that missed the time budget (their results are left out).
+    """
+
+    hits: list[FusedHit]
+    per_view: Mapping[str, list[VectorSearchResult]]
+    timed_out: tuple[str, ...] = ()
+
+
+@dataclass
+class MultiViewIndex:
+    """
+    One VectorStore per view over a shared record id space (tech notes §4.1,
+    §6.1): NEI field indexes plus L2/L3 summary indexes.
+
+    Queries fan out to the chosen views concurrently on a thread pool (FAISS
+    and NumPy matmuls release the GIL) and the per-view rankings are fused.
+    A pool left with timed-out searches is retired (its threads exit once
+    those finish) so later queries get free workers. At most
+    `max_retired_pools` retired pools may still be running stragglers; past
+    that the current pool stays in service and later queries queue behind
+    its stragglers (bounded by their own time budget), so threads stay
+    bounded under sustained timeouts.
+    """
+
+    stores: Mapping[str, VectorStore]
+    max_workers: int | None = None
+    max_retired_pools: int = 4
+    _pool: cf.ThreadPoolExecutor | None = field(default=None, init=False, repr=False)
+    # Retired pools and the stragglers they are still running.
+    _retired: list[tuple[cf.ThreadPoolExecutor, list[cf.Future[Any]]]] = field(
+        default_factory=list, init=False, repr=False
+    )
+    _lock: Any = field(default_factory=threading.Lock, init=False, repr=False)
+
+    def upsert_event(
+        self,
+        id: str,
+        vectors: Mapping[str, Sequence[float]],
+        metadata: Mapping[str, Any] | None = None,
+    ) -> None:
+        self.upsert_events([MultiViewRecord(id=id, vectors=vectors, metadata=metadata)])
+
+    def upsert_events(self, records: Iterable[MultiViewRecord]) -> None:
+        """
+        Upsert every view of each record (one batched upsert per store). A
+        record replaces the previous one: views it has no vector for are
+        deleted from their stores.
+        """
+
+        per_view: dict[str, list[VectorRecord]] = {view: [] for view in self.stores}
+        latest: dict[str, MultiViewRecord] = {}
+        for r in records:
+            for view, vec in r.vectors.items():
+                if view not in self.stores:
+                    raise KeyError(f"unknown view: {view!r}")
+                per_view[view].append(VectorRecord(id=r.id, vector=vec, metadata=r.metadata))
+            latest[r.id] = r
+        for view, batch in per_view.items():
+            if batch:
+                self.stores[view].upsert(batch)
+            stale = [rid for rid, r in latest.items() if view not in r.vectors]
+            if stale:
+                self.stores[view].delete(stale)
+
+    def delete(self, ids: Iterable[str]) -> None:
+        """
+        Delete records from every view.
+        """
+
+        ids = list(ids)
+        for store in self.stores.values():
+            store.delete(ids)
+
+    def search(
+        self,
+        *,
+        query_vector: Sequence[float] | Mapping[str, Sequence[float]],
+        top_k: int,
+        views: Sequence[str] | None = None,
+        filter: Mapping[str, Any] | None = None,
+        fusion: FusionConfig = FusionConfig(),
+        per_view_k: int | None = None,
+        time_budget_s: float | None = None,
+    ) -> MultiViewResult:
+        """
+        Search `views` (default: all) and fuse the rankings.
+
+        `query_vector` is either one vector used for every view or a per-view
+        mapping. Each view returns `per_view_k` hits (default top_k). With
+        `time_budget_s`, views that have not answered by the deadline are
+        reported in `timed_out` and left out of the fusion.
+        """
+
+        chosen = list(self.stores) if views is None else list(views)
+        for view in chosen:
+            if view not in self.stores:
+                raise KeyError(f"unknown view: {view!r}")
+        if isinstance(query_vector, Mapping):
+            chosen = [v for v in chosen if v in query_vector]
+        k = per_view_k or top_k
+
+        def run(view: str) -> list[VectorSearchResult]:
+            q = query_vector[view] if isinstance(query_vector, Mapping) else query_vector
+            return self.stores[view].search(query_vector=q, top_k=k, filter=filter)
+
+        deadline = None if time_budget_s is None else time.perf_counter() + time_budget_s
+        if len(chosen) <= 1 and deadline is None:
+            per_view = {view: run(view) for view in chosen}
+            timed_out: tuple[str, ...] = ()
+        else:
+            with self._lock:
+                pool = self._executor()
+                futures = {pool.submit(run, view): view for view in chosen}
+            done, pending = cf.wait(
+                futures, timeout=None if deadline is None else max(0.0, deadline - time.perf_counter())
+            )
+            if pending:
+                # Stragglers keep running on the old pool and their results are
+                # dropped; new queries go to a fresh pool instead of queueing behind them.
+                for f in pending:
+                    f.cancel()
+                self._retire(pool, list(pending))
+            per_view = {futures[f]: f.result() for f in done}
+            per_view = {view: per_view[view] for view in chosen if view in per_view}
+            timed_out = tuple(futures[f] for f in futures if f in pending)
+
+        hits = fuse_results(per_view, config=fusion, top_k=top_k)
+        return MultiViewResult(hits=hits, per_view=per_view, timed_out=timed_out)
+
+    def close(self) -> None:
+        with self._lock:
+            pool, self._pool = self._pool, None
+            self._retired.clear()
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def _retire(self, pool: cf.ThreadPoolExecutor, stragglers: list[cf.Future[Any]]) -> None:
+        with self._lock:
+            self._retired = [(p, fs) for p, fs in self._retired if not all(f.done() for f in fs)]
+            for p, fs in self._retired:
+                if p is pool:  # already retired by a concurrent query
+                    fs.extend(stragglers)
+                    return
+            if self._pool is not pool or len(self._retired) >= self.max_retired_pools:
+                return
+            self._pool = None
+            self._retired.append((pool, stragglers))
+        pool.shutdown(wait=False)
+
+    def _executor(self) -> cf.ThreadPoolExecutor:
+        if self._pool is None:
+            workers = self.max_workers or max(1, len(self.stores))
+            self._pool = cf.ThreadPoolExecutor(max_workers=workers, thread_name_prefix="multi-view")
+        return self._pool
@@ -0,0 +1,562 @@
+from __future__ import annotations
+
+import json
+import os
+from dataclasses import dataclass, field
+from typing import Any, Iterable, Mapping, Sequence
+
+from .metadata_index import MetadataIndex
+from .vector_store import (
+    BatchFilters,
+    BatchSearchResult,
+    RangeSearchResult,
+    VectorRecord,
+    VectorSearchResult,
+    VectorStore,
+    search_rows_by_filter,
+)
+
+
+@dataclass
+class NumpyVectorStore(VectorStore):
+    """
+    Exact VectorStore on NumPy only (drop-in for `FaissVectorStore` where
+    faiss is not installable).
+
+    Notes:
+    - Vectors live in one contiguous matrix stored as `dtype`:
+      - "float16": half precision (2x smaller than float32)
+      - "int8": symmetric scalar quantization with one float32 scale per row (4x smaller)
+      - "float32": no quantization
+    - Search scans the matrix in blocks of `block_size` rows (dequantize the
+      block + one matmul) and keeps the best `top_k` rows with argpartition.
+    - `keep_full=True` (quantized dtypes) keeps a float32 copy of the
+      vectors as well, used by `get_vectors()` / `range_search_batch()` and
+      for rescoring: with `rescore > 0` (which requires `keep_full`) the scan
+      keeps `top_k * rescore` candidates and reranks them against the copy.
+      The copy costs as much RAM as an unquantized store while writing;
+      after `save()` + `load(mmap=True)` it stays on disk and only candidate
+      rows are paged in. By default there is no copy and no rescoring.
+    - Scores match FAISS: inner product for "ip", squared L2 distance for "l2".
+    - Upserting an existing id or deleting marks its row dead; dead rows are
+      dropped by `compact()`, which runs once they exceed `compact_ratio`.
+    - `search(filter=...)` resolves the filter through a `MetadataIndex` and
+      scans only the matching rows.
+    """
+
+    dim: int
+    metric: str = "ip"  # "ip" (inner product) or "l2"
+    dtype: str = "float16"  # "float16" | "int8" | "float32"
+    rescore: int = 0  # candidates per result reranked in float32; needs keep_full
+    keep_full: bool = False  # keep float32 originals (see Notes)
+    block_size: int = 65_536
+    compact_ratio: float | None = 0.2
+    _n: int = field(default=0, init=False, repr=False)
+    # Row-aligned arrays with spare capacity beyond _n.
+    _codes: Any = field(default=None, init=False, repr=False)  # (cap, dim) quantized vectors
+    _scales: Any = field(default=None, init=False, repr=False)  # (cap,) int8 dequantization scales
+    _sqnorms: Any = field(default=None, init=False, repr=False)  # (cap,) squared norms of the originals
+    _full: Any = field(default=None, init=False, repr=False)  # (cap, dim) float32 for rescoring, or None
+    _alive: Any = field(default=None, init=False, repr=False)  # (cap,) bool
+    _ids: Sequence[str] = field(default_factory=list, init=False, repr=False)
+    _meta: list[Mapping[str, Any] | None] = field(default_factory=list, init=False, repr=False)
+    _rows: dict[str, int] | None = field(default_factory=dict, init=False, repr=False)
+    _dead: int = field(default=0, init=False, repr=False)
+    _meta_index: MetadataIndex | None = field(default=None, init=False, repr=False)
+    _read_only: bool = field(default=False, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        try:
+            import numpy as np
+        except Exception as e:  # pragma: no cover
+            raise ImportError("NumpyVectorStore requires 'numpy'.") from e
+
+        if self.metric not in ("ip", "l2"):
+            raise ValueError("metric must be 'ip' or 'l2'")
+        if self.dtype not in _DTYPES:
+            raise ValueError(f"dtype must be one of {sorted(_DTYPES)}")
+        if self.rescore > 0 and not self.keep_full:
+            raise ValueError("rescore > 0 needs keep_full=True (the float32 copy it reranks against)")
+        self._codes = np.empty((0, self.dim), dtype=self.dtype)
+        self._scales = np.empty(0, dtype="float32")
+        self._sqnorms = np.empty(0, dtype="float32")
+        self._full = np.empty((0, self.dim), dtype="float32") if self._keeps_full() else None
+        self._alive = np.empty(0, dtype=bool)
+
+    def _keeps_full(self) -> bool:
+        return self.keep_full and self.dtype != "float32"
+
+    def __len__(self) -> int:
+        return self._n - self._dead
+
+    @property
+    def nbytes(self) -> int:
+        """
+        Bytes of the stored rows: quantized matrix, per-row arrays and the
+        float32 rescoring copy when kept (memory-mapped arrays included).
+        """
+
+        n = self._n
+        arrays = [self._codes, self._scales, self._sqnorms, self._alive]
+        if self._full is not None:
+            arrays.append(self._full)
+        return int(sum(a[:n].nbytes for a in arrays))
+
+    # --- writes ------------------------------------------------------------
+
+    def upsert(self, records: Iterable[VectorRecord]) -> None:
+        """
+        Insert or replace records by id (the last occurrence wins within a batch).
+        """
+        import numpy as np
+
+        self._check_writable()
+        batch = list(records)
+        if not batch:
+            return
+        vecs = np.asarray([r.vector for r in batch], dtype="float32")
+        self._add([r.id for r in batch], vecs, [r.metadata for r in batch])
+
+    def upsert_arrays(
+        self,
+        ids: Any,
+        vectors: Any,
+        metadata: Mapping[str, Sequence[Any]] | None = None,
+    ) -> None:
+        """
+        Bulk upsert from an id array, an (n, dim) float32 matrix (any buffer,
+        e.g. a memmap; quantized block by block) and columnar metadata.
+        """
+        import numpy as np
+
+        self._check_writable()
+        id_list = [str(x) for x in (ids.tolist() if hasattr(ids, "tolist") else ids)]
+        vecs = np.asarray(vectors)
+        if len(id_list) != len(vecs):
+            raise ValueError(f"got {len(id_list)} ids for {len(vecs)} vectors")
+        metas: list[Mapping[str, Any] | None]
+        if metadata:
+            columns = {k: (v.tolist() if hasattr(v, "tolist") else list(v)) for k, v in metadata.items()}
+            for k, col in columns.items():
+                if len(col) != len(id_list):
+                    raise ValueError(f"metadata column {k!r} has {len(col)} values for {len(id_list)} ids")
+            metas = [dict(zip(columns, values)) for values in zip(*columns.values())]
+        else:
+            metas = [None] * len(id_list)
+        if id_list:
+            self._add(id_list, vecs, metas)
+
+    def _add(self, ids: list[str], vecs: Any, metas: list[Mapping[str, Any] | None]) -> None:
+        if vecs.ndim != 2 or vecs.shape[1] != self.dim:
+            raise ValueError(f"expected vectors shape (n, {self.dim}), got {vecs.shape}")
+
+        rows = self._row_map()
+        for record_id in ids:
+            old = rows.get(record_id)
+            if old is not None:
+                self._retire(old)
+
+        start = self._n
+        self._reserve(start + len(ids))
+        for b0 in range(0, len(ids), self.block_size):
+            b1 = min(len(ids), b0 + self.block_size)
+            self._write(start + b0, vecs[b0:b1])
+        self._alive[start : start + len(ids)] = True
+        self._n = start + len(ids)
+        assert isinstance(self._ids, list)
+        self._ids.extend(ids)
+        self._meta.extend(metas)
+        if self._meta_index is not None:
+            for offset, m in enumerate(metas):
+                self._meta_index.add(start + offset, m)
+        for offset, record_id in enumerate(ids):
+            old = rows.get(record_id)
+            if old is not None and old >= start:
+                # duplicate id inside this batch
+                self._retire(old)
+            rows[record_id] = start + offset
+        self._maybe_compact()
+
+    def _write(self, row: int, block: Any) -> None:
+        import numpy as np
+
+        vecs = np.asarray(block, dtype="float32")
+        end = row + len(vecs)
+        self._sqnorms[row:end] = np.einsum("ij,ij->i", vecs, vecs)
+        if self._full is not None:
+            self._full[row:end] = vecs
+        if self.dtype == "int8":
+            amax = np.abs(vecs).max(axis=1)
+            scale = np.where(amax > 0, amax / 127.0, 1.0).astype("float32")
+            self._codes[row:end] = np.clip(np.rint(vecs / scale[:, None]), -127, 127)
+            self._scales[row:end] = scale
+        else:
+            self._codes[row:end] = vecs
+
+    def _reserve(self, capacity: int) -> None:
+        import numpy as np
+
+        if capacity <= len(self._codes):
+            return
+        capacity = max(capacity, 2 * len(self._codes), 1024)
+
+        def grow(arr: Any) -> Any:
+            out = np.empty((capacity, *arr.shape[1:]), dtype=arr.dtype)
+            out[: self._n] = arr[: self._n]
+            return out
+
+        self._codes = grow(self._codes)
+        self._scales = grow(self._scales)
+        self._sqnorms = grow(self._sqnorms)
+        self._alive = grow(self._alive)
+        if self._full is not None:
+            self._full = grow(self._full)
+
+    def delete(self, ids: Iterable[str]) -> None:
+        """
+        Remove records by id; unknown ids are ignored.
+        """
+
+        self._check_writable()
+        rows = self._row_map()
+        for record_id in ids:
+            row = rows.pop(record_id, None)
+            if row is not None:
+                self._retire(row)
+        self._maybe_compact()
+
+    def compact(self) -> None:
+        """
+        Drop dead rows (row numbers of live records change).
+        """
+        import numpy as np
+
+        self._check_writable()
+        if not self._dead:
+            return
+        keep = np.flatnonzero(self._alive[: self._n])
+        self._codes = self._codes[keep]
+        self._scales = self._scales[keep]
+        self._sqnorms = self._sqnorms[keep]
+        self._alive = np.ones(len(keep), dtype=bool)
+        if self._full is not None:
+            self._full = self._full[keep]
+        self._ids = [self._ids[r] for r in keep.tolist()]
+        self._meta = [self._meta[r] for r in keep.tolist()]
+        self._n = len(keep)
+        self._dead = 0
+        self._rows = None
+        self._meta_index = None
+
+    def _retire(self, row: int) -> None:
+        if self._meta_index is not None:
+            self._meta_index.remove(row, self._meta[row])
+        self._alive[row] = False
+        self._meta[row] = None
+        self._dead += 1
+
+    def _maybe_compact(self) -> None:
+        if self.compact_ratio is None or not self._dead:
+            return
+        if self._dead > self.compact_ratio * max(1, self._n):
+            self.compact()
+
+    def _row_map(self) -> dict[str, int]:
+        if self._rows is None:
+            self._rows = {str(self._ids[r]): r for r in range(self._n) if self._alive[r]}
+        return self._rows
+
+    # --- search ------------------------------------------------------------
+
+    def search(
+        self,
+        *,
+        query_vector: Sequence[float],
+        top_k: int,
+        filter: Mapping[str, Any] | None = None,
+    ) -> list[VectorSearchResult]:
+        import numpy as np
+
+        q = np.asarray([query_vector], dtype="float32")
+        if q.shape != (1, self.dim):
+            raise ValueError(f"expected query_vector dim {self.dim}, got {q.shape}")
+
+        scores, rows = self._search_rows(q, top_k, filter)
+        out: list[VectorSearchResult] = []
+        for score, row in zip(scores[0].tolist(), rows[0].tolist(), strict=False):
+            if row < 0:
+                continue
+            out.append(VectorSearchResult(id=str(self._ids[row]), score=float(score), metadata=self._meta[row]))
+        return out
+
+    def search_batch(
+        self,
+        *,
+        query_matrix: Any,
+        top_k: int,
+        filters: BatchFilters = None,
+    ) -> BatchSearchResult:
+        """
+        One blocked scan for all queries sharing a filter.
+        """
+        import numpy as np
+
+        q = np.ascontiguousarray(query_matrix, dtype="float32")
+        if q.ndim != 2 or q.shape[1] != self.dim:
+            raise ValueError(f"expected query_matrix shape (n, {self.dim}), got {q.shape}")
+        scores, rows = search_rows_by_filter(self._search_rows, q, top_k, filters)
+        return BatchSearchResult.from_rows(scores, rows, self._ids, self._meta)
+
+    def range_search_batch(
+        self,
+        *,
+        query_matrix: Any,
+        radius: float,
+        filter: Mapping[str, Any] | None = None,
+    ) -> RangeSearchResult:
+        """
+        Blocked exact range search (float32 vectors when kept, else the stored
+        matrix): score >= radius ("ip") or squared distance <= radius ("l2").
+        """
+        import numpy as np
+
+        q = np.ascontiguousarray(query_matrix, dtype="float32")
+        if q.ndim != 2 or q.shape[1] != self.dim:
+            raise ValueError(f"expected query_matrix shape (n, {self.dim}), got {q.shape}")
+        subset = self.metadata_index().resolve(filter) if filter else None
+        total = self._n if subset is None else len(subset)
+        matrix = self._full if self._full is not None else self._codes
+        exact_scales = self._full is None and self.dtype == "int8"
+        qsq = np.einsum("ij,ij->i", q, q)
+
+        per_query: list[list[tuple[Any, Any]]] = [[] for _ in range(len(q))]
+        for b0 in range(0, total, self.block_size):
+            b1 = min(total, b0 + self.block_size)
+            sel: Any = slice(b0, b1) if subset is None else subset[b0:b1]
+            idx = np.arange(b0, b1, dtype="int64") if subset is None else subset[b0:b1]
+            dots = q @ matrix[sel].astype("float32").T
+            if exact_scales:
+                dots *= self._scales[sel][None, :]
+            if self.metric == "ip":
+                scores, ok = dots, dots >= radius
+            else:
+                scores = self._sqnorms[sel][None, :] - 2.0 * dots + qsq[:, None]
+                ok = scores <= radius
+            if subset is None:
+                ok &= self._alive[sel][None, :]
+            for qi, cols in enumerate(ok):
+                js = np.flatnonzero(cols)
+                if len(js):
+                    per_query[qi].append((idx[js], scores[qi, js]))
+
+        lims = [0]
+        all_rows: list[Any] = []
+        all_scores: list[Any] = []
+        for parts in per_query:
+            if parts:
+                rows = np.concatenate([p[0] for p in parts])
+                scores = np.concatenate([p[1] for p in parts])
+                order = np.lexsort((rows, -scores if self.metric == "ip" else scores))
+                all_rows.append(rows[order])
+                all_scores.append(scores[order])
+                lims.append(lims[-1] + len(order))
+            else:
+                lims.append(lims[-1])
+        rows = np.concatenate(all_rows) if all_rows else np.empty(0, dtype="int64")
+        scores = np.concatenate(all_scores) if all_scores else np.empty(0, dtype="float32")
+        return RangeSearchResult.from_rows(lims, scores, rows, self._ids, self._meta)
+
+    def get_vectors(self, ids: Sequence[str]) -> Any:
+        """
+        Stored vectors: the float32 copy when kept, else the dequantized matrix.
+        """
+        import numpy as np
+
+        rows_of = self._row_map()
+        missing = [i for i in ids if i not in rows_of]
+        if missing:
+            raise KeyError(missing[0])
+        rows = np.fromiter((rows_of[i] for i in ids), dtype="int64", count=len(ids))
+        if self._full is not None:
+            return np.asarray(self._full[rows], dtype="float32")
+        vecs = np.asarray(self._codes[rows], dtype="float32")
+        if self.dtype == "int8":
+            vecs *= self._scales[rows][:, None]
+        return vecs
+
+    def metadata_index(self) -> MetadataIndex:
+        """
+        Inverted metadata index over live rows (built on first call).
+        """
+
+        if self._meta_index is None:
+            index = MetadataIndex()
+            for row in range(self._n):
+                if self._alive[row]:
+                    index.add(row, self._meta[row])
+            self._meta_index = index
+        return self._meta_index
+
+    def _search_rows(self, q: Any, top_k: int, filter: Mapping[str, Any] | None) -> tuple[Any, Any]:
+        """
+        (scores, rows) arrays of shape (n, top_k); rows are -1 past the last hit.
+        """
+        import numpy as np
+
+        subset = self.metadata_index().resolve(filter) if filter else None
+        rescoring = self._full is not None and self.rescore > 0
+        want = top_k * self.rescore if rescoring else top_k
+        keys, rows = self._scan(q, subset, want)
+        if rescoring and rows.shape[1]:
+            keys = np.where(np.isfinite(keys), self._exact_keys(q, rows), np.inf)
+        order = np.argsort(keys, axis=1, kind="stable")[:, :top_k]
+        keys = np.take_along_axis(keys, order, axis=1)
+        rows = np.take_along_axis(rows, order, axis=1)
+
+        scores = np.full((len(q), top_k), np.nan, dtype="float32")
+        out_rows = np.full((len(q), top_k), -1, dtype="int64")
+        k = rows.shape[1]
+        hit = np.isfinite(keys)
+        scores[:, :k] = np.where(hit, -keys if self.metric == "ip" else keys, np.nan)
+        out_rows[:, :k] = np.where(hit, rows, -1)
+        return scores, out_rows
+
+    def _scan(self, q: Any, subset: Any, want: int) -> tuple[Any, Any]:
+        """
+        Blocked approximate scan: the `want` smallest keys per query (lower is
+        better) over all live rows, or over `subset` rows. Dead rows get +inf.
+        """
+        import numpy as np
+
+        total = self._n if subset is None else len(subset)
+        best_keys = np.empty((len(q), 0), dtype="float32")
+        best_rows = np.empty((len(q), 0), dtype="int64")
+        qsq = np.einsum("ij,ij->i", q, q)
+        for b0 in range(0, total, self.block_size):
+            b1 = min(total, b0 + self.block_size)
+            if subset is None:
+                idx = np.arange(b0, b1, dtype="int64")
+                sel: Any = slice(b0, b1)
+            else:
+                idx = subset[b0:b1]
+                sel = idx
+            block = self._codes[sel].astype("float32")
+            dots = q @ block.T
+            if self.dtype == "int8":
+                dots *= self._scales[sel][None, :]
+            if self.metric == "ip":
+                keys = -dots
+            else:
+                keys = self._sqnorms[sel][None, :] - 2.0 * dots + qsq[:, None]
+            if subset is None:
+                dead = ~self._alive[sel]
+                if dead.any():
+                    keys[:, dead] = np.inf
+
+            keys = np.concatenate([best_keys, keys], axis=1)
+            cand = np.concatenate([best_rows, np.broadcast_to(idx, (len(q), len(idx)))], axis=1)
+            if keys.shape[1] > want:
+                part = np.argpartition(keys, want - 1, axis=1)[:, :want]
+                keys = np.take_along_axis(keys, part, axis=1)
+                cand = np.take_along_axis(cand, part, axis=1)
+            best_keys, best_rows = keys, cand
+        return best_keys, best_rows
+
+    def _exact_keys(self, q: Any, rows: Any) -> Any:
+        """
+        Full-precision keys for candidate rows (n, c).
+        """
+        import numpy as np
+
+        vecs = self._full[rows.ravel()].reshape(*rows.shape, self.dim)
+        if self.metric == "ip":
+            keys = -np.einsum("nd,ncd->nc", q, vecs)
+        else:
+            diff = vecs - q[:, None, :]
+            keys = np.einsum("ncd,ncd->nc", diff, diff)
+        return keys.astype("float32", copy=False)
+
+    # --- persistence -------------------------------------------------------
+
+    def save(self, path: str | os.PathLike[str]) -> None:
+        """
+        Write the store to directory `path` (codes.npy, scales.npy,
+        sqnorms.npy, alive.npy, optional full.npy, ids.npy, meta.jsonl and a
+        store.json manifest).
+        """
+
+        import numpy as np
+
+        os.makedirs(path, exist_ok=True)
+        n = self._n
+        np.save(os.path.join(path, _CODES_FILE), self._codes[:n])
+        np.save(os.path.join(path, _SCALES_FILE), self._scales[:n])
+        np.save(os.path.join(path, _SQNORMS_FILE), self._sqnorms[:n])
+        np.save(os.path.join(path, _ALIVE_FILE), self._alive[:n])
+        if self._full is not None:
+            np.save(os.path.join(path, _FULL_FILE), self._full[:n])
+        np.save(os.path.join(path, _IDS_FILE), np.asarray(list(self._ids), dtype=str))
+        with open(os.path.join(path, _META_FILE), "w", encoding="utf-8") as f:
+            for m in self._meta:
+                f.write(json.dumps(None if m is None else dict(m), ensure_ascii=False))
+                f.write("\n")
+        manifest = {
+            "format": 1,
+            "dim": self.dim,
+            "metric": self.metric,
+            "config": {k: getattr(self, k) for k in _CONFIG_FIELDS},
+            "count": n,
+        }
+        with open(os.path.join(path, _MANIFEST_FILE), "w", encoding="utf-8") as f:
+            json.dump(manifest, f)
+
+    @classmethod
+    def load(cls, path: str | os.PathLike[str], *, mmap: bool = False) -> "NumpyVectorStore":
+        """
+        Load a store written by `save()`. With mmap=True the vector matrices
+        and id table are memory-mapped read-only and the store rejects writes.
+        """
+
+        import numpy as np
+
+        with open(os.path.join(path, _MANIFEST_FILE), "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+        if manifest.get("format") != 1:
+            raise ValueError(f"unsupported NumpyVectorStore format: {manifest.get('format')!r}")
+        store = cls(dim=int(manifest["dim"]), metric=str(manifest["metric"]), **manifest.get("config", {}))
+
+        mode = "r" if mmap else None
+        store._codes = np.load(os.path.join(path, _CODES_FILE), mmap_mode=mode)
+        store._scales = np.load(os.path.join(path, _SCALES_FILE))
+        store._sqnorms = np.load(os.path.join(path, _SQNORMS_FILE))
+        store._alive = np.load(os.path.join(path, _ALIVE_FILE))
+        if store._keeps_full():
+            store._full = np.load(os.path.join(path, _FULL_FILE), mmap_mode=mode)
+        ids = np.load(os.path.join(path, _IDS_FILE), mmap_mode=mode)
+        store._ids = ids if mmap else ids.tolist()
+        store._read_only = mmap
+        store._n = len(store._codes)
+        store._dead = int(store._n - store._alive.sum())
+        store._rows = None
+        with open(os.path.join(path, _META_FILE), "r", encoding="utf-8") as f:
+            store._meta = [json.loads(line) for line in f]
+        if not (store._n == len(store._ids) == len(store._meta) == manifest["count"]):
+            raise ValueError(f"inconsistent NumpyVectorStore files in {os.fspath(path)!r}")
+        return store
+
+    def _check_writable(self) -> None:
+        if self._read_only:
+            raise RuntimeError("NumpyVectorStore was loaded with mmap=True and is read-only.")
+
+
+_DTYPES = frozenset({"float16", "int8", "float32"})
+_CONFIG_FIELDS = ("dtype", "rescore", "keep_full", "block_size", "compact_ratio")
+
+_CODES_FILE = "codes.npy"
+_SCALES_FILE = "scales.npy"
+_SQNORMS_FILE = "sqnorms.npy"
+_ALIVE_FILE = "alive.npy"
+_FULL_FILE = "full.npy"
+_IDS_FILE = "ids.npy"
+_META_FILE = "meta.jsonl"
+_MANIFEST_FILE = "store.json"
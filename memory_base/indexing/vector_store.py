@@ -1,8 +1,9 @@
 from __future__ import annotations
 
+import json
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
-from typing import Any, Iterable, Mapping, Sequence
+from typing import Any, Callable, Iterable, Mapping, Optional, Sequence, Union
 
 
 @dataclass(frozen=True)
@@ -26,6 +27,125 @@ class VectorSearchResult:
     metadata: Mapping[str, Any] | None = None
 
 
+@dataclass(frozen=True)
+class BatchSearchResult:
+    """
+    Hits of `search_batch()` as (n_queries, top_k) NumPy arrays, ranked per row.
+    - ids: record ids (object array)
+    - scores: float32 scores
+    - metadata: record metadata (object array)
+    Queries with fewer than top_k hits are padded with id None / score NaN.
+    """
+
+    ids: Any
+    scores: Any
+    metadata: Any
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def to_results(self) -> list[list[VectorSearchResult]]:
+        out: list[list[VectorSearchResult]] = []
+        for ids, scores, metas in zip(self.ids.tolist(), self.scores.tolist(), self.metadata.tolist()):
+            out.append(
+                [
+                    VectorSearchResult(id=i, score=float(s), metadata=m)
+                    for i, s, m in zip(ids, scores, metas)
+                    if i is not None
+                ]
+            )
+        return out
+
+    @classmethod
+    def from_results(cls, results: Sequence[Sequence[VectorSearchResult]], top_k: int) -> "BatchSearchResult":
+        import numpy as np
+
+        n = len(results)
+        ids = np.full((n, top_k), None, dtype=object)
+        scores = np.full((n, top_k), np.nan, dtype="float32")
+        metadata = np.full((n, top_k), None, dtype=object)
+        for q, hits in enumerate(results):
+            for k, h in enumerate(hits[:top_k]):
+                ids[q, k] = h.id
+                scores[q, k] = h.score
+                metadata[q, k] = h.metadata
+        return cls(ids=ids, scores=scores, metadata=metadata)
+
+    @classmethod
+    def from_rows(
+        cls,
+        scores: Any,
+        rows: Any,
+        id_table: Sequence[Any],
+        meta_table: Sequence[Mapping[str, Any] | None],
+    ) -> "BatchSearchResult":
+        """
+        Build from (n, top_k) score / internal row arrays (row -1 = no hit)
+        and a store's row -> id / metadata tables.
+        """
+        import numpy as np
+
+        hit = rows >= 0
+        scores = np.where(hit, scores, np.float32("nan")).astype("float32", copy=False)
+        ids = np.full(rows.shape, None, dtype=object)
+        metadata = np.full(rows.shape, None, dtype=object)
+        live = rows[hit].tolist()
+        ids[hit] = [str(id_table[r]) for r in live]
+        metadata[hit] = [meta_table[r] for r in live]
+        return cls(ids=ids, scores=scores, metadata=metadata)
+
+
+@dataclass(frozen=True)
+class RangeSearchResult:
+    """
+    Hits of `range_search_batch()` in CSR layout: hits of query q are
+    ids[lims[q]:lims[q + 1]] (scores / metadata likewise), best first.
+    """
+
+    lims: Any
+    ids: Any
+    scores: Any
+    metadata: Any
+
+    def __len__(self) -> int:
+        return len(self.lims) - 1
+
+    def to_results(self) -> list[list[VectorSearchResult]]:
+        lims = self.lims.tolist()
+        ids, scores, metas = self.ids.tolist(), self.scores.tolist(), self.metadata.tolist()
+        return [
+            [VectorSearchResult(id=ids[h], score=float(scores[h]), metadata=metas[h]) for h in range(a, b)]
+            for a, b in zip(lims[:-1], lims[1:])
+        ]
+
+    @classmethod
+    def from_rows(
+        cls,
+        lims: Any,
+        scores: Any,
+        rows: Any,
+        id_table: Sequence[Any],
+        meta_table: Sequence[Mapping[str, Any] | None],
+    ) -> "RangeSearchResult":
+        import numpy as np
+
+        rows = rows.tolist()
+        ids = np.empty(len(rows), dtype=object)
+        metadata = np.empty(len(rows), dtype=object)
+        ids[:] = [str(id_table[r]) for r in rows]
+        metadata[:] = [meta_table[r] for r in rows]
+        return cls(
+            lims=np.asarray(lims, dtype="int64"),
+            ids=ids,
+            scores=np.asarray(scores, dtype="float32"),
+            metadata=metadata,
+        )
+
+
+# One filter for every query, or one (possibly None) filter per query.
+BatchFilters = Union[Mapping[str, Any], Sequence[Optional[Mapping[str, Any]]], None]
+
+
 class VectorStore(ABC):
     """
     Abstract vector index. Can be backed by FAISS, SQLite extensions, Pinecone, etc.
@@ -35,6 +155,28 @@ class VectorStore(ABC):
     def upsert(self, records: Iterable[VectorRecord]) -> None:
         raise NotImplementedError
 
+    def upsert_arrays(
+        self,
+        ids: Any,
+        vectors: Any,
+        metadata: Mapping[str, Sequence[Any]] | None = None,
+    ) -> None:
+        """
+        Bulk upsert from an id array, an (n, dim) vector matrix and columnar
+        metadata (field -> n values). The default builds VectorRecords;
+        stores override it to pass the vector matrix through in one piece.
+        """
+
+        columns = {k: list(v) for k, v in (metadata or {}).items()}
+        self.upsert(
+            VectorRecord(
+                id=str(record_id),
+                vector=vector,
+                metadata={k: col[i] for k, col in columns.items()} if columns else None,
+            )
+            for i, (record_id, vector) in enumerate(zip(ids, vectors))
+        )
+
     @abstractmethod
     def delete(self, ids: Iterable[str]) -> None:
         raise NotImplementedError
@@ -49,4 +191,122 @@ class VectorStore(ABC):
     ) -> list[VectorSearchResult]:
         raise NotImplementedError
 
+    def search_batch(
+        self,
+        *,
+        query_matrix: Any,
+        top_k: int,
+        filters: BatchFilters = None,
+    ) -> BatchSearchResult:
+        """
+        Search n queries at once (`query_matrix` is (n, dim)). The default
+        loops over `search()`; stores override it with a native batch call.
+        """
+
+        per_query = split_filters(filters, len(query_matrix))
+        results = [
+            self.search(query_vector=q, top_k=top_k, filter=f) for q, f in zip(query_matrix, per_query)
+        ]
+        return BatchSearchResult.from_results(results, top_k)
+
+    def range_search_batch(
+        self,
+        *,
+        query_matrix: Any,
+        radius: float,
+        filter: Mapping[str, Any] | None = None,
+    ) -> RangeSearchResult:
+        """
+        All records within `radius` of each query: score >= radius for
+        similarity scores (inner product), distance <= radius for "l2" stores.
+
+        The default repeats `search_batch()` with a doubling top_k until every
+        query has a hit beyond the radius or runs out of records.
+        """
+        import numpy as np
+
+        higher_is_better = getattr(self, "metric", "ip") != "l2"
+        within = (lambda s: s >= radius) if higher_is_better else (lambda s: s <= radius)
+        lims = [0]
+        ids: list[Any] = []
+        scores: list[float] = []
+        metas: list[Any] = []
+        k = 16
+        pending = list(range(len(query_matrix)))
+        found: dict[int, list[tuple[Any, float, Any]]] = {}
+        while pending:
+            batch = self.search_batch(query_matrix=np.asarray(query_matrix)[pending], top_k=k, filters=filter)
+            still: list[int] = []
+            for q, row_ids, row_scores, row_meta in zip(
+                pending, batch.ids.tolist(), batch.scores.tolist(), batch.metadata.tolist()
+            ):
+                hits = [(i, s, m) for i, s, m in zip(row_ids, row_scores, row_meta) if i is not None]
+                if len(hits) == k and within(hits[-1][1]):
+                    still.append(q)
+                else:
+                    found[q] = [h for h in hits if within(h[1])]
+            pending = still
+            k *= 2
+        for q in range(len(query_matrix)):
+            for i, s, m in found[q]:
+                ids.append(i)
+                scores.append(s)
+                metas.append(m)
+            lims.append(len(ids))
+        id_arr = np.empty(len(ids), dtype=object)
+        id_arr[:] = ids
+        meta_arr = np.empty(len(metas), dtype=object)
+        meta_arr[:] = metas
+        return RangeSearchResult(
+            lims=np.asarray(lims, dtype="int64"),
+            ids=id_arr,
+            scores=np.asarray(scores, dtype="float32"),
+            metadata=meta_arr,
+        )
+
+    def get_vectors(self, ids: Sequence[str]) -> Any:
+        """
+        (n, dim) float32 matrix of the stored vectors for `ids` (KeyError for
+        unknown ids). Optional: not every backend can reconstruct vectors.
+        """
+
+        raise NotImplementedError(f"{type(self).__name__} cannot return stored vectors.")
+
+
+def search_rows_by_filter(
+    search_rows: Callable[[Any, int, Mapping[str, Any] | None], tuple[Any, Any]],
+    queries: Any,
+    top_k: int,
+    filters: BatchFilters,
+) -> tuple[Any, Any]:
+    """
+    Run a store's native `search_rows(queries, top_k, filter)` once per
+    distinct filter and reassemble (n, top_k) score / row arrays in query order.
+    """
+    import numpy as np
+
+    if filters is None or isinstance(filters, Mapping):
+        return search_rows(queries, top_k, filters)
+    per_query = split_filters(filters, len(queries))
+    groups: dict[str, list[int]] = {}
+    for i, f in enumerate(per_query):
+        groups.setdefault(json.dumps(f, sort_keys=True, default=repr), []).append(i)
+    scores = np.full((len(queries), top_k), np.nan, dtype="float32")
+    rows = np.full((len(queries), top_k), -1, dtype="int64")
+    for members in groups.values():
+        idx = np.asarray(members)
+        scores[idx], rows[idx] = search_rows(queries[idx], top_k, per_query[members[0]])
+    return scores, rows
+
+
+def split_filters(filters: BatchFilters, n: int) -> list[Mapping[str, Any] | None]:
+    """
+    Expand `search_batch()` filters to one entry per query.
+    """
 
+    if filters is None or isinstance(filters, Mapping):
+        return [filters] * n
+    out = list(filters)
+    if len(out) != n:
+        raise ValueError(f"expected {n} filters (one per query), got {len(out)}")
+    return out
@@ -1,9 +1,11 @@
 from __future__ import annotations
 
+import asyncio
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
-from typing import Any, Mapping, Sequence
+from typing import Any, AsyncIterator, Iterator, Mapping, Sequence
 
+from .transport import _ConcurrencyLimiter
 from .types import ChatMessage, LLMResponse
 
 
@@ -18,6 +20,13 @@ class ChatSession(ABC):
     def send(self, message: str) -> LLMResponse:
         raise NotImplementedError
 
+    async def asend(self, message: str) -> LLMResponse:
+        """
+        Async `send()`; the default runs it in a worker thread.
+        """
+
+        return await asyncio.to_thread(self.send, message)
+
     @property
     @abstractmethod
     def history(self) -> Sequence[ChatMessage]:
@@ -45,6 +54,18 @@ class _DefaultChatSession(ChatSession):
         self._history.append(ChatMessage(role="assistant", content=resp.text))
         return resp
 
+    async def asend(self, message: str) -> LLMResponse:
+        self._history.append(ChatMessage(role="user", content=message))
+        resp = await self._llm._achat(
+            messages=list(self._history),
+            model=self._model,
+            temperature=self._temperature,
+            max_output_tokens=self._max_output_tokens,
+            metadata=self._metadata,
+        )
+        self._history.append(ChatMessage(role="assistant", content=resp.text))
+        return resp
+
     @property
     def history(self) -> Sequence[ChatMessage]:
         return tuple(self._history)
@@ -58,7 +79,13 @@ class LLM(ABC):
     - respond(): single message -> response
     - start_chat(): persistent chat session with internal history
 
-    Providers implement the internal `_chat()` primitive.
+    Providers implement the internal `_chat()` primitive. The async surface
+    (`arespond()`, `ChatSession.asend()`) goes through `_achat()`, which runs
+    `_chat()` in a worker thread unless the provider overrides it with a
+    non-blocking implementation.
+
+    `stream()` / `astream()` yield text deltas from `_stream()`; providers
+    without native streaming yield the whole `_chat()` text as one delta.
     """
 
     @abstractmethod
@@ -73,6 +100,46 @@ class LLM(ABC):
     ) -> LLMResponse:
         raise NotImplementedError
 
+    async def _achat(
+        self,
+        *,
+        messages: Sequence[ChatMessage],
+        model: str,
+        temperature: float | None = None,
+        max_output_tokens: int | None = None,
+        metadata: Mapping[str, Any] | None = None,
+    ) -> LLMResponse:
+        return await asyncio.to_thread(
+            self._chat,
+            messages=messages,
+            model=model,
+            temperature=temperature,
+            max_output_tokens=max_output_tokens,
+            metadata=metadata,
+        )
+
+    def _stream(
+        self,
+        *,
+        messages: Sequence[ChatMessage],
+        model: str,
+        temperature: float | None = None,
+        max_output_tokens: int | None = None,
+        metadata: Mapping[str, Any] | None = None,
+    ) -> Iterator[str]:
+        """
+        Text deltas of one generation. Closing the iterator early should
+        cancel the generation where the provider supports it.
+        """
+
+        yield self._chat(
+            messages=messages,
+            model=model,
+            temperature=temperature,
+            max_output_tokens=max_output_tokens,
+            metadata=metadata,
+        ).text
+
     def respond(
         self,
         message: str,
@@ -83,18 +150,115 @@ class LLM(ABC):
         max_output_tokens: int | None = None,
         metadata: Mapping[str, Any] | None = None,
     ) -> LLMResponse:
-        msgs: list[ChatMessage] = []
-        if system:
-            msgs.append(ChatMessage(role="system", content=system))
-        msgs.append(ChatMessage(role="user", content=message))
         return self._chat(
-            messages=msgs,
+            messages=_single_turn(message, system),
+            model=model,
+            temperature=temperature,
+            max_output_tokens=max_output_tokens,
+            metadata=metadata,
+        )
+
+    async def arespond(
+        self,
+        message: str,
+        *,
+        model: str,
+        system: str | None = None,
+        temperature: float | None = None,
+        max_output_tokens: int | None = None,
+        metadata: Mapping[str, Any] | None = None,
+    ) -> LLMResponse:
+        return await self._achat(
+            messages=_single_turn(message, system),
             model=model,
             temperature=temperature,
             max_output_tokens=max_output_tokens,
             metadata=metadata,
         )
 
+    def stream(
+        self,
+        message: str,
+        *,
+        model: str,
+        system: str | None = None,
+        temperature: float | None = None,
+        max_output_tokens: int | None = None,
+        metadata: Mapping[str, Any] | None = None,
+        stop: Sequence[str] | None = None,
+    ) -> Iterator[str]:
+        """
+        Stream the reply as text deltas. Generation ends right after the first
+        `stop` string (which is included in the output).
+        """
+
+        deltas = self._stream(
+            messages=_single_turn(message, system),
+            model=model,
+            temperature=temperature,
+            max_output_tokens=max_output_tokens,
+            metadata=metadata,
+        )
+        scanner = _StopScanner(stop or ())
+        try:
+            for delta in deltas:
+                delta, done = scanner.feed(delta)
+                if delta:
+                    yield delta
+                if done:
+                    return
+        finally:
+            close = getattr(deltas, "close", None)
+            if close is not None:
+                close()
+
+    async def astream(
+        self,
+        message: str,
+        *,
+        model: str,
+        system: str | None = None,
+        temperature: float | None = None,
+        max_output_tokens: int | None = None,
+        metadata: Mapping[str, Any] | None = None,
+        stop: Sequence[str] | None = None,
+    ) -> AsyncIterator[str]:
+        """
+        Async `stream()`; each delta is pulled from `_stream()` in a worker thread.
+
+        Stop early with `aclose()` (e.g. `contextlib.aclosing`) rather than
+        abandoning the iterator: the underlying stream is only closed then (or
+        when the generator is garbage-collected). On cancellation the delta
+        being pulled is awaited before the stream is closed.
+        """
+
+        deltas = self.stream(
+            message,
+            model=model,
+            system=system,
+            temperature=temperature,
+            max_output_tokens=max_output_tokens,
+            metadata=metadata,
+            stop=stop,
+        )
+        step: asyncio.Future[str | None] | None = None
+        try:
+            while True:
+                # Shielded so that cancelling us does not orphan the thread
+                # still inside next(deltas).
+                step = asyncio.ensure_future(asyncio.to_thread(next, deltas, None))
+                delta = await asyncio.shield(step)
+                if delta is None:
+                    return
+                yield delta
+        finally:
+            if step is not None and not step.done():
+                # deltas.close() would raise while another thread runs the generator.
+                await asyncio.wait([step])
+            if step is not None and not step.cancelled():
+                step.exception()  # already raised above, or dropped on cancellation
+            await asyncio.to_thread(deltas.close)
+
     def start_chat(
         self,
         *,
@@ -117,6 +281,60 @@ class LLM(ABC):
         )
 
 
+def _single_turn(message: str, system: str | None) -> list[ChatMessage]:
+    msgs: list[ChatMessage] = []
+    if system:
+        msgs.append(ChatMessage(role="system", content=system))
+    msgs.append(ChatMessage(role="user", content=message))
+    return msgs
+
+
+class _StopScanner:
+    """
+    Finds the first stop string in a stream of deltas (across delta boundaries).
+    """
+
+    def __init__(self, stops: Sequence[str]) -> None:
+        self.stops = [s for s in stops if s]
+        self._keep = max((len(s) for s in self.stops), default=1) - 1
+        self._tail = ""
+
+    def feed(self, delta: str) -> tuple[str, bool]:
+        """
+        Return the part of `delta` to emit and whether a stop string ended in it.
+        """
+
+        if not self.stops:
+            return delta, False
+        text = self._tail + delta
+        ends = [i + len(s) for s in self.stops if (i := text.find(s)) >= 0]
+        if ends:
+            return delta[: min(ends) - len(self._tail)], True
+        self._tail = text[-self._keep :] if self._keep else ""
+        return delta, False
+
+
+@dataclass
+class _LimitedChatSession(ChatSession):
+    """
+    Chat session whose async turns share the client's concurrency limit.
+    """
+
+    _inner: ChatSession
+    _limiter: _ConcurrencyLimiter
+
+    def send(self, message: str) -> LLMResponse:
+        return self._inner.send(message)
+
+    async def asend(self, message: str) -> LLMResponse:
+        async with self._limiter:
+            return await self._inner.asend(message)
+
+    @property
+    def history(self) -> Sequence[ChatMessage]:
+        return self._inner.history
+
+
 @dataclass
 class LLMClient:
     """
@@ -126,6 +344,10 @@ class LLMClient:
     - `LLM` is an abstract interface; providers often use dataclasses.
     - Call sites usually want a configured client with default model/system/etc.,
       so they don't have to pass `model=...` every time.
+
+    `max_concurrency` bounds the async requests in flight through this client
+    (`arespond()` and `asend()` on its chat sessions), e.g. to match the
+    server's `OLLAMA_NUM_PARALLEL`.
     """
 
     llm: LLM
@@ -134,6 +356,12 @@ class LLMClient:
     temperature: float | None = None
     max_output_tokens: int | None = None
     metadata: Mapping[str, Any] | None = None
+    max_concurrency: int | None = None
+    _limiter: _ConcurrencyLimiter | None = field(default=None, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        if self.max_concurrency is not None:
+            self._limiter = _ConcurrencyLimiter(self.max_concurrency)
 
     def respond(self, message: str, **overrides: Any) -> LLMResponse:
         return self.llm.respond(
@@ -145,13 +373,59 @@ class LLMClient:
             metadata=overrides.get("metadata", self.metadata),
         )
 
+    async def arespond(self, message: str, **overrides: Any) -> LLMResponse:
+        kwargs = dict(
+            model=str(overrides.get("model", self.model)),
+            system=overrides.get("system", self.system),
+            temperature=overrides.get("temperature", self.temperature),
+            max_output_tokens=overrides.get("max_output_tokens", self.max_output_tokens),
+            metadata=overrides.get("metadata", self.metadata),
+        )
+        if self._limiter is None:
+            return await self.llm.arespond(message, **kwargs)
+        async with self._limiter:
+            return await self.llm.arespond(message, **kwargs)
+
+    def stream(self, message: str, **overrides: Any) -> Iterator[str]:
+        return self.llm.stream(message, **self._stream_kwargs(overrides))
+
+    async def astream(self, message: str, **overrides: Any) -> AsyncIterator[str]:
+        """
+        Async stream; with `max_concurrency`, a slot is held until the stream
+        ends. Callers that stop early must `aclose()` the iterator (e.g. with
+        `contextlib.aclosing`), otherwise the slot is held until it is
+        garbage-collected.
+        """
+
+        kwargs = self._stream_kwargs(overrides)
+        if self._limiter is None:
+            async for delta in self.llm.astream(message, **kwargs):
+                yield delta
+            return
+        async with self._limiter:
+            async for delta in self.llm.astream(message, **kwargs):
+                yield delta
+
+    def _stream_kwargs(self, overrides: Mapping[str, Any]) -> dict[str, Any]:
+        return dict(
+            model=str(overrides.get("model", self.model)),
+            system=overrides.get("system", self.system),
+            temperature=overrides.get("temperature", self.temperature),
+            max_output_tokens=overrides.get("max_output_tokens", self.max_output_tokens),
+            metadata=overrides.get("metadata", self.metadata),
+            stop=overrides.get("stop"),
+        )
+
     def start_chat(self, **overrides: Any) -> ChatSession:
-        return self.llm.start_chat(
+        session = self.llm.start_chat(
             model=str(overrides.get("model", self.model)),
             system=overrides.get("system", self.system),
             temperature=overrides.get("temperature", self.temperature),
             max_output_tokens=overrides.get("max_output_tokens", self.max_output_tokens),
             metadata=overrides.get("metadata", self.metadata),
         )
+        if self._limiter is not None:
+            return _LimitedChatSession(_inner=session, _limiter=self._limiter)
+        return session
 
 
@@ -0,0 +1,326 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Iterator, Mapping, Sequence
+
+from .base import LLM, _single_turn
+from .transport import dumps_json, loads_json
+from .types import ChatMessage, LLMResponse, LLMUsage
+
+
+@dataclass
+class CachedLLM(LLM):
+    """
+    Content-addressed response cache in front of any LLM.
+
+    Responses are keyed by sha256(provider, model, messages, temperature,
+    max_output_tokens[, stop]), so replaying a source or rerunning a pipeline
+    does not call the model again for identical prompts.
+
+    Notes:
+    - Two tiers: an in-memory LRU of `memory_entries` responses, and (with
+      `path`) a SQLite file bounded by `max_entries` (least recently used
+      entries are evicted). Entries older than `ttl_s` are treated as misses.
+    - Only deterministic calls are cached: temperature == 0, unless
+      `allow_nondeterministic` is set. `metadata={"cache": False}` bypasses
+      the cache for one call.
+    - `stream()` / `astream()` results are cached per stop list, and only
+      once the stream has been read to the end.
+    - The async paths (`achat`, `astream`) run SQLite lookups and writes in
+      a worker thread, off the event loop.
+    - `provider` namespaces the keys (default: the wrapped LLM's class name).
+    - Cached responses carry text and usage; `raw` is not kept.
+    """
+
+    llm: LLM
+    path: str | None = None
+    max_entries: int = 100_000
+    memory_entries: int = 1024
+    ttl_s: float | None = None
+    allow_nondeterministic: bool = False
+    provider: str | None = None
+    hits: int = field(default=0, init=False)
+    misses: int = field(default=0, init=False)
+    _memory: OrderedDict[str, tuple[float, LLMResponse]] = field(default_factory=OrderedDict, init=False, repr=False)
+    _db: sqlite3.Connection | None = field(default=None, init=False, repr=False)
+    _lock: Any = field(default_factory=threading.Lock, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        if self.provider is None:
+            self.provider = type(self.llm).__qualname__
+        if self.path is not None:
+            self._db = sqlite3.connect(self.path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, value BLOB, created REAL, last_used REAL)"
+            )
+            self._db.execute("CREATE INDEX IF NOT EXISTS responses_last_used ON responses (last_used)")
+            self._db.commit()
+
+    def _chat(
+        self,
+        *,
+        messages: Sequence[ChatMessage],
+        model: str,
+        temperature: float | None = None,
+        max_output_tokens: int | None = None,
+        metadata: Mapping[str, Any] | None = None,
+    ) -> LLMResponse:
+        kwargs = dict(
+            messages=messages,
+            model=model,
+            temperature=temperature,
+            max_output_tokens=max_output_tokens,
+            metadata=metadata,
+        )
+        key = self._key(messages, model, temperature, max_output_tokens, metadata)
+        if key is None:
+            return self.llm._chat(**kwargs)
+        resp = self._get(key)
+        if resp is None:
+            resp = self.llm._chat(**kwargs)
+            self._put(key, resp)
+        return resp
+
+    async def _achat(
+        self,
+        *,
+        messages: Sequence[ChatMessage],
+        model: str,
+        temperature: float | None = None,
+        max_output_tokens: int | None = None,
+        metadata: Mapping[str, Any] | None = None,
+    ) -> LLMResponse:
+        kwargs = dict(
+            messages=messages,
+            model=model,
+            temperature=temperature,
+            max_output_tokens=max_output_tokens,
+            metadata=metadata,
+        )
+        key = self._key(messages, model, temperature, max_output_tokens, metadata)
+        if key is None:
+            return await self.llm._achat(**kwargs)
+        resp = await self._aget(key)
+        if resp is None:
+            resp = await self.llm._achat(**kwargs)
+            await self._aput(key, resp)
+        return resp
+
+    def _stream(
+        self,
+        *,
+        messages: Sequence[ChatMessage],
+        model: str,
+        temperature: float | None = None,
+        max_output_tokens: int | None = None,
+        metadata: Mapping[str, Any] | None = None,
+    ) -> Iterator[str]:
+        return self.llm._stream(
+            messages=messages,
+            model=model,
+            temperature=temperature,
+            max_output_tokens=max_output_tokens,
+            metadata=metadata,
+        )
+
+    def stream(
+        self,
+        message: str,
+        *,
+        model: str,
+        system: str | None = None,
+        temperature: float | None = None,
+        max_output_tokens: int | None = None,
+        metadata: Mapping[str, Any] | None = None,
+        stop: Sequence[str] | None = None,
+    ) -> Iterator[str]:
+        key = self._key(_single_turn(message, system), model, temperature, max_output_tokens, metadata, stop)
+        deltas = self.llm.stream(
+            message,
+            model=model,
+            system=system,
+            temperature=temperature,
+            max_output_tokens=max_output_tokens,
+            metadata=metadata,
+            stop=stop,
+        )
+        if key is None:
+            yield from deltas
+            return
+        cached = self._get(key)
+        if cached is not None:
+            deltas.close()
+            yield cached.text
+            return
+        parts: list[str] = []
+        try:
+            for delta in deltas:
+                parts.append(delta)
+                yield delta
+        finally:
+            deltas.close()
+        self._put(key, LLMResponse(text="".join(parts)))
+
+    async def astream(
+        self,
+        message: str,
+        *,
+        model: str,
+        system: str | None = None,
+        temperature: float | None = None,
+        max_output_tokens: int | None = None,
+        metadata: Mapping[str, Any] | None = None,
+        stop: Sequence[str] | None = None,
+    ) -> AsyncIterator[str]:
+        key = self._key(_single_turn(message, system), model, temperature, max_output_tokens, metadata, stop)
+        cached = None if key is None else await self._aget(key)
+        if cached is not None:
+            yield cached.text
+            return
+        deltas = self.llm.astream(
+            message,
+            model=model,
+            system=system,
+            temperature=temperature,
+            max_output_tokens=max_output_tokens,
+            metadata=metadata,
+            stop=stop,
+        )
+        parts: list[str] = []
+        try:
+            async for delta in deltas:
+                parts.append(delta)
+                yield delta
+        finally:
+            await deltas.aclose()
+        if key is not None:
+            await self._aput(key, LLMResponse(text="".join(parts)))
+
+    def __len__(self) -> int:
+        with self._lock:
+            if self._db is None:
+                return len(self._memory)
+            return int(self._db.execute("SELECT COUNT(*) FROM responses").fetchone()[0])
+
+    def clear(self) -> None:
+        with self._lock:
+            self._memory.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM responses")
+                self._db.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._db is not None:
+                self._db.commit()
+                self._db.close()
+                self._db = None
+
+    def _key(
+        self,
+        messages: Sequence[ChatMessage],
+        model: str,
+        temperature: float | None,
+        max_output_tokens: int | None,
+        metadata: Mapping[str, Any] | None,
+        stop: Sequence[str] | None = None,
+    ) -> str | None:
+        """
+        Cache key, or None when the call must not be cached.
+        """
+
+        if metadata and metadata.get("cache") is False:
+            return None
+        if temperature != 0 and not self.allow_nondeterministic:
+            return None
+        parts: list[Any] = [
+            self.provider,
+            model,
+            [[m.role, m.content] for m in messages],
+            None if temperature is None else float(temperature),
+            max_output_tokens,
+        ]
+        if stop is not None:
+            parts.append(["stream", list(stop)])
+        return hashlib.sha256(dumps_json(parts)).hexdigest()
+
+    def _get(self, key: str) -> LLMResponse | None:
+        now = time.time()
+        fresh_after = -float("inf") if self.ttl_s is None else now - self.ttl_s
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None and entry[0] >= fresh_after:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            if entry is not None:
+                del self._memory[key]
+
+            if self._db is not None:
+                row = self._db.execute("SELECT value, created FROM responses WHERE key=?", (key,)).fetchone()
+                if row is not None and row[1] >= fresh_after:
+                    self._db.execute("UPDATE responses SET last_used=? WHERE key=?", (now, key))
+                    self._db.commit()
+                    resp = _decode(row[0])
+                    self._remember(key, row[1], resp)
+                    self.hits += 1
+                    return resp
+            self.misses += 1
+            return None
+
+    def _put(self, key: str, resp: LLMResponse) -> None:
+        now = time.time()
+        with self._lock:
+            self._remember(key, now, resp)
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?)", (key, _encode(resp), now, now)
+                )
+                self._evict(self._db, now)
+                self._db.commit()
+
+    async def _aget(self, key: str) -> LLMResponse | None:
+        if self._db is None:
+            return self._get(key)
+        return await asyncio.to_thread(self._get, key)
+
+    async def _aput(self, key: str, resp: LLMResponse) -> None:
+        if self._db is None:
+            self._put(key, resp)
+        else:
+            await asyncio.to_thread(self._put, key, resp)
+
+    def _remember(self, key: str, created: float, resp: LLMResponse) -> None:
+        self._memory[key] = (created, resp)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    def _evict(self, db: sqlite3.Connection, now: float) -> None:
+        if self.ttl_s is not None:
+            db.execute("DELETE FROM responses WHERE created < ?", (now - self.ttl_s,))
+        excess = int(db.execute("SELECT COUNT(*) FROM responses").fetchone()[0]) - self.max_entries
+        if excess > 0:
+            db.execute(
+                "DELETE FROM responses WHERE key IN "
+                "(SELECT key FROM responses ORDER BY last_used, rowid LIMIT ?)",
+                (excess,),
+            )
+
+
+def _encode(resp: LLMResponse) -> bytes:
+    usage = None if resp.usage is None else vars(resp.usage)
+    return dumps_json({"text": resp.text, "usage": usage})
+
+
+def _decode(blob: bytes) -> LLMResponse:
+    obj = loads_json(bytes(blob))
+    usage = obj.get("usage")
+    return LLMResponse(text=obj["text"], usage=None if usage is None else LLMUsage(**usage))
@@ -0,0 +1,156 @@
+from __future__ import annotations
+
+import hashlib
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from typing import Any, Sequence
+
+
+class Embedder(ABC):
+    """
+    Provider-agnostic text embedding interface (beside `LLM`).
+
+    Providers implement `_embed()` for one batch; `embed()` splits the input
+    into batches of `batch_size` and returns an (n, dim) float32 NumPy matrix,
+    ready for `VectorStore.upsert_arrays()` / `search_batch()`.
+    """
+
+    batch_size: int = 64
+
+    @abstractmethod
+    def _embed(self, texts: Sequence[str], *, model: str) -> Sequence[Sequence[float]]:
+        raise NotImplementedError
+
+    def embed(self, texts: Sequence[str], *, model: str) -> Any:
+        import numpy as np
+
+        texts = list(texts)
+        rows: list[Any] = []
+        for i in range(0, len(texts), max(1, self.batch_size)):
+            batch = texts[i : i + self.batch_size]
+            vecs = np.asarray(self._embed(batch, model=model), dtype="float32")
+            if vecs.shape[0] != len(batch):
+                raise RuntimeError(f"embedder returned {vecs.shape[0]} vectors for {len(batch)} texts")
+            rows.append(vecs)
+        if not rows:
+            return np.empty((0, 0), dtype="float32")
+        return np.concatenate(rows, axis=0)
+
+
+@dataclass
+class CachedEmbedder(Embedder):
+    """
+    Content-hash cache in front of any Embedder.
+
+    Vectors are keyed by sha256(model, text), so re-ingesting or re-indexing
+    unchanged text never calls the model again. Entries live in a SQLite file
+    (`path`; None = in-memory database) bounded by `max_entries`: the least
+    recently used entries are evicted once the bound is exceeded.
+    """
+
+    embedder: Embedder
+    path: str | None = None
+    max_entries: int = 1_000_000
+    hits: int = field(default=0, init=False)
+    misses: int = field(default=0, init=False)
+    _db: sqlite3.Connection | None = field(default=None, init=False, repr=False)
+    _lock: Any = field(default_factory=threading.Lock, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self.batch_size = self.embedder.batch_size
+        self._db = sqlite3.connect(self.path or ":memory:", check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings ("
+            "key TEXT PRIMARY KEY, dim INTEGER, vec BLOB, last_used REAL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS embeddings_last_used ON embeddings (last_used)")
+        self._db.commit()
+
+    def _embed(self, texts: Sequence[str], *, model: str) -> Sequence[Sequence[float]]:
+        return self.embed(texts, model=model)
+
+    def embed(self, texts: Sequence[str], *, model: str) -> Any:
+        import numpy as np
+
+        texts = list(texts)
+        keys = [_content_key(model, t) for t in texts]
+        found: dict[str, Any] = {}
+        unique = list(dict.fromkeys(keys))
+        now = time.time()
+        with self._lock:
+            db = self._connection()
+            for i in range(0, len(unique), _SQL_CHUNK):
+                chunk = unique[i : i + _SQL_CHUNK]
+                marks = ",".join("?" * len(chunk))
+                for key, dim, blob in db.execute(
+                    f"SELECT key, dim, vec FROM embeddings WHERE key IN ({marks})", chunk
+                ):
+                    found[key] = np.frombuffer(blob, dtype="float32", count=dim)
+                db.execute(f"UPDATE embeddings SET last_used=? WHERE key IN ({marks})", (now, *chunk))
+            missing = [k for k in unique if k not in found]
+            self.hits += sum(1 for k in keys if k in found)
+            self.misses += len(missing)
+
+        if missing:
+            text_of = dict(zip(keys, texts))
+            vecs = self.embedder.embed([text_of[k] for k in missing], model=model)
+            with self._lock:
+                db = self._connection()
+                db.executemany(
+                    "INSERT OR REPLACE INTO embeddings VALUES (?, ?, ?, ?)",
+                    [(k, int(v.shape[0]), v.tobytes(), now) for k, v in zip(missing, vecs)],
+                )
+                self._evict(db)
+            found.update(zip(missing, vecs))
+        with self._lock:
+            self._connection().commit()
+
+        if not keys:
+            return np.empty((0, 0), dtype="float32")
+        return np.stack([found[k] for k in keys]).astype("float32", copy=False)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return int(self._connection().execute("SELECT COUNT(*) FROM embeddings").fetchone()[0])
+
+    def clear(self) -> None:
+        with self._lock:
+            db = self._connection()
+            db.execute("DELETE FROM embeddings")
+            db.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._db is not None:
+                self._db.commit()
+                self._db.close()
+                self._db = None
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._db is None:
+            raise RuntimeError("CachedEmbedder is closed.")
+        return self._db
+
+    def _evict(self, db: sqlite3.Connection) -> None:
+        excess = int(db.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]) - self.max_entries
+        if excess > 0:
+            db.execute(
+                "DELETE FROM embeddings WHERE key IN "
+                "(SELECT key FROM embeddings ORDER BY last_used, rowid LIMIT ?)",
+                (excess,),
+            )
+
+
+def _content_key(model: str, text: str) -> str:
+    h = hashlib.sha256()
+    h.update(model.encode("utf-8"))
+    h.update(b"\0")
+    h.update(text.encode("utf-8"))
+    return h.hexdigest()
+
+
+# Keys per SQL statement (stays under SQLite's host-parameter limit).
+_SQL_CHUNK = 500
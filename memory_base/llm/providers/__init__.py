@@ -1,8 +1,8 @@
-from .mock_provider import MockLLM
+from .mock_provider import MockEmbedder, MockLLM
 from .openai_provider import OpenAILLM
 from .anthropic_provider import AnthropicLLM
-from .ollama_provider import OllamaLLM
+from .ollama_provider import OllamaEmbedder, OllamaLLM
 
-__all__ = ["MockLLM", "OpenAILLM", "AnthropicLLM", "OllamaLLM"]
+__all__ = ["MockLLM", "OpenAILLM", "AnthropicLLM", "OllamaLLM", "MockEmbedder", "OllamaEmbedder"]
 
 
@@ -1,9 +1,14 @@
 from __future__ import annotations
 
+import hashlib
+import math
 from dataclasses import dataclass
 from typing import Any, Mapping, Sequence
 
+from memory_base.utils.text import tokenize
+
 from ..base import LLM
+from ..embeddings import Embedder
 from ..types import ChatMessage, LLMResponse
 
 
@@ -28,3 +33,23 @@ class MockLLM(LLM):
         return LLMResponse(text=f"[mock:{model}] {last}")
 
 
+@dataclass
+class MockEmbedder(Embedder):
+    """
+    Deterministic local embedder for tests/dev: hashed bag of tokens
+    (feature hashing with signs), L2-normalized. Texts sharing tokens get
+    similar vectors; the model name is ignored.
+    """
+
+    dim: int = 64
+
+    def _embed(self, texts: Sequence[str], *, model: str) -> Sequence[Sequence[float]]:
+        out: list[list[float]] = []
+        for text in texts:
+            vec = [0.0] * self.dim
+            for tok in tokenize(text):
+                h = int.from_bytes(hashlib.blake2b(tok.encode("utf-8"), digest_size=8).digest(), "little")
+                vec[h % self.dim] += 1.0 if (h >> 32) & 1 else -1.0
+            norm = math.sqrt(sum(x * x for x in vec))
+            out.append([x / norm for x in vec] if norm else vec)
+        return out
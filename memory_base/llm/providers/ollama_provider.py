@@ -1,12 +1,12 @@
 from __future__ import annotations
 
-import json
 import urllib.error
-import urllib.request
 from dataclasses import dataclass
-from typing import Any, Mapping, Sequence
+from typing import Any, Iterator, Mapping, Sequence
 
 from ..base import LLM
+from ..embeddings import Embedder
+from ..transport import HTTPConnectionPool, dumps_json, loads_json, shared_pool
 from ..types import ChatMessage, LLMResponse
 
 
@@ -25,30 +25,25 @@ def _normalize_ollama_messages(messages: Sequence[ChatMessage]) -> list[dict[str
     return out
 
 
-def _post_json(url: str, payload: Mapping[str, Any], timeout_s: float) -> dict[str, Any]:
-    data = json.dumps(payload).encode("utf-8")
-    req = urllib.request.Request(
-        url,
-        data=data,
-        headers={"Content-Type": "application/json"},
-        method="POST",
-    )
-    with urllib.request.urlopen(req, timeout=timeout_s) as resp:  # nosec - localhost
-        body = resp.read().decode("utf-8")
-    return json.loads(body)
-
-
 @dataclass
 class OllamaLLM(LLM):
     """
     Ollama local provider.
 
     Default endpoint: http://localhost:11434
-    Uses: POST /api/chat (non-streaming).
+    Uses: POST /api/chat (`_stream()` reads the NDJSON stream). All calls go
+    through `pool` (default: the process-wide keep-alive pool for `base_url`);
+    `_achat()` waits for a pool slot on the event loop, so many requests can be
+    pending from one loop without holding threads (the server runs up to
+    OLLAMA_NUM_PARALLEL of them at once).
+
+    Errors: RuntimeError when the server cannot be reached or answers with an
+    HTTP error status, TimeoutError when it does not answer within `timeout_s`.
     """
 
     base_url: str = "http://localhost:11434"
     timeout_s: float = 300.0
+    pool: HTTPConnectionPool | None = None
 
     def _chat(
         self,
@@ -59,8 +54,76 @@ class OllamaLLM(LLM):
         max_output_tokens: int | None = None,
         metadata: Mapping[str, Any] | None = None,
     ) -> LLMResponse:
-        url = self.base_url.rstrip("/") + "/api/chat"
+        payload = self._payload(messages, model, temperature, max_output_tokens, metadata)
+        try:
+            raw = self._pool().post_json("/api/chat", payload, timeout_s=self.timeout_s)
+        except urllib.error.URLError as e:
+            raise _ollama_error(self.base_url, self.timeout_s, e) from e
+        return self._parse(raw)
+
+    async def _achat(
+        self,
+        *,
+        messages: Sequence[ChatMessage],
+        model: str,
+        temperature: float | None = None,
+        max_output_tokens: int | None = None,
+        metadata: Mapping[str, Any] | None = None,
+    ) -> LLMResponse:
+        payload = self._payload(messages, model, temperature, max_output_tokens, metadata)
+        try:
+            raw = await self._pool().apost_json("/api/chat", payload, timeout_s=self.timeout_s)
+        except urllib.error.URLError as e:
+            raise _ollama_error(self.base_url, self.timeout_s, e) from e
+        return self._parse(raw)
+
+    def _stream(
+        self,
+        *,
+        messages: Sequence[ChatMessage],
+        model: str,
+        temperature: float | None = None,
+        max_output_tokens: int | None = None,
+        metadata: Mapping[str, Any] | None = None,
+    ) -> Iterator[str]:
+        # NDJSON: one {"message": {"content": delta}, "done": false} object per
+        # line. Closing the iterator drops the connection, which makes Ollama
+        # cancel the generation.
+        payload = self._payload(messages, model, temperature, max_output_tokens, metadata)
+        payload["stream"] = True
+        lines = self._pool().stream_lines(
+            "POST",
+            "/api/chat",
+            dumps_json(payload),
+            headers={"Content-Type": "application/json"},
+            timeout_s=self.timeout_s,
+        )
+        try:
+            for line in lines:
+                if not line.strip():
+                    continue
+                chunk = loads_json(line)
+                if chunk.get("error"):
+                    raise RuntimeError(f"Ollama error: {chunk['error']}")
+                delta = self._parse(chunk).text
+                if delta:
+                    yield delta
+        except urllib.error.URLError as e:
+            raise _ollama_error(self.base_url, self.timeout_s, e) from e
+        finally:
+            lines.close()
+
+    def _pool(self) -> HTTPConnectionPool:
+        return self.pool or shared_pool(self.base_url)
 
+    @staticmethod
+    def _payload(
+        messages: Sequence[ChatMessage],
+        model: str,
+        temperature: float | None,
+        max_output_tokens: int | None,
+        metadata: Mapping[str, Any] | None,
+    ) -> dict[str, Any]:
         options: dict[str, Any] = {}
         if temperature is not None:
             options["temperature"] = float(temperature)
@@ -78,15 +141,10 @@ class OllamaLLM(LLM):
         if metadata:
             # Keep metadata for audit/debug; Ollama ignores unknown fields.
             payload["metadata"] = dict(metadata)
+        return payload
 
-        try:
-            raw = _post_json(url, payload, timeout_s=self.timeout_s)
-        except urllib.error.URLError as e:
-            raise RuntimeError(
-                f"Failed to reach Ollama at {self.base_url!r}. "
-                "Is `ollama serve` running?"
-            ) from e
-
+    @staticmethod
+    def _parse(raw: Any) -> LLMResponse:
         # Expected:
         # {"message": {"role":"assistant","content":"..."}, ...}
         msg = raw.get("message") if isinstance(raw, dict) else None
@@ -96,18 +154,55 @@ class OllamaLLM(LLM):
         return LLMResponse(text=text, raw=raw)
 
 
+@dataclass
+class OllamaEmbedder(Embedder):
+    """
+    Ollama embeddings. Uses: POST /api/embed with a batch of inputs.
+    """
+
+    base_url: str = "http://localhost:11434"
+    timeout_s: float = 300.0
+    batch_size: int = 64
+    pool: HTTPConnectionPool | None = None
+
+    def _embed(self, texts: Sequence[str], *, model: str) -> Sequence[Sequence[float]]:
+        pool = self.pool or shared_pool(self.base_url)
+        try:
+            raw = pool.post_json("/api/embed", {"model": model, "input": list(texts)}, timeout_s=self.timeout_s)
+        except urllib.error.URLError as e:
+            raise _ollama_error(self.base_url, self.timeout_s, e) from e
+
+        # Expected: {"model": "...", "embeddings": [[...], ...]}
+        embeddings = raw.get("embeddings") if isinstance(raw, dict) else None
+        if not isinstance(embeddings, list):
+            raise RuntimeError(f"Unexpected Ollama /api/embed response: {str(raw)[:200]!r}")
+        return embeddings
+
+
+def _ollama_error(base_url: str, timeout_s: float, e: urllib.error.URLError) -> Exception:
+    """
+    Map a pool error to what callers see: HTTP status errors and timeouts are
+    reported as such, everything else as an unreachable server.
+    """
+
+    if isinstance(e, urllib.error.HTTPError):
+        return RuntimeError(f"Ollama at {base_url!r} returned HTTP {e.code}: {e.reason}")
+    if isinstance(e.reason, TimeoutError):
+        return TimeoutError(f"Ollama at {base_url!r} did not answer within {timeout_s}s")
+    return RuntimeError(
+        f"Failed to reach Ollama at {base_url!r}. "
+        "Is `ollama serve` running?"
+    )
+
+
 def ollama_has_model(*, base_url: str, model: str, timeout_s: float = 3.0) -> bool:
     """
     Best-effort check via GET /api/tags.
     Returns False if unreachable or model not found.
     """
 
-    url = base_url.rstrip("/") + "/api/tags"
-    req = urllib.request.Request(url, method="GET")
     try:
-        with urllib.request.urlopen(req, timeout=timeout_s) as resp:  # nosec - localhost
-            body = resp.read().decode("utf-8")
-        data = json.loads(body)
+        data = shared_pool(base_url).get_json("/api/tags", timeout_s=timeout_s)
         models = data.get("models", [])
         for m in models:
             name = m.get("name")
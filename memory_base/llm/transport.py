@@ -0,0 +1,274 @@
+from __future__ import annotations
+
+import asyncio
+import http.client
+import importlib
+import importlib.util
+import json
+import threading
+import time
+import urllib.error
+import urllib.parse
+import weakref
+from dataclasses import dataclass, field
+from typing import Any, Iterator, Mapping
+
+# orjson is optional; it serializes long chat histories several times faster.
+_orjson: Any = importlib.import_module("orjson") if importlib.util.find_spec("orjson") else None
+
+
+def dumps_json(obj: Any) -> bytes:
+    if _orjson is not None:
+        return _orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def loads_json(data: bytes) -> Any:
+    if _orjson is not None:
+        return _orjson.loads(data)
+    return json.loads(data.decode("utf-8"))
+
+
+# Failures that mean the connection died (typically an idle keep-alive
+# connection closed by the server); the request is retried on a new one.
+_RETRYABLE = (ConnectionResetError, ConnectionAbortedError, BrokenPipeError, http.client.BadStatusLine)
+
+
+class _ConcurrencyLimiter:
+    """
+    Async semaphore usable from any event loop (one semaphore per running loop).
+    """
+
+    def __init__(self, limit: int) -> None:
+        if limit <= 0:
+            raise ValueError("concurrency limit must be positive")
+        self.limit = limit
+        self._by_loop: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore] = (
+            weakref.WeakKeyDictionary()
+        )
+
+    def _semaphore(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        sem = self._by_loop.get(loop)
+        if sem is None:
+            sem = self._by_loop[loop] = asyncio.Semaphore(self.limit)
+        return sem
+
+    async def __aenter__(self) -> None:
+        await self._semaphore().acquire()
+
+    async def __aexit__(self, *exc: Any) -> None:
+        self._semaphore().release()
+
+
+@dataclass
+class HTTPConnectionPool:
+    """
+    Thread-safe pool of persistent keep-alive connections to one HTTP server.
+
+    Notes:
+    - At most `max_connections` requests are in flight; further callers wait
+      for a free connection.
+    - `timeout_s` (or the per-request override) bounds each socket read;
+      connection setup is further capped by `connect_timeout_s`.
+    - Connection resets are retried up to `retries` times with exponential
+      backoff from `backoff_s`. A reused idle connection that turns out to
+      be stale does not count as a retry: it and all other idle connections
+      (at least as old) are dropped and the request goes to a new one.
+    - `apost_json()` serves async callers: they wait for a slot on the event
+      loop and only then take a worker thread.
+    - Errors surface like urllib's: `urllib.error.HTTPError` for status >= 400,
+      `urllib.error.URLError` when the server cannot be reached.
+    """
+
+    base_url: str
+    max_connections: int = 8
+    timeout_s: float = 300.0
+    connect_timeout_s: float = 10.0
+    retries: int = 2
+    backoff_s: float = 0.1
+    _idle: list[http.client.HTTPConnection] = field(default_factory=list, init=False, repr=False)
+    _lock: Any = field(default_factory=threading.Lock, init=False, repr=False)
+    _slots: Any = field(default=None, init=False, repr=False)
+    _async_slots: _ConcurrencyLimiter | None = field(default=None, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        if self.max_connections <= 0:
+            raise ValueError("max_connections must be positive")
+        parts = urllib.parse.urlsplit(self.base_url)
+        if parts.scheme not in ("http", "https"):
+            raise ValueError(f"unsupported URL scheme: {self.base_url!r}")
+        self._secure = parts.scheme == "https"
+        self._host = parts.hostname or "localhost"
+        self._port = parts.port
+        self._prefix = parts.path.rstrip("/")
+        self._slots = threading.BoundedSemaphore(self.max_connections)
+        self._async_slots = _ConcurrencyLimiter(self.max_connections)
+
+    def request(
+        self,
+        method: str,
+        path: str,
+        body: bytes | None = None,
+        *,
+        headers: Mapping[str, str] | None = None,
+        timeout_s: float | None = None,
+    ) -> bytes:
+        """
+        Send one request and return the response body.
+        """
+
+        with self._slots:
+            conn, resp = self._send(method, path, body, headers, timeout_s)
+            try:
+                data = resp.read()
+            except OSError as e:
+                conn.close()
+                raise urllib.error.URLError(e) from e
+            self._release(conn, resp)
+            if resp.status >= 400:
+                raise self._http_error(path, resp, data)
+            return data
+
+    def stream_lines(
+        self,
+        method: str,
+        path: str,
+        body: bytes | None = None,
+        *,
+        headers: Mapping[str, str] | None = None,
+        timeout_s: float | None = None,
+    ) -> Iterator[bytes]:
+        """
+        Send one request and yield the response body line by line (e.g. NDJSON).
+        Closing the iterator early drops the connection, which tells the server
+        to stop producing the response.
+        """
+
+        with self._slots:
+            conn, resp = self._send(method, path, body, headers, timeout_s)
+            if resp.status >= 400:
+                data = resp.read()
+                self._release(conn, resp)
+                raise self._http_error(path, resp, data)
+            finished = False
+            try:
+                for line in resp:
+                    yield line
+                finished = True
+            except OSError as e:
+                raise urllib.error.URLError(e) from e
+            finally:
+                if finished:
+                    self._release(conn, resp)
+                else:
+                    conn.close()
+
+    def post_json(self, path: str, payload: Any, *, timeout_s: float | None = None) -> Any:
+        data = self.request(
+            "POST", path, dumps_json(payload), headers={"Content-Type": "application/json"}, timeout_s=timeout_s
+        )
+        return loads_json(data)
+
+    async def apost_json(self, path: str, payload: Any, *, timeout_s: float | None = None) -> Any:
+        """
+        `post_json()` from async code, on the pool's keep-alive connections.
+        """
+
+        assert self._async_slots is not None
+        async with self._async_slots:
+            return await asyncio.to_thread(self.post_json, path, payload, timeout_s=timeout_s)
+
+    def get_json(self, path: str, *, timeout_s: float | None = None) -> Any:
+        return loads_json(self.request("GET", path, timeout_s=timeout_s))
+
+    def close(self) -> None:
+        """
+        Close idle connections; the pool stays usable.
+        """
+
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for conn in idle:
+            conn.close()
+
+    def _send(
+        self,
+        method: str,
+        path: str,
+        body: bytes | None,
+        headers: Mapping[str, str] | None,
+        timeout_s: float | None,
+    ) -> tuple[http.client.HTTPConnection, http.client.HTTPResponse]:
+        """
+        Send the request and read the response head; the caller holds a slot.
+        """
+
+        url = self._prefix + path
+        hdrs = dict(headers or {})
+        timeout = self.timeout_s if timeout_s is None else timeout_s
+        attempt = 0
+        while True:
+            conn, reused = self._checkout()
+            try:
+                if conn.sock is None:
+                    conn.timeout = min(self.connect_timeout_s, timeout)
+                    conn.connect()
+                conn.sock.settimeout(timeout)
+                conn.request(method, url, body=body, headers=hdrs)
+                return conn, conn.getresponse()
+            except _RETRYABLE as e:
+                conn.close()
+                if reused:
+                    # Closed by the server while idle; the other idle ones likely were too.
+                    self.close()
+                    continue
+                if attempt >= self.retries:
+                    raise urllib.error.URLError(e) from e
+                time.sleep(self.backoff_s * (2**attempt))
+                attempt += 1
+            except OSError as e:
+                conn.close()
+                raise urllib.error.URLError(e) from e
+            except BaseException:
+                conn.close()
+                raise
+
+    def _release(self, conn: http.client.HTTPConnection, resp: http.client.HTTPResponse) -> None:
+        if resp.will_close:
+            conn.close()
+        else:
+            self._checkin(conn)
+
+    def _http_error(self, path: str, resp: http.client.HTTPResponse, data: bytes) -> urllib.error.HTTPError:
+        return urllib.error.HTTPError(
+            self.base_url + path, resp.status, data.decode("utf-8", "replace")[:200], resp.headers, None
+        )
+
+    def _checkout(self) -> tuple[http.client.HTTPConnection, bool]:
+        with self._lock:
+            if self._idle:
+                return self._idle.pop(), True
+        cls = http.client.HTTPSConnection if self._secure else http.client.HTTPConnection
+        return cls(self._host, self._port), False
+
+    def _checkin(self, conn: http.client.HTTPConnection) -> None:
+        with self._lock:
+            self._idle.append(conn)
+
+
+_shared: dict[str, HTTPConnectionPool] = {}
+_shared_lock = threading.Lock()
+
+
+def shared_pool(base_url: str) -> HTTPConnectionPool:
+    """
+    Process-wide default pool for `base_url` (one per server).
+    """
+
+    key = base_url.rstrip("/")
+    with _shared_lock:
+        pool = _shared.get(key)
+        if pool is None:
+            pool = _shared[key] = HTTPConnectionPool(base_url=key)
+        return pool
@@ -0,0 +1,17 @@
+from __future__ import annotations
+
+import re
+
+
+# ASCII-ish words (identifiers, lemma names, numbers) stay whole; CJK text is split per character.
+_TOKEN_RE = re.compile(r"[\u4e00-\u9fff]|[^\W\u4e00-\u9fff]+")
+
+
+def tokenize(text: str | None) -> list[str]:
+    """
+    Lowercased word tokens for keyword/set-based similarity.
+    """
+
+    if not text:
+        return []
+    return _TOKEN_RE.findall(text.lower())
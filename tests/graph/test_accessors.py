@@ -0,0 +1,71 @@
+import unittest
+
+from memory_base.graph.accessors import CachingNodeAccessor
+from memory_base.graph.edge_builders import BuildEdgesConfig, build_similarity_edges
+from memory_base.graph.types import NodeRef
+
+from .test_edge_builders import PairwiseCosine
+
+
+class BulkStore:
+    """Fake DB-backed accessor that counts round trips."""
+
+    def __init__(self, data) -> None:
+        self.data = data
+        self.single_calls = 0
+        self.bulk_calls = 0
+
+    def get_node(self, node: NodeRef):
+        self.single_calls += 1
+        return self.data[node.id]
+
+    def get_nodes(self, nodes):
+        self.bulk_calls += 1
+        return [self.data[n.id] for n in nodes]
+
+
+class TestCachingNodeAccessor(unittest.TestCase):
+    def setUp(self) -> None:
+        self.data = {
+            f"n{i}": {"embedding": [1.0, float(i % 3), float(i % 5)], "situation": "x" * 100}
+            for i in range(12)
+        }
+        self.nodes = [NodeRef(id=k, layer="L1") for k in self.data]
+
+    def test_projection_and_lru(self) -> None:
+        store = BulkStore(self.data)
+        cache = CachingNodeAccessor(store, max_entries=4, fields=("embedding",))
+        got = cache.get_nodes(self.nodes[:3])
+        self.assertEqual(store.bulk_calls, 1)
+        self.assertEqual(set(got[0]), {"embedding"})
+        cache.get_node(self.nodes[0])
+        self.assertEqual(cache.hits, 1)
+        cache.prefetch(self.nodes[3:8])
+        self.assertLessEqual(len(cache._lru), 4)
+        self.assertEqual(store.single_calls, 0)
+
+    def test_builder_prefetches_per_tile(self) -> None:
+        config = BuildEdgesConfig(top_k=2)
+        expected = build_similarity_edges(
+            nodes=self.nodes,
+            metric=PairwiseCosine(),
+            metric_spec=None,
+            accessor=BulkStore(self.data),
+            config=config,
+        )
+        store = BulkStore(self.data)
+        got = build_similarity_edges(
+            nodes=self.nodes,
+            metric=PairwiseCosine(),
+            metric_spec=None,
+            accessor=CachingNodeAccessor(store, max_entries=8, fields=("embedding",)),
+            config=config,
+            tile_size=4,
+        )
+        self.assertEqual(got, expected)
+        self.assertEqual(store.single_calls, 0)
+        self.assertLessEqual(store.bulk_calls, 3 * 3)  # at most one bulk call per tile pair
+
+
+if __name__ == "__main__":
+    unittest.main()
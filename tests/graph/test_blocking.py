@@ -0,0 +1,94 @@
+import importlib.util
+import unittest
+from itertools import combinations
+
+from memory_base.graph.edge_builders import BuildEdgesConfig, build_similarity_edges
+from memory_base.graph.metrics import TokenJaccardMetric
+from memory_base.graph.types import NodeRef
+
+from .test_accessors import BulkStore
+from .test_edge_builders import DictAccessor
+
+
+HAS_NUMPY = importlib.util.find_spec("numpy") is not None
+
+TEXTS = [
+    "simp failed to rewrite the goal after induction on n",
+    "simp failed to rewrite the goal after induction on m",
+    "missing lemma Nat.succ_le_iff in namespace Nat",
+    "missing lemma Nat.succ_le_iff in the Nat namespace",
+    "the garden needs watering every morning before work",
+    "watering the garden every morning before going to work",
+    "unrelated note about grocery shopping",
+]
+
+
+class TestMinHashLSH(unittest.TestCase):
+    def setUp(self) -> None:
+        self.nodes = [NodeRef(id=f"e{i}", layer="L1") for i in range(len(TEXTS))]
+        self.accessor = DictAccessor({f"e{i}": {"situation": t} for i, t in enumerate(TEXTS)})
+        self.metric = TokenJaccardMetric()
+
+    def test_jaccard_metric(self) -> None:
+        self.assertAlmostEqual(
+            self.metric.similarity(u=self.nodes[0], v=self.nodes[0], accessor=self.accessor), 1.0
+        )
+        self.assertEqual(self.metric.similarity(u=self.nodes[0], v=self.nodes[6], accessor=self.accessor), 0.0)
+
+    @unittest.skipUnless(HAS_NUMPY, "numpy not installed")
+    def test_candidates_and_recall(self) -> None:
+        from memory_base.graph.blocking import MinHashLSH, lsh_recall_report
+
+        lsh = MinHashLSH(bands=32, rows=2)
+        pairs = lsh.candidate_pairs(self.nodes, self.accessor)
+        self.assertIn((0, 1), pairs)
+        self.assertIn((2, 3), pairs)
+        self.assertTrue(all(i < j for i, j in pairs))
+        self.assertEqual(pairs, lsh.candidate_pairs(self.nodes, self.accessor))  # deterministic
+
+        bulk = BulkStore(self.accessor.data)
+        self.assertEqual(lsh.candidate_pairs(self.nodes, bulk), pairs)
+        self.assertEqual((bulk.bulk_calls, bulk.single_calls), (1, 0))  # one fetch for all signatures
+
+        report = lsh_recall_report(
+            lsh=lsh,
+            nodes=self.nodes,
+            accessor=self.accessor,
+            metric=self.metric,
+            min_similarity=0.6,
+            candidates=pairs,
+        )
+        self.assertEqual(report.sample_size, len(self.nodes))
+        self.assertGreater(report.true_pairs, 0)
+        self.assertEqual(report.recall, 1.0)
+        self.assertLessEqual(report.candidate_fraction, 1.0)
+
+    def test_builder_with_candidates(self) -> None:
+        config = BuildEdgesConfig(top_k=1, min_similarity=0.3)
+        all_pairs = list(combinations(range(len(self.nodes)), 2))
+        exact = build_similarity_edges(
+            nodes=self.nodes, metric=self.metric, metric_spec=None, accessor=self.accessor, config=config
+        )
+        restricted = build_similarity_edges(
+            nodes=self.nodes,
+            metric=self.metric,
+            metric_spec=None,
+            accessor=self.accessor,
+            config=config,
+            candidates=all_pairs,
+        )
+        self.assertEqual(restricted, exact)
+
+        only = build_similarity_edges(
+            nodes=self.nodes,
+            metric=self.metric,
+            metric_spec=None,
+            accessor=self.accessor,
+            config=config,
+            candidates=[(1, 0)],
+        )
+        self.assertEqual({(e.src.id, e.dst.id) for e in only}, {("e0", "e1"), ("e1", "e0")})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,72 @@
+import os
+import pickle
+import tempfile
+import unittest
+
+from memory_base.graph.cache import CachedSimilarityMetric
+from memory_base.graph.edge_builders import BuildEdgesConfig, build_similarity_edges
+from memory_base.graph.metrics import MetricSpec, TokenJaccardMetric
+from memory_base.graph.types import NodeRef
+
+from .test_edge_builders import DictAccessor
+
+
+class CountingJaccard(TokenJaccardMetric):
+    calls = 0
+
+    def similarity(self, *, u, v, accessor) -> float:
+        CountingJaccard.calls += 1
+        return super().similarity(u=u, v=v, accessor=accessor)
+
+
+class TestCachedSimilarityMetric(unittest.TestCase):
+    def setUp(self) -> None:
+        CountingJaccard.calls = 0
+        texts = ["red apple pie", "green apple pie", "blue sky", "red sky at night"]
+        self.nodes = [NodeRef(id=f"e{i}", layer="L1") for i in range(len(texts))]
+        self.accessor = DictAccessor({f"e{i}": {"situation": t} for i, t in enumerate(texts)})
+        self.spec = MetricSpec(name="token_jaccard", params={"fields": ["situation"]})
+
+    def build(self, metric, **config):
+        return build_similarity_edges(
+            nodes=self.nodes,
+            metric=metric,
+            metric_spec=self.spec,
+            accessor=self.accessor,
+            config=BuildEdgesConfig(**config),
+        )
+
+    def test_reuse_across_configs(self) -> None:
+        cached = CachedSimilarityMetric(metric=CountingJaccard(), spec=self.spec)
+        e1 = self.build(cached, top_k=1)
+        self.assertEqual(CountingJaccard.calls, 6)  # symmetric: one call per unordered pair
+        e2 = self.build(cached, min_similarity=0.3)
+        self.assertEqual(CountingJaccard.calls, 6)
+        self.assertEqual(e1, self.build(CountingJaccard(), top_k=1))
+        self.assertEqual(e2, self.build(CountingJaccard(), min_similarity=0.3))
+        self.assertGreater(cached.hits, 0)
+
+    def test_lru_bound_and_disk_tier(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "sims.sqlite")
+            cached = CachedSimilarityMetric(metric=CountingJaccard(), spec=self.spec, max_entries=2, path=path)
+            self.build(cached, top_k=1)
+            self.assertLessEqual(len(cached._lru), 2)
+            cached.close()
+
+            calls = CountingJaccard.calls
+            reopened = pickle.loads(pickle.dumps(CachedSimilarityMetric(metric=CountingJaccard(), spec=self.spec, path=path)))
+            self.build(reopened, top_k=2)
+            self.assertEqual(CountingJaccard.calls, calls)
+            reopened.close()
+
+            other = CachedSimilarityMetric(
+                metric=CountingJaccard(), spec=MetricSpec(name="token_jaccard", params={"fields": ["goal"]}), path=path
+            )
+            self.build(other, top_k=1)
+            self.assertGreater(CountingJaccard.calls, calls)
+            other.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
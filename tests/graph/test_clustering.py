@@ -0,0 +1,59 @@
+import unittest
+from itertools import permutations
+
+from memory_base.graph.clustering import ClusterEdgesConfig, build_cluster_edges
+from memory_base.graph.metrics import MetricSpec
+from memory_base.graph.types import Edge, NodeRef
+
+
+def L1(x: str) -> NodeRef:
+    return NodeRef(id=x, layer="L1")
+
+
+class TestClusterEdges(unittest.TestCase):
+    def setUp(self) -> None:
+        edges = []
+        for group in ("abc", "def"):
+            for u, v in permutations(group, 2):
+                edges.append(Edge(src=L1(u), dst=L1(v), edge_type="similar", weight=0.9))
+        # "x" leans towards the first group but also touches the second.
+        for u, w in (("a", 0.8), ("b", 0.8), ("d", 0.6)):
+            edges.append(Edge(src=L1("x"), dst=L1(u), edge_type="similar", weight=w))
+        edges.append(Edge(src=L1("c"), dst=L1("f"), edge_type="similar", weight=0.1))
+        self.edges = edges
+        self.lonely = L1("z")
+
+    def groups(self, result):
+        return sorted(sorted(n.id for n in members) for members in result.members.values())
+
+    def test_components(self) -> None:
+        result = build_cluster_edges(
+            edges=self.edges,
+            nodes=[self.lonely],
+            config=ClusterEdgesConfig(method="components", min_similarity=0.5),
+        )
+        self.assertEqual(self.groups(result), [["a", "b", "c", "d", "e", "f", "x"]])
+        self.assertNotIn(self.lonely, [e.src for e in result.edges])
+        self.assertTrue(all(e.edge_type == "member_of" and e.dst.layer == "L2" for e in result.edges))
+
+    def test_label_propagation_with_soft_membership(self) -> None:
+        spec = MetricSpec(name="embedding_cosine")
+        result = build_cluster_edges(
+            edges=self.edges,
+            config=ClusterEdgesConfig(max_memberships=2, min_membership=0.26),
+            metric_spec=spec,
+        )
+        self.assertEqual(len(result.clusters), 2)
+        self.assertEqual(self.groups(result), [["a", "b", "c", "x"], ["d", "e", "f", "x"]])
+        x_edges = sorted((e for e in result.edges if e.src.id == "x"), key=lambda e: -e.weight)
+        self.assertAlmostEqual(x_edges[0].weight, 1.6 / 2.2)
+        self.assertAlmostEqual(x_edges[1].weight, 0.6 / 2.2)
+        self.assertEqual(x_edges[0].meta["metric"], "embedding_cosine")
+
+        hard = build_cluster_edges(edges=self.edges, config=ClusterEdgesConfig())
+        self.assertEqual(self.groups(hard), [["a", "b", "c", "x"], ["d", "e", "f"]])
+        self.assertTrue(all(e.weight == 1.0 for e in hard.edges))
+
+
+if __name__ == "__main__":
+    unittest.main()
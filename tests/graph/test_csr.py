@@ -0,0 +1,58 @@
+import importlib.util
+import unittest
+
+from memory_base.graph.metrics import MetricSpec
+from memory_base.graph.types import Edge, NodeRef
+
+
+HAS_NUMPY = importlib.util.find_spec("numpy") is not None
+
+
+@unittest.skipUnless(HAS_NUMPY, "numpy not installed")
+class TestCSRGraph(unittest.TestCase):
+    def setUp(self) -> None:
+        a, b, c = (NodeRef(id=x, layer="L1") for x in "abc")
+        p = NodeRef(id="p", layer="L2")
+        meta = {"metric": "embedding_cosine", "metric_params": {"field": "embedding"}}
+        self.isolated = NodeRef(id="z", layer="L1")
+        self.edges = [
+            Edge(src=a, dst=b, edge_type="similar", weight=0.5, meta=dict(meta)),
+            Edge(src=b, dst=a, edge_type="similar", weight=0.5, meta=dict(meta)),
+            Edge(src=a, dst=c, edge_type="similar", weight=0.25, meta=dict(meta)),
+            Edge(src=a, dst=p, edge_type="member_of", weight=1.0),
+            Edge(src=c, dst=p, edge_type="member_of"),
+        ]
+        self.a, self.c, self.p = a, c, p
+
+    def test_round_trip(self) -> None:
+        from memory_base.graph.csr import CSRGraph
+
+        g = CSRGraph.from_edges(self.edges, nodes=[self.isolated])
+        self.assertEqual(g.num_edges, len(self.edges))
+        self.assertEqual(len(g.meta_table), 1)  # one shared entry per MetricSpec
+        self.assertEqual(g.metric_spec(0), MetricSpec(name="embedding_cosine", params={"field": "embedding"}))
+        self.assertEqual(g.node_id(self.isolated), 0)
+
+        expected = sorted(self.edges, key=lambda e: (e.edge_type != "similar", g.node_id(e.src)))
+        self.assertEqual(list(g.to_edges()), expected)
+
+        # Weights are stored as float32: the round trip is lossy for other values.
+        lossy = next(CSRGraph.from_edges([Edge(src=self.a, dst=self.c, edge_type="similar", weight=0.1)]).to_edges())
+        self.assertNotEqual(lossy.weight, 0.1)
+        self.assertAlmostEqual(lossy.weight, 0.1, places=7)
+
+    def test_neighbors(self) -> None:
+        from memory_base.graph.csr import CSRGraph
+
+        g = CSRGraph.from_edges(self.edges)
+        ids, weights = g.neighbors(self.a, "similar")
+        self.assertEqual([g.nodes[i].id for i in ids.tolist()], ["b", "c"])
+        self.assertEqual(weights.tolist(), [0.5, 0.25])
+        self.assertEqual(len(g.neighbors(self.p, "similar")[0]), 0)
+        self.assertEqual([e.dst for e in g.out_edges(self.c, ["member_of"])], [self.p])
+        self.assertIsNone(next(g.out_edges(self.c)).weight)
+        self.assertLessEqual(g.nbytes, 12 * g.num_edges + 8 * (len(g.nodes) + 1) * len(g.edge_types))
+
+
+if __name__ == "__main__":
+    unittest.main()
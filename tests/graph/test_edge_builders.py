@@ -0,0 +1,158 @@
+import importlib.util
+import random
+import types
+import unittest
+from typing import Any, Mapping
+
+from memory_base.graph.edge_builders import (
+    BuildEdgesConfig,
+    build_similarity_edges,
+    build_similarity_edges_parallel,
+    iter_similarity_edges,
+)
+from memory_base.graph.metrics import EmbeddingCosineMetric, SimilarityMetric
+from memory_base.graph.types import NodeRef
+
+
+HAS_NUMPY = importlib.util.find_spec("numpy") is not None
+
+VECTORS = {
+    "a": [1.0, 0.0, 0.0],
+    "b": [0.9, 0.1, 0.0],
+    "c": [0.0, 1.0, 0.0],
+    "d": [0.0, 0.8, 0.6],
+    "e": [0.5, 0.5, 0.5],
+}
+
+
+class DictAccessor:
+    def __init__(self, data: Mapping[str, Mapping[str, Any]]) -> None:
+        self.data = data
+
+    def get_node(self, node: NodeRef) -> Mapping[str, Any]:
+        return self.data[node.id]
+
+
+class PairwiseCosine(SimilarityMetric):
+    """Per-pair reference implementation (no block support)."""
+
+    name = "pairwise_cosine"
+
+    def similarity(self, *, u, v, accessor) -> float:
+        a = accessor.get_node(u)["embedding"]
+        b = accessor.get_node(v)["embedding"]
+        dot = sum(x * y for x, y in zip(a, b))
+        na = sum(x * x for x in a) ** 0.5
+        nb = sum(y * y for y in b) ** 0.5
+        return dot / (na * nb)
+
+
+def _key(edges):
+    return [(e.src.id, e.dst.id, e.edge_type, round(float(e.weight), 5)) for e in edges]
+
+
+class TestBuildSimilarityEdges(unittest.TestCase):
+    def setUp(self) -> None:
+        self.nodes = [NodeRef(id=k, layer="L1") for k in VECTORS]
+        self.accessor = DictAccessor({k: {"embedding": v} for k, v in VECTORS.items()})
+
+    def test_requires_strategy(self) -> None:
+        with self.assertRaises(ValueError):
+            build_similarity_edges(
+                nodes=self.nodes,
+                metric=PairwiseCosine(),
+                metric_spec=None,
+                accessor=self.accessor,
+                config=BuildEdgesConfig(),
+            )
+
+    def test_top_k_pairwise(self) -> None:
+        edges = build_similarity_edges(
+            nodes=self.nodes,
+            metric=PairwiseCosine(),
+            metric_spec=None,
+            accessor=self.accessor,
+            config=BuildEdgesConfig(top_k=1, directed=True),
+        )
+        self.assertEqual(len(edges), len(self.nodes))
+        self.assertEqual(edges[0].src.id, "a")
+        self.assertEqual(edges[0].dst.id, "b")
+
+    @unittest.skipUnless(HAS_NUMPY, "numpy not installed")
+    def test_block_metric_matches_pairwise(self) -> None:
+        for config in (
+            BuildEdgesConfig(top_k=2),
+            BuildEdgesConfig(top_k=2, directed=True, min_similarity=0.5),
+            BuildEdgesConfig(min_similarity=0.6),
+        ):
+            expected = build_similarity_edges(
+                nodes=self.nodes,
+                metric=PairwiseCosine(),
+                metric_spec=None,
+                accessor=self.accessor,
+                config=config,
+            )
+            got = build_similarity_edges(
+                nodes=self.nodes,
+                metric=EmbeddingCosineMetric(),
+                metric_spec=None,
+                accessor=self.accessor,
+                config=config,
+                tile_size=2,
+            )
+            self.assertEqual(_key(got), _key(expected), msg=str(config))
+
+    @unittest.skipUnless(HAS_NUMPY, "numpy not installed")
+    def test_streaming_tiles_with_ties(self) -> None:
+        rng = random.Random(0)
+        # Coarse coordinates produce many tied scores across tile boundaries.
+        data = {f"n{i}": {"embedding": [rng.choice([0.0, 1.0]) for _ in range(3)] + [1.0]} for i in range(23)}
+        nodes = [NodeRef(id=k, layer="L1") for k in data]
+        accessor = DictAccessor(data)
+        config = BuildEdgesConfig(top_k=4, directed=True)
+
+        stream = iter_similarity_edges(
+            nodes=nodes,
+            metric=EmbeddingCosineMetric(),
+            metric_spec=None,
+            accessor=accessor,
+            config=config,
+            tile_size=5,
+        )
+        self.assertIsInstance(stream, types.GeneratorType)
+        expected = build_similarity_edges(
+            nodes=nodes, metric=PairwiseCosine(), metric_spec=None, accessor=accessor, config=config
+        )
+        self.assertEqual(_key(stream), _key(expected))
+
+    @unittest.skipUnless(HAS_NUMPY, "numpy not installed")
+    def test_parallel_matches_serial(self) -> None:
+        rng = random.Random(1)
+        data = {f"n{i}": {"embedding": [rng.random() for _ in range(4)]} for i in range(30)}
+        nodes = [NodeRef(id=k, layer="L1") for k in data]
+        accessor = DictAccessor(data)
+
+        for metric in (EmbeddingCosineMetric(), PairwiseCosine()):
+            for config in (
+                BuildEdgesConfig(top_k=3),
+                BuildEdgesConfig(top_k=3, directed=True, min_similarity=0.8),
+                BuildEdgesConfig(min_similarity=0.9),
+            ):
+                expected = build_similarity_edges(
+                    nodes=nodes, metric=metric, metric_spec=None, accessor=accessor, config=config
+                )
+                for workers in (1, 2):
+                    got = build_similarity_edges_parallel(
+                        nodes=nodes,
+                        metric=metric,
+                        metric_spec=None,
+                        accessor=accessor,
+                        config=config,
+                        tile_size=7,
+                        workers=workers,
+                    )
+                    self.assertEqual(_key(got), _key(expected), msg=f"{metric.name} {config} {workers}")
+
+
+if __name__ == "__main__":
+    unittest.main()
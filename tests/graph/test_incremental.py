@@ -0,0 +1,77 @@
+import importlib.util
+import random
+import unittest
+
+from memory_base.graph.edge_builders import BuildEdgesConfig, build_similarity_edges
+from memory_base.graph.metrics import EmbeddingCosineMetric
+from memory_base.graph.types import NodeRef
+
+from .test_edge_builders import DictAccessor, PairwiseCosine
+
+
+HAS_NUMPY = importlib.util.find_spec("numpy") is not None
+
+
+def _edge_set(edges):
+    return {(e.src.id, e.dst.id, round(float(e.weight), 5)) for e in edges}
+
+
+@unittest.skipUnless(HAS_NUMPY, "numpy not installed")
+class TestIncrementalEdgeIndex(unittest.TestCase):
+    def setUp(self) -> None:
+        rng = random.Random(2)
+        data = {f"n{i}": {"embedding": [rng.random() - 0.5 for _ in range(4)]} for i in range(40)}
+        self.nodes = [NodeRef(id=k, layer="L1") for k in data]
+        self.accessor = DictAccessor(data)
+
+    def test_batches_match_full_rebuild(self) -> None:
+        from memory_base.graph.incremental import IncrementalEdgeIndex
+
+        for metric in (EmbeddingCosineMetric(), PairwiseCosine()):
+            for config in (
+                BuildEdgesConfig(top_k=3),
+                BuildEdgesConfig(top_k=3, directed=True, min_similarity=0.2),
+                BuildEdgesConfig(min_similarity=0.5),
+            ):
+                index = IncrementalEdgeIndex(
+                    metric=metric, metric_spec=None, accessor=self.accessor, config=config, tile_size=6
+                )
+                live: set = set()
+                for b0 in range(0, len(self.nodes), 13):
+                    delta = index.add(self.nodes[b0 : b0 + 13])
+                    removed = _edge_set(delta.removed)
+                    self.assertTrue(removed <= live)
+                    live = (live - removed) | _edge_set(delta.added)
+                    self.assertEqual(live, _edge_set(index.edges()))
+
+                full = build_similarity_edges(
+                    nodes=self.nodes, metric=metric, metric_spec=None, accessor=self.accessor, config=config
+                )
+                self.assertEqual(live, _edge_set(full), msg=f"{metric.name} {config}")
+
+    def test_from_edges_then_add(self) -> None:
+        from memory_base.graph.incremental import IncrementalEdgeIndex
+
+        metric = EmbeddingCosineMetric()
+        config = BuildEdgesConfig(top_k=2)
+        head, tail = self.nodes[:30], self.nodes[30:]
+        existing = build_similarity_edges(
+            nodes=head, metric=metric, metric_spec=None, accessor=self.accessor, config=config
+        )
+        index = IncrementalEdgeIndex.from_edges(
+            nodes=head, edges=existing, metric=metric, metric_spec=None, accessor=self.accessor, config=config
+        )
+        self.assertEqual(_edge_set(index.edges()), _edge_set(existing))
+
+        delta = index.add(tail)
+        self.assertTrue(delta.added)
+        full = build_similarity_edges(
+            nodes=self.nodes, metric=metric, metric_spec=None, accessor=self.accessor, config=config
+        )
+        self.assertEqual(_edge_set(index.edges()), _edge_set(full))
+        with self.assertRaises(ValueError):
+            index.add(tail[:1])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,108 @@
+import importlib.util
+import unittest
+
+from memory_base.graph.edge_builders import (
+    BuildEdgesConfig,
+    build_similarity_edges,
+    build_similarity_edges_from_store,
+)
+from memory_base.graph.metrics import EmbeddingCosineMetric, MetricSpec
+from memory_base.graph.types import NodeRef
+
+from .test_edge_builders import DictAccessor, _key
+
+
+HAS_NUMPY = importlib.util.find_spec("numpy") is not None
+HAS_FAISS = HAS_NUMPY and importlib.util.find_spec("faiss") is not None
+
+
+def _stores():
+    from memory_base.indexing.numpy_store import NumpyVectorStore
+
+    yield NumpyVectorStore(dim=8, dtype="float32")
+    yield NumpyVectorStore(dim=8, dtype="int8", block_size=16, keep_full=True, rescore=4)
+    if HAS_FAISS:
+        from memory_base.indexing.faiss_store import FaissVectorStore
+
+        yield FaissVectorStore(dim=8)
+        yield FaissVectorStore(dim=8, index_type="hnsw", hnsw_m=16, ef_search=128)
+
+
+@unittest.skipUnless(HAS_NUMPY, "numpy not installed")
+class TestBuildEdgesFromStore(unittest.TestCase):
+    def setUp(self) -> None:
+        import numpy as np
+
+        rng = np.random.default_rng(11)
+        vecs = rng.standard_normal((60, 8)).astype("float32")
+        self.vecs = vecs / np.linalg.norm(vecs, axis=1, keepdims=True)
+        self.nodes = [NodeRef(id=f"n{i}", layer="L1") for i in range(60)]
+        self.accessor = DictAccessor({n.id: {"embedding": v.tolist()} for n, v in zip(self.nodes, self.vecs)})
+        self.spec = MetricSpec(name="embedding_cosine", params={"field": "embedding"})
+
+    def _reference(self, config: BuildEdgesConfig):
+        return build_similarity_edges(
+            nodes=self.nodes,
+            metric=EmbeddingCosineMetric(),
+            metric_spec=self.spec,
+            accessor=self.accessor,
+            config=config,
+        )
+
+    def test_matches_pairwise_builder(self) -> None:
+        ids = [n.id for n in self.nodes]
+        configs = [
+            BuildEdgesConfig(top_k=3),
+            BuildEdgesConfig(top_k=4, directed=True, min_similarity=0.3),
+            BuildEdgesConfig(min_similarity=0.5),
+            BuildEdgesConfig(min_similarity=0.4, directed=True, edge_type="near"),
+        ]
+        for store in _stores():
+            store.upsert_arrays(ids, self.vecs)
+            for config in configs:
+                want = self._reference(config)
+                got = build_similarity_edges_from_store(
+                    nodes=self.nodes, store=store, metric_spec=self.spec, config=config, batch_size=7
+                )
+                self.assertEqual(_key(got), _key(want), msg=(type(store).__name__, config))
+                self.assertEqual(got[0].meta, want[0].meta)
+
+    def test_explicit_vectors_and_record_ids(self) -> None:
+        from memory_base.indexing.numpy_store import NumpyVectorStore
+
+        store = NumpyVectorStore(dim=8, keep_full=True, rescore=4)
+        store.upsert_arrays([f"rec-{i}" for i in range(60)], self.vecs)
+        store.upsert_arrays(["outside"], self.vecs[:1])  # not one of the nodes: never an edge target
+        config = BuildEdgesConfig(min_similarity=0.5)
+        got = build_similarity_edges_from_store(
+            nodes=self.nodes,
+            store=store,
+            metric_spec=self.spec,
+            config=config,
+            vectors=self.vecs,
+            record_ids=[f"rec-{i}" for i in range(60)],
+        )
+        self.assertEqual(_key(got), _key(self._reference(config)))
+
+        # Records outside `nodes` next to every node must not take top-k slots.
+        store.upsert_arrays([f"near-{i}" for i in range(60)], self.vecs + 0.01)
+        for config in (BuildEdgesConfig(top_k=3), BuildEdgesConfig(top_k=3, directed=True, min_similarity=0.2)):
+            got = build_similarity_edges_from_store(
+                nodes=self.nodes,
+                store=store,
+                metric_spec=self.spec,
+                config=config,
+                vectors=self.vecs,
+                record_ids=[f"rec-{i}" for i in range(60)],
+                batch_size=16,
+            )
+            self.assertEqual(_key(got), _key(self._reference(config)), msg=config)
+
+        with self.assertRaises(ValueError):
+            build_similarity_edges_from_store(
+                nodes=self.nodes, store=NumpyVectorStore(dim=8, metric="l2"), metric_spec=None, config=config
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,67 @@
+import unittest
+
+from memory_base.graph.traversal import AdjacencyGraph, TraversalConfig, bounded_bfs
+from memory_base.graph.types import Edge, NodeRef
+
+
+def L1(x: str) -> NodeRef:
+    return NodeRef(id=x, layer="L1")
+
+
+class TestBoundedBFS(unittest.TestCase):
+    def setUp(self) -> None:
+        a, b, c, d, e = (L1(x) for x in "abcde")
+        p = NodeRef(id="p", layer="L2")
+        q = NodeRef(id="q", layer="L3")
+        self.nodes = {"a": a, "b": b, "c": c, "d": d, "e": e, "p": p, "q": q}
+        self.graph = AdjacencyGraph.from_edges(
+            [
+                Edge(src=a, dst=b, edge_type="similar", weight=0.9),
+                Edge(src=a, dst=c, edge_type="similar", weight=0.4),
+                Edge(src=b, dst=d, edge_type="similar", weight=0.8),
+                Edge(src=c, dst=e, edge_type="similar", weight=0.9),
+                Edge(src=a, dst=p, edge_type="member_of", weight=1.0),
+                Edge(src=p, dst=q, edge_type="supports"),
+            ]
+        )
+
+    def ids(self, result):
+        return [h.node.id for h in result.hits]
+
+    def test_ranked_with_paths(self) -> None:
+        result = bounded_bfs(graph=self.graph, seeds=[self.nodes["a"]], config=TraversalConfig(max_depth=2))
+        self.assertFalse(result.timed_out)
+        self.assertEqual(self.ids(result), ["a", "p", "q", "b", "d", "c", "e"])
+        d = next(h for h in result.hits if h.node.id == "d")
+        self.assertEqual(d.depth, 2)
+        self.assertAlmostEqual(d.score, 0.72)
+        self.assertEqual([(e.src.id, e.dst.id) for e in d.path], [("a", "b"), ("b", "d")])
+
+    def test_width_type_and_layer_filters(self) -> None:
+        narrow = bounded_bfs(
+            graph=self.graph,
+            seeds={self.nodes["a"]: 1.0},
+            config=TraversalConfig(max_depth=2, max_width=1, edge_types=frozenset({"similar"})),
+        )
+        self.assertEqual(self.ids(narrow), ["a", "b", "d"])
+
+        l1_only = bounded_bfs(
+            graph=self.graph,
+            seeds=[self.nodes["a"]],
+            config=TraversalConfig(max_depth=3, layers=frozenset({"L1"})),
+        )
+        self.assertNotIn("p", self.ids(l1_only))
+        self.assertNotIn("q", self.ids(l1_only))
+
+    def test_time_budget(self) -> None:
+        result = bounded_bfs(
+            graph=self.graph,
+            seeds=[self.nodes["a"]],
+            config=TraversalConfig(max_depth=3, time_budget_s=0.0),
+        )
+        self.assertTrue(result.timed_out)
+        self.assertEqual(self.ids(result), ["a"])
+
+
+if __name__ == "__main__":
+    unittest.main()
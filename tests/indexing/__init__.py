@@ -0,0 +1 @@
+"""Indexing tests."""
@@ -0,0 +1,372 @@
+import importlib.util
+import tempfile
+import unittest
+
+from memory_base.indexing.vector_store import VectorRecord
+
+
+HAS_FAISS = importlib.util.find_spec("faiss") is not None and importlib.util.find_spec("numpy") is not None
+
+
+def _records(n: int, dim: int = 8, seed: int = 0, prefix: str = "e"):
+    import numpy as np
+
+    rng = np.random.default_rng(seed)
+    vecs = rng.standard_normal((n, dim)).astype("float32")
+    vecs /= np.linalg.norm(vecs, axis=1, keepdims=True)
+    return [
+        VectorRecord(id=f"{prefix}{i}", vector=vecs[i].tolist(), metadata={"label": ["success", "failure"][i % 2], "i": i})
+        for i in range(n)
+    ]
+
+
+@unittest.skipUnless(HAS_FAISS, "faiss/numpy not installed")
+class TestFaissVectorStore(unittest.TestCase):
+    def test_search(self) -> None:
+        from memory_base.indexing.faiss_store import FaissVectorStore
+
+        store = FaissVectorStore(dim=8)
+        records = _records(20)
+        store.upsert(records)
+        hits = store.search(query_vector=records[3].vector, top_k=3)
+        self.assertEqual(hits[0].id, "e3")
+        self.assertEqual(hits[0].metadata["i"], 3)
+        self.assertAlmostEqual(hits[0].score, 1.0, places=5)
+
+    def test_save_and_load(self) -> None:
+        from memory_base.indexing.faiss_store import FaissVectorStore
+
+        store = FaissVectorStore(dim=8)
+        records = _records(20)
+        store.upsert(records)
+        expected = store.search(query_vector=records[5].vector, top_k=4)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            store.save(tmp)
+            for mmap in (False, True):
+                loaded = FaissVectorStore.load(tmp, mmap=mmap)
+                self.assertEqual(loaded.search(query_vector=records[5].vector, top_k=4), expected)
+                if mmap:
+                    self.assertNotIsInstance(loaded._meta, list)  # parsed per hit, not at load
+                    self.assertEqual(loaded._meta[-1], records[-1].metadata)
+                    self.assertEqual(
+                        loaded.search(query_vector=records[5].vector, top_k=4, filter={"label": "failure"}),
+                        store.search(query_vector=records[5].vector, top_k=4, filter={"label": "failure"}),
+                    )
+                    with self.assertRaises(RuntimeError):
+                        loaded.upsert(_records(1, prefix="x"))
+                else:
+                    loaded.upsert(_records(1, prefix="x"))
+                    self.assertEqual(len(loaded._ids), 21)
+                del loaded
+
+    def test_upsert_replaces_and_delete(self) -> None:
+        from memory_base.indexing.faiss_store import FaissVectorStore
+
+        store = FaissVectorStore(dim=8, compact_ratio=None)
+        records = _records(10)
+        store.upsert(records)
+        # Re-ingest e0 with e1's vector: must replace, not duplicate.
+        store.upsert([VectorRecord(id="e0", vector=records[1].vector, metadata={"v": 2})])
+        self.assertEqual(len(store), 10)
+        hits = store.search(query_vector=records[1].vector, top_k=3)
+        self.assertEqual(sorted(h.id for h in hits[:2]), ["e0", "e1"])
+        self.assertEqual([h.id for h in hits].count("e0"), 1)
+        self.assertEqual(next(h for h in hits if h.id == "e0").metadata, {"v": 2})
+
+        store.delete(["e1", "missing"])
+        self.assertEqual(len(store), 9)
+        self.assertNotIn("e1", [h.id for h in store.search(query_vector=records[1].vector, top_k=10)])
+        self.assertEqual(len(store.search(query_vector=records[1].vector, top_k=20)), 9)
+
+        ntotal = store._index.ntotal
+        store.compact()
+        self.assertEqual(store._index.ntotal, ntotal - 2)
+        self.assertEqual(len(store.search(query_vector=records[1].vector, top_k=20)), 9)
+
+    def test_auto_compaction_and_reload(self) -> None:
+        from memory_base.indexing.faiss_store import FaissVectorStore
+
+        store = FaissVectorStore(dim=8, compact_ratio=0.25)
+        records = _records(8)
+        store.upsert(records)
+        store.delete(["e0", "e1"])
+        self.assertEqual(store._index.ntotal, 8)  # 2 / 8 tombstones: not yet
+        store.delete(["e2"])
+        self.assertEqual(store._index.ntotal, 5)
+
+        store.delete(["e3"])
+        with tempfile.TemporaryDirectory() as tmp:
+            store.save(tmp)
+            loaded = FaissVectorStore.load(tmp)
+            self.assertEqual(len(loaded), 4)
+            self.assertEqual({h.id for h in loaded.search(query_vector=records[0].vector, top_k=8)}, {"e4", "e5", "e6", "e7"})
+            loaded.upsert([VectorRecord(id="e4", vector=records[0].vector)])
+            self.assertEqual(loaded.search(query_vector=records[0].vector, top_k=1)[0].id, "e4")
+            self.assertEqual(len(loaded), 4)
+
+    def test_approximate_index_types(self) -> None:
+        from memory_base.indexing.faiss_store import FaissVectorStore, recall_latency_report
+
+        records = _records(1000, dim=16, seed=3)
+        queries = [r.vector for r in _records(20, dim=16, seed=4)]
+        reference = FaissVectorStore(dim=16)
+        reference.upsert(records)
+
+        for store, settings in (
+            (FaissVectorStore(dim=16, index_type="ivf_flat", nlist=16), [{"nprobe": 1}, {"nprobe": 16}]),
+            (FaissVectorStore(dim=16, index_type="ivf_pq", nlist=16, pq_m=4, pq_nbits=4), [{"nprobe": 16}]),
+            (FaissVectorStore(dim=16, index_type="hnsw", hnsw_m=8), [{"ef_search": 16}, {"ef_search": 256}]),
+        ):
+            store.upsert(records)
+            report = recall_latency_report(
+                store=store, reference=reference, queries=queries, top_k=5, settings=settings
+            )
+            self.assertEqual([p.params for p in report], settings)
+            self.assertTrue(all(p.latency_ms_mean >= 0 for p in report))
+            self.assertGreaterEqual(report[-1].recall, report[0].recall)
+            if store.index_type != "ivf_pq":
+                self.assertGreater(report[-1].recall, 0.95, msg=store.index_type)
+            self.assertEqual(store.nprobe, 16)  # knobs restored
+
+            store.delete([f"e{i}" for i in range(300)])  # triggers compaction
+            self.assertFalse(store._tombstones)
+            hits = store.search(query_vector=records[0].vector, top_k=5)
+            self.assertTrue(all(int(h.id[1:]) >= 300 for h in hits))
+
+        with tempfile.TemporaryDirectory() as tmp:
+            store.save(tmp)
+            loaded = FaissVectorStore.load(tmp)
+            self.assertEqual((loaded.index_type, loaded.hnsw_m), ("hnsw", 8))
+            self.assertEqual(len(loaded), 700)
+
+        with self.assertRaises(ValueError):
+            FaissVectorStore(dim=16, index_type="ivf_flat", nlist=64).upsert(records[:10])
+
+    def test_compaction_renumbers_rows(self) -> None:
+        from memory_base.indexing.faiss_store import FaissVectorStore
+
+        records = _records(400, dim=16, seed=8)
+        for store in (
+            FaissVectorStore(dim=16, metric="l2", compact_ratio=None),
+            FaissVectorStore(dim=16, metric="l2", index_type="ivf_flat", nlist=4, nprobe=4, compact_ratio=None),
+            FaissVectorStore(dim=16, metric="l2", index_type="hnsw", hnsw_m=8, compact_ratio=None),
+        ):
+            store.upsert(records)
+            store.delete([f"e{i}" for i in range(0, 400, 3)])
+            self.assertIsNotNone(store.search(query_vector=records[1].vector, top_k=1))
+            sel = store._tombstone_sel
+            store.search(query_vector=records[1].vector, top_k=1)
+            self.assertIs(store._tombstone_sel, sel)  # cached until tombstones change
+
+            store.compact()
+            self.assertEqual((len(store._ids), len(store._meta), store._index.ntotal), (266, 266, 266))
+            for i in (1, 2, 200, 397, 398):
+                hit = store.search(query_vector=records[i].vector, top_k=1)[0]
+                self.assertEqual((hit.id, hit.metadata["i"]), (f"e{i}", i), msg=store.index_type)
+            hits = store.search(query_vector=records[4].vector, top_k=3, filter={"label": "failure"})
+            self.assertTrue(all(h.metadata["label"] == "failure" for h in hits))
+
+            store.upsert([VectorRecord(id="e1", vector=records[0].vector)])
+            self.assertEqual(store.search(query_vector=records[0].vector, top_k=1)[0].id, "e1")
+
+    def test_filtered_search(self) -> None:
+        from memory_base.indexing.faiss_store import FaissVectorStore
+
+        records = _records(400, dim=16, seed=5)
+        query = records[7].vector
+        for store in (
+            FaissVectorStore(dim=16),
+            FaissVectorStore(dim=16, exact_filter_max=0),  # selector path
+            FaissVectorStore(dim=16, index_type="ivf_flat", nlist=8, nprobe=8),
+            FaissVectorStore(dim=16, metric="l2", index_type="hnsw", hnsw_m=8),
+        ):
+            store.upsert(records)
+            hits = store.search(query_vector=query, top_k=5, filter={"label": "failure"})
+            self.assertEqual(hits[0].id, "e7")
+            self.assertEqual(len(hits), 5)
+            self.assertTrue(all(h.metadata["label"] == "failure" for h in hits))
+
+            hits = store.search(query_vector=query, top_k=10, filter={"i": {"gte": 100, "lt": 104}})
+            self.assertEqual(sorted(h.id for h in hits), ["e100", "e101", "e102", "e103"])
+            self.assertEqual(store.search(query_vector=query, top_k=3, filter={"label": "other"}), [])
+
+            # the index follows upserts and deletes
+            store.delete(["e7"])
+            store.upsert([VectorRecord(id="new", vector=query, metadata={"label": "other"})])
+            hits = store.search(query_vector=query, top_k=3, filter={"label": ["other", "failure"]})
+            self.assertEqual(hits[0].id, "new")
+            self.assertNotIn("e7", [h.id for h in hits])
+
+
+@unittest.skipUnless(HAS_FAISS, "faiss/numpy not installed")
+class TestMetadataIndex(unittest.TestCase):
+    def test_resolve(self) -> None:
+        from memory_base.indexing.metadata_index import MetadataIndex
+
+        index = MetadataIndex()
+        index.add(0, {"label": "success", "artifacts": ["a.lean", "b.lean"], "t": 1.0})
+        index.add(1, {"label": "failure", "artifacts": ["b.lean"], "t": 2.0})
+        index.add(2, {"label": "failure", "t": 3.0, "extra": {"nested": 1}})
+        self.assertEqual(index.resolve({"label": "failure"}).tolist(), [1, 2])
+        self.assertEqual(index.resolve({"artifacts": "b.lean"}).tolist(), [0, 1])
+        self.assertEqual(index.resolve({"label": "failure", "artifacts": "b.lean"}).tolist(), [1])
+        self.assertEqual(index.resolve({"label": ["success", "failure"], "t": {"gt": 1.0, "lte": 3.0}}).tolist(), [1, 2])
+        index.remove(1, {"label": "failure", "artifacts": ["b.lean"], "t": 2.0})
+        self.assertEqual(index.resolve({"label": "failure"}).tolist(), [2])
+        self.assertEqual(index.resolve({"t": {"gte": 2.0}}).tolist(), [2])
+        self.assertEqual(index.resolve({"label": "missing"}).tolist(), [])
+        with self.assertRaises(ValueError):
+            index.resolve({"t": {"between": 1}})
+        with self.assertRaises(ValueError):
+            MetadataIndex(fields=("label",)).resolve({"t": 1})
+
+    def test_matches_brute_force(self) -> None:
+        import numpy as np
+
+        from memory_base.indexing.metadata_index import MetadataIndex
+
+        rng = np.random.default_rng(0)
+        n = 5000
+        labels = rng.integers(0, 5, n).tolist()
+        ts = rng.uniform(0, 100, n).tolist()
+        index = MetadataIndex()
+        for row in rng.permutation(n).tolist():  # out-of-order adds
+            index.add(row, {"label": labels[row], "t": ts[row]})
+        removed = set(rng.choice(n, 3000, replace=False).tolist())  # enough to trigger a purge
+        for row in removed:
+            index.remove(row, None)
+        for lo, hi in ((10.0, 20.0), (0.0, 100.0), (55.5, 55.6)):
+            for label in (1, [0, 3]):
+                want = [
+                    r
+                    for r in range(n)
+                    if r not in removed
+                    and lo <= ts[r] < hi
+                    and (labels[r] in label if isinstance(label, list) else labels[r] == label)
+                ]
+                got = index.resolve({"t": {"gte": lo, "lt": hi}, "label": label})
+                self.assertEqual(got.tolist(), want)
+
+    def test_rows_to_bitmap(self) -> None:
+        import numpy as np
+
+        from memory_base.indexing.metadata_index import rows_to_bitmap
+
+        bitmap = rows_to_bitmap(np.array([0, 2, 70]), 72)
+        self.assertEqual(len(bitmap), 9)
+        self.assertEqual(np.flatnonzero(np.unpackbits(bitmap, bitorder="little")).tolist(), [0, 2, 70])
+
+
+@unittest.skipUnless(HAS_FAISS, "faiss/numpy not installed")
+class TestSearchBatch(unittest.TestCase):
+    def test_matches_single_search(self) -> None:
+        import numpy as np
+
+        from memory_base.indexing.faiss_store import FaissVectorStore
+        from memory_base.indexing.vector_store import VectorStore
+
+        records = _records(200, dim=16, seed=6)
+        queries = np.asarray([r.vector for r in _records(6, dim=16, seed=7)], dtype="float32")
+        filters = [None, {"label": "failure"}, None, {"i": {"lt": 3}}, {"label": "failure"}, {"label": "none"}]
+        for store in (FaissVectorStore(dim=16), FaissVectorStore(dim=16, metric="l2", exact_filter_max=0)):
+            store.upsert(records)
+            for f in (None, {"label": "success"}, filters):
+                batch = store.search_batch(query_matrix=queries, top_k=5, filters=f)
+                self.assertEqual(batch.scores.shape, (6, 5))
+                # the generic fallback loops over search(); both must agree
+                fallback = VectorStore.search_batch(store, query_matrix=queries, top_k=5, filters=f)
+                per_query = f if isinstance(f, list) else [f] * 6
+                for q, hits, flt in zip(queries, batch.to_results(), per_query):
+                    single = store.search(query_vector=q, top_k=5, filter=flt)
+                    self.assertEqual([h.id for h in hits], [h.id for h in single])
+                    np.testing.assert_allclose([h.score for h in hits], [h.score for h in single], rtol=1e-5, atol=1e-5)
+                self.assertEqual(batch.ids.tolist(), fallback.ids.tolist())
+
+            batch = store.search_batch(query_matrix=queries, top_k=5, filters=filters)
+            self.assertEqual(batch.ids[3].tolist()[3:], [None, None])
+            self.assertTrue(np.isnan(batch.scores[5]).all())
+            self.assertEqual(batch.to_results()[5], [])
+            with self.assertRaises(ValueError):
+                store.search_batch(query_matrix=queries, top_k=5, filters=filters[:2])
+
+
+@unittest.skipUnless(HAS_FAISS, "faiss/numpy not installed")
+class TestUpsertArrays(unittest.TestCase):
+    def test_bulk_load_from_memmap(self) -> None:
+        import os
+
+        import numpy as np
+
+        from memory_base.indexing.faiss_store import FaissVectorStore
+
+        records = _records(50, dim=8, seed=8)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "vecs.npy")
+            np.save(path, np.asarray([r.vector for r in records], dtype="float32"))
+            vecs = np.load(path, mmap_mode="r")
+            ids = np.asarray([r.id for r in records])
+
+            store = FaissVectorStore(dim=8)
+            store.upsert_arrays(
+                ids,
+                vecs,
+                {"label": np.asarray([r.metadata["label"] for r in records]), "i": np.arange(50)},
+            )
+            reference = FaissVectorStore(dim=8)
+            reference.upsert(records)
+            del vecs
+
+        self.assertEqual(len(store), 50)
+        for q in (records[0].vector, records[13].vector):
+            got = store.search(query_vector=q, top_k=4, filter={"label": "failure"})
+            want = reference.search(query_vector=q, top_k=4, filter={"label": "failure"})
+            self.assertEqual([(h.id, h.metadata) for h in got], [(h.id, h.metadata) for h in want])
+            self.assertIsInstance(got[0].metadata["i"], int)
+
+        # re-upserting ids replaces them; metadata is optional
+        store.upsert_arrays(["e0", "e0"], np.zeros((2, 8), dtype="float32"))
+        self.assertEqual(len(store), 50)
+        self.assertNotEqual(store.search(query_vector=records[0].vector, top_k=1)[0].id, "e0")
+        with self.assertRaises(ValueError):
+            store.upsert_arrays(["x"], np.zeros((2, 8), dtype="float32"))
+
+
+@unittest.skipUnless(HAS_FAISS, "faiss/numpy not installed")
+class TestRangeSearch(unittest.TestCase):
+    def test_matches_generic_range_search(self) -> None:
+        import numpy as np
+
+        from memory_base.indexing.faiss_store import FaissVectorStore
+        from memory_base.indexing.vector_store import VectorStore
+
+        records = _records(300, dim=16, seed=9)
+        queries = np.asarray([r.vector for r in records[:4]], dtype="float32")
+        for store, radius in (
+            (FaissVectorStore(dim=16), 0.35),
+            (FaissVectorStore(dim=16, metric="l2"), 1.3),
+            (FaissVectorStore(dim=16, index_type="ivf_flat", nlist=4, nprobe=4), 0.35),
+        ):
+            store.upsert(records)
+            store.delete(["e2"])
+            native = store.range_search_batch(query_matrix=queries, radius=radius)
+            fallback = VectorStore.range_search_batch(store, query_matrix=queries, radius=radius)
+            self.assertEqual(native.ids.tolist(), fallback.ids.tolist())
+            np.testing.assert_allclose(native.scores, fallback.scores, rtol=1e-5)
+            self.assertNotIn("e2", native.ids.tolist())
+            filtered = store.range_search_batch(query_matrix=queries, radius=radius, filter={"label": "success"})
+            self.assertTrue(all(m["label"] == "success" for m in filtered.metadata.tolist()))
+
+        # a radius that matches a score exactly is inclusive
+        store = FaissVectorStore(dim=16)
+        store.upsert(records[:3])
+        exact = store.search(query_vector=queries[0], top_k=1)[0].score
+        self.assertEqual(store.range_search_batch(query_matrix=queries[:1], radius=exact).ids.tolist(), ["e0"])
+
+        np.testing.assert_allclose(store.get_vectors(["e1"]), queries[1:2])
+        with self.assertRaises(NotImplementedError):
+            FaissVectorStore(dim=16, index_type="ivf_flat", nlist=4).get_vectors([])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,99 @@
+import importlib.util
+import math
+import unittest
+
+
+HAS_NUMPY = importlib.util.find_spec("numpy") is not None
+
+
+@unittest.skipUnless(HAS_NUMPY, "numpy not installed")
+class TestBM25Index(unittest.TestCase):
+    def _index(self):
+        from memory_base.indexing.keyword_index import BM25Index
+
+        index = BM25Index(compact_ratio=None)
+        index.add("e1", {"situation": "goal uses Nat.add_comm", "attempt": "rw [Nat.add_comm]"}, {"label": "success"})
+        index.add("e2", {"situation": "error: unknown identifier foo_bar", "reflection": "import Mathlib.Data"})
+        index.add("e3", {"situation": "simp fails", "attempt": "simp [Nat.mul_comm]"}, {"label": "failure"})
+        return index
+
+    def test_bm25_scores(self) -> None:
+        index = self._index()
+        hits = index.search(query="add_comm", top_k=5)
+        self.assertEqual([h.id for h in hits], ["e1"])
+        self.assertEqual(hits[0].metadata, {"label": "success"})
+
+        # hand-computed BM25 for the single-document term "foo_bar"
+        n, df, tf, dl = 3, 1, 1, 7
+        avgdl = (7 + 7 + 5) / 3
+        idf = math.log(1 + (n - df + 0.5) / (df + 0.5))
+        want = idf * tf * 2.2 / (tf + 1.2 * (0.25 + 0.75 * dl / avgdl))
+        self.assertAlmostEqual(index.search(query="foo_bar", top_k=1)[0].score, want)
+
+        hits = index.search(query="nat comm", top_k=5)
+        self.assertEqual(sorted(h.id for h in hits), ["e1", "e3"])
+        self.assertEqual(index.search(query="nat", top_k=5, filter={"label": "failure"})[0].id, "e3")
+        self.assertEqual(index.search(query="nat", top_k=5, filter={"label": "unknown"}), [])
+        self.assertEqual(index.search(query="no such words", top_k=5), [])
+
+    def test_delete_readd_and_compact(self) -> None:
+        index = self._index()
+        index.delete(["e1"])
+        self.assertEqual(len(index), 2)
+        self.assertEqual(index.search(query="add_comm", top_k=5), [])
+        index.add("e3", {"situation": "add_comm again"})
+        self.assertEqual([h.id for h in index.search(query="add_comm", top_k=5)], ["e3"])
+        self.assertEqual(index.search(query="simp", top_k=5), [])
+
+        before = [(h.id, h.score) for h in index.search(query="add_comm nat import", top_k=5)]
+        size = index.nbytes
+        index.compact()
+        self.assertLess(index.nbytes, size)
+        self.assertEqual(index._ids, ["e2", "e3"])  # live documents renumbered
+        self.assertEqual([(h.id, h.score) for h in index.search(query="add_comm nat import", top_k=5)], before)
+        index.add("e4", {"goal": "add_comm"}, {"label": "failure"})
+        self.assertEqual([h.id for h in index.search(query="add_comm", top_k=5)], ["e4", "e3"])
+        self.assertEqual([h.id for h in index.search(query="add_comm", top_k=5, filter={"label": "failure"})], ["e4"])
+
+    def test_large_doc_numbers(self) -> None:
+        from memory_base.indexing.keyword_index import BM25Index
+
+        index = BM25Index()
+        for i in range(300):
+            index.add(f"d{i}", {"situation": f"common term t{i % 7} " + "x " * (i % 150)})
+        hits = index.search(query="common t3", top_k=3)
+        self.assertEqual(len(hits), 3)
+        self.assertTrue(all(int(h.id[1:]) % 7 == 3 for h in hits))
+        self.assertEqual(hits[0].id, "d150")  # shortest doc containing t3 (no padding)
+
+    def test_hybrid_search(self) -> None:
+        from memory_base.indexing.fusion import FusionConfig
+        from memory_base.indexing.keyword_index import hybrid_search
+        from memory_base.indexing.numpy_store import NumpyVectorStore
+        from memory_base.indexing.vector_store import VectorRecord
+
+        index = self._index()
+        store = NumpyVectorStore(dim=2)
+        store.upsert(
+            [
+                VectorRecord(id="e1", vector=[0.0, 1.0], metadata={"label": "success"}),
+                VectorRecord(id="e2", vector=[1.0, 0.0]),
+                VectorRecord(id="e3", vector=[0.8, 0.6], metadata={"label": "failure"}),
+            ]
+        )
+        hits = hybrid_search(
+            keyword_index=index, vector_store=store, query_text="Nat.add_comm", query_vector=[1.0, 0.0], top_k=3
+        )
+        self.assertEqual(hits[0].id, "e1")  # rank 1 in both lists: keyword "add_comm" is exact
+        self.assertEqual(set(hits[0].views), {"keyword", "vector"})
+
+        hits = hybrid_search(
+            keyword_index=index,
+            vector_store=store,
+            query_text="nat",
+            query_vector=[1.0, 0.0],
+            top_k=3,
+            filter={"label": "failure"},
+            fusion=FusionConfig(method="weighted"),
+        )
+        self.assertEqual([h.id for h in hits], ["e3"])
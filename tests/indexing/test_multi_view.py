@@ -0,0 +1,126 @@
+import threading
+import time
+import unittest
+
+from memory_base.indexing.fusion import FusionConfig, fuse_results
+from memory_base.indexing.multi_view import MultiViewIndex, MultiViewRecord
+from memory_base.indexing.vector_store import VectorSearchResult, VectorStore
+
+
+class ListStore(VectorStore):
+    """
+    Brute-force inner-product store for tests; optional artificial latency.
+    """
+
+    def __init__(self, delay_s: float = 0.0) -> None:
+        self.records = {}
+        self.delay_s = delay_s
+
+    def upsert(self, records) -> None:
+        for r in records:
+            self.records[r.id] = r
+
+    def delete(self, ids) -> None:
+        for i in ids:
+            self.records.pop(i, None)
+
+    def search(self, *, query_vector, top_k, filter=None):
+        time.sleep(self.delay_s)
+        hits = [
+            VectorSearchResult(id=r.id, score=sum(a * b for a, b in zip(query_vector, r.vector)), metadata=r.metadata)
+            for r in self.records.values()
+            if not filter or all((r.metadata or {}).get(k) == v for k, v in filter.items())
+        ]
+        hits.sort(key=lambda h: -h.score)
+        return hits[:top_k]
+
+
+def _hits(*pairs):
+    return [VectorSearchResult(id=i, score=s) for i, s in pairs]
+
+
+class TestFusion(unittest.TestCase):
+    def test_rrf_and_weighted(self) -> None:
+        results = {
+            "situation": _hits(("a", 0.9), ("b", 0.8), ("c", 0.1)),
+            "reflection": _hits(("b", 0.7), ("d", 0.6)),
+        }
+        fused = fuse_results(results)
+        self.assertEqual([h.id for h in fused], ["b", "a", "d", "c"])
+        self.assertAlmostEqual(fused[0].score, 1 / 62 + 1 / 61)
+        self.assertEqual(fused[0].views, {"situation": 0.8, "reflection": 0.7})
+
+        weighted = fuse_results(results, config=FusionConfig(method="weighted", weights={"reflection": 0.5}), top_k=2)
+        self.assertEqual([h.id for h in weighted], ["b", "a"])
+        self.assertAlmostEqual(weighted[0].score, 0.8 + 0.35)
+
+        with self.assertRaises(ValueError):
+            fuse_results(results, config=FusionConfig(method="max"))  # type: ignore[arg-type]
+
+
+class TestMultiViewIndex(unittest.TestCase):
+    def _index(self, slow_delay: float = 0.0, **kwargs) -> MultiViewIndex:
+        index = MultiViewIndex(
+            stores={"situation": ListStore(), "attempt": ListStore(), "reflection": ListStore(slow_delay)}, **kwargs
+        )
+        index.upsert_events(
+            [
+                MultiViewRecord(id="e1", vectors={"situation": [1, 0], "attempt": [0, 1]}, metadata={"label": "success"}),
+                MultiViewRecord(id="e2", vectors={"situation": [0, 1], "attempt": [1, 0], "reflection": [1, 0]}),
+            ]
+        )
+        index.upsert_event("e3", {"situation": [0.5, 0.5], "reflection": [0.9, 0.1]}, {"label": "failure"})
+        self.addCleanup(index.close)
+        return index
+
+    def test_upsert_and_search(self) -> None:
+        index = self._index()
+        self.assertEqual(set(index.stores["reflection"].records), {"e2", "e3"})
+
+        result = index.search(query_vector=[1, 0], top_k=2)
+        self.assertEqual(list(result.per_view), ["situation", "attempt", "reflection"])
+        self.assertEqual(result.timed_out, ())
+        self.assertEqual([h.id for h in result.hits], ["e2", "e1"])
+
+        result = index.search(query_vector={"situation": [1, 0]}, top_k=3, views=["situation", "attempt"])
+        self.assertEqual(list(result.per_view), ["situation"])
+        self.assertEqual([h.id for h in result.hits], ["e1", "e3", "e2"])
+
+        result = index.search(query_vector=[1, 0], top_k=3, filter={"label": "failure"})
+        self.assertEqual([h.id for h in result.hits], ["e3"])
+        self.assertEqual(result.hits[0].metadata, {"label": "failure"})
+
+        index.delete(["e2"])
+        self.assertNotIn("e2", [h.id for h in index.search(query_vector=[1, 0], top_k=3).hits])
+        with self.assertRaises(KeyError):
+            index.search(query_vector=[1, 0], top_k=1, views=["goal"])
+        with self.assertRaises(KeyError):
+            index.upsert_event("e4", {"goal": [1, 0]})
+
+        index.upsert_event("e3", {"situation": [0.5, 0.5]})  # reflection view dropped
+        self.assertEqual(set(index.stores["reflection"].records), set())
+        self.assertEqual(index.search(query_vector=[1, 0], top_k=3, views=["reflection"]).hits, [])
+
+    def test_time_budget(self) -> None:
+        index = self._index(slow_delay=0.5)
+        result = index.search(query_vector=[1, 0], top_k=3, time_budget_s=0.2)
+        self.assertEqual(result.timed_out, ("reflection",))
+        self.assertEqual(list(result.per_view), ["situation", "attempt"])
+        self.assertEqual({h.id for h in result.hits}, {"e1", "e2", "e3"})
+
+    def test_time_budget_does_not_starve_later_queries(self) -> None:
+        index = self._index(slow_delay=0.5)
+        start = time.perf_counter()
+        for _ in range(4):  # more timed-out searches than the pool has workers
+            result = index.search(query_vector=[1, 0], top_k=3, time_budget_s=0.1)
+            self.assertEqual(result.timed_out, ("reflection",))
+            self.assertEqual(list(result.per_view), ["situation", "attempt"])
+        self.assertLess(time.perf_counter() - start, 1.0)
+
+    def test_retired_pools_are_capped(self) -> None:
+        index = self._index(slow_delay=1.0, max_retired_pools=1)
+        for _ in range(8):  # every search leaves a straggler behind
+            index.search(query_vector=[1, 0], top_k=3, time_budget_s=0.05)
+        workers = [t for t in threading.enumerate() if t.name.startswith("multi-view")]
+        self.assertLessEqual(len(workers), 2 * len(index.stores))  # one retired pool + the live one
+
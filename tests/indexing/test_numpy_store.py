@@ -0,0 +1,161 @@
+import importlib.util
+import tempfile
+import unittest
+
+from memory_base.indexing.vector_store import VectorRecord
+
+
+HAS_NUMPY = importlib.util.find_spec("numpy") is not None
+
+
+def _data(n: int, dim: int = 16, seed: int = 0):
+    import numpy as np
+
+    rng = np.random.default_rng(seed)
+    vecs = rng.standard_normal((n, dim)).astype("float32")
+    vecs /= np.linalg.norm(vecs, axis=1, keepdims=True)
+    ids = np.asarray([f"e{i}" for i in range(n)])
+    return ids, vecs
+
+
+def _exact(vecs, queries, top_k: int, metric: str):
+    import numpy as np
+
+    if metric == "ip":
+        keys = -(queries @ vecs.T)
+    else:
+        keys = ((queries[:, None, :] - vecs[None, :, :]) ** 2).sum(axis=2)
+    return np.argsort(keys, axis=1, kind="stable")[:, :top_k]
+
+
+@unittest.skipUnless(HAS_NUMPY, "numpy not installed")
+class TestNumpyVectorStore(unittest.TestCase):
+    def test_matches_exact_search(self) -> None:
+        import numpy as np
+
+        from memory_base.indexing.numpy_store import NumpyVectorStore
+
+        ids, vecs = _data(500)
+        queries = vecs[:10] + 0.01
+        for dtype in ("float32", "float16", "int8"):
+            for metric in ("ip", "l2"):
+                store = NumpyVectorStore(dim=16, metric=metric, dtype=dtype, block_size=128, keep_full=True, rescore=4)
+                store.upsert_arrays(ids, vecs, {"label": ["a", "b"] * 250})
+                batch = store.search_batch(query_matrix=queries, top_k=5)
+                want = _exact(vecs, queries, 5, metric)
+                self.assertEqual(batch.ids.tolist(), ids[want].tolist(), msg=(dtype, metric))
+                hits = store.search(query_vector=queries[0], top_k=5)
+                self.assertEqual([h.id for h in hits], ids[want[0]].tolist())
+                if metric == "ip":
+                    self.assertAlmostEqual(hits[0].score, float(vecs[want[0, 0]] @ queries[0]), places=4)
+                else:
+                    self.assertAlmostEqual(hits[0].score, float(((vecs[want[0, 0]] - queries[0]) ** 2).sum()), places=4)
+
+        # last store is int8 + float32 copy: 1 + 4 bytes per component, scale, squared norm and alive flag per row
+        self.assertEqual(store.nbytes, 500 * 16 * 5 + 500 * (4 + 4 + 1))
+        lean = NumpyVectorStore(dim=16, dtype="int8")
+        lean.upsert_arrays(ids, vecs)
+        self.assertIsNone(lean._full)  # no float32 copy unless keep_full
+        self.assertEqual(lean.nbytes, 500 * 16 + 500 * (4 + 4 + 1))
+        self.assertEqual(lean.search_batch(query_matrix=queries, top_k=1).ids[:, 0].tolist(), ids[:10].tolist())
+        with self.assertRaises(ValueError):
+            NumpyVectorStore(dim=16, dtype="int8", rescore=4)  # nothing to rescore against
+
+    def test_filter_upsert_delete(self) -> None:
+        import numpy as np
+
+        from memory_base.indexing.numpy_store import NumpyVectorStore
+
+        ids, vecs = _data(100)
+        store = NumpyVectorStore(dim=16, dtype="int8", compact_ratio=None)
+        store.upsert(
+            VectorRecord(id=str(i), vector=v.tolist(), metadata={"label": ["a", "b"][k % 2], "k": k})
+            for k, (i, v) in enumerate(zip(ids, vecs))
+        )
+        hits = store.search(query_vector=vecs[3], top_k=3, filter={"label": "b"})
+        self.assertEqual(hits[0].id, "e3")
+        self.assertTrue(all(h.metadata["label"] == "b" for h in hits))
+
+        store.delete(["e3"])
+        store.upsert([VectorRecord(id="e5", vector=vecs[3].tolist(), metadata={"label": "b", "k": 5})])
+        self.assertEqual(len(store), 99)
+        hits = store.search(query_vector=vecs[3], top_k=3, filter={"k": {"gte": 3, "lte": 5}})
+        self.assertEqual([h.id for h in hits], ["e5", "e4"])
+        self.assertEqual(store.search(query_vector=vecs[3], top_k=1)[0].id, "e5")
+
+        store.compact()
+        self.assertEqual(len(store), 99)
+        self.assertEqual(store.search(query_vector=vecs[3], top_k=1, filter={"label": "b"})[0].id, "e5")
+        self.assertEqual(store.search(query_vector=vecs[3], top_k=3, filter={"label": "c"}), [])
+
+        batch = store.search_batch(query_matrix=vecs[:2], top_k=200)
+        self.assertEqual(sum(i is not None for i in batch.ids[0]), 99)
+        self.assertTrue(np.isnan(batch.scores[0, 99:]).all())
+
+    def test_save_and_load_mmap(self) -> None:
+        import numpy as np
+
+        from memory_base.indexing.numpy_store import NumpyVectorStore
+
+        ids, vecs = _data(300)
+        store = NumpyVectorStore(dim=16, dtype="float16", compact_ratio=None)
+        store.upsert_arrays(ids, vecs, {"i": np.arange(300)})
+        store.delete(["e0"])
+        with tempfile.TemporaryDirectory() as tmp:
+            store.save(tmp)
+            for mmap in (False, True):
+                loaded = NumpyVectorStore.load(tmp, mmap=mmap)
+                self.assertEqual(len(loaded), 299)
+                self.assertEqual(loaded.dtype, "float16")
+                got = loaded.search(query_vector=vecs[0], top_k=4, filter={"i": {"lt": 10}})
+                want = store.search(query_vector=vecs[0], top_k=4, filter={"i": {"lt": 10}})
+                self.assertEqual([(h.id, h.metadata) for h in got], [(h.id, h.metadata) for h in want])
+                self.assertNotIn("e0", [h.id for h in got])
+            with self.assertRaises(RuntimeError):
+                loaded.delete(["e1"])
+            del loaded
+
+        rescored = NumpyVectorStore(dim=16, dtype="int8", keep_full=True, rescore=4)
+        rescored.upsert_arrays(ids, vecs)
+        with tempfile.TemporaryDirectory() as tmp:
+            rescored.save(tmp)
+            loaded = NumpyVectorStore.load(tmp, mmap=True)
+            self.assertIsInstance(loaded._full, np.memmap)  # originals stay on disk
+            self.assertEqual(loaded.nbytes, rescored.nbytes)
+            got = loaded.search(query_vector=vecs[7], top_k=3)
+            self.assertEqual([h.id for h in got], [h.id for h in rescored.search(query_vector=vecs[7], top_k=3)])
+            del loaded
+
+    def test_range_search_and_get_vectors(self) -> None:
+        import numpy as np
+
+        from memory_base.indexing.numpy_store import NumpyVectorStore
+        from memory_base.indexing.vector_store import VectorStore
+
+        ids, vecs = _data(200)
+        for metric, radius in (("ip", 0.4), ("l2", 1.2)):
+            store = NumpyVectorStore(dim=16, metric=metric, dtype="int8", block_size=64, keep_full=True, rescore=4)
+            store.upsert_arrays(ids, vecs, {"i": np.arange(200)})
+            store.delete(["e1"])
+            native = store.range_search_batch(query_matrix=vecs[:5], radius=radius)
+            fallback = VectorStore.range_search_batch(store, query_matrix=vecs[:5], radius=radius)
+            self.assertEqual(len(native), 5)
+            self.assertEqual(native.lims.tolist(), fallback.lims.tolist())
+            self.assertEqual(native.ids.tolist(), fallback.ids.tolist())
+            self.assertNotIn("e1", native.ids.tolist())
+            self.assertEqual(native.to_results()[0][0].id, "e0")
+            scores = vecs[:5] @ vecs.T if metric == "ip" else ((vecs[:5, None] - vecs[None]) ** 2).sum(axis=2)
+            within = scores >= radius if metric == "ip" else scores <= radius
+            within[:, 1] = False
+            self.assertEqual(np.diff(native.lims).tolist(), within.sum(axis=1).tolist())
+
+            filtered = store.range_search_batch(query_matrix=vecs[:2], radius=radius, filter={"i": {"lt": 50}})
+            self.assertTrue(all(int(i[1:]) < 50 for i in filtered.ids.tolist()))
+
+        np.testing.assert_allclose(store.get_vectors(["e3", "e0"]), vecs[[3, 0]])
+        with self.assertRaises(KeyError):
+            store.get_vectors(["e1"])
+
+
+if __name__ == "__main__":
+    unittest.main()
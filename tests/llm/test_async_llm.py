@@ -0,0 +1,134 @@
+import asyncio
+import json
+import threading
+import time
+import unittest
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Mapping, Sequence
+
+from memory_base.llm.base import LLM, LLMClient
+from memory_base.llm.providers import MockLLM, OllamaLLM
+from memory_base.llm.types import ChatMessage, LLMResponse
+
+
+@dataclass
+class _SlowLLM(LLM):
+    """Async-native fake that records the peak number of in-flight calls."""
+
+    delay_s: float = 0.02
+    active: int = field(default=0, init=False)
+    peak: int = field(default=0, init=False)
+
+    def _chat(self, *, messages: Sequence[ChatMessage], model: str, **_: Any) -> LLMResponse:
+        return LLMResponse(text=messages[-1].content)
+
+    async def _achat(self, *, messages: Sequence[ChatMessage], model: str, **_: Any) -> LLMResponse:
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        await asyncio.sleep(self.delay_s)
+        self.active -= 1
+        return LLMResponse(text=messages[-1].content)
+
+
+class _FakeOllama(BaseHTTPRequestHandler):
+    chunked = False
+
+    def do_POST(self) -> None:
+        payload = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        if payload["model"] == "missing":
+            self.send_error(404, "model not found")
+            return
+        if payload["model"] == "slow":
+            time.sleep(0.5)
+        body = json.dumps(
+            {"message": {"role": "assistant", "content": "echo:" + payload["messages"][-1]["content"]}}
+        ).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        if self.chunked:
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            half = len(body) // 2
+            for part in (body[:half], body[half:], b""):
+                self.wfile.write(b"%x\r\n%s\r\n" % (len(part), part))
+        else:
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    def log_message(self, *args: Any) -> None:
+        pass
+
+
+class TestAsyncLLM(unittest.TestCase):
+    def test_arespond_thread_shim(self) -> None:
+        resp = asyncio.run(MockLLM().arespond("hello", model="mock-model"))
+        self.assertIn("hello", resp.text)
+
+    def test_async_chat_session(self) -> None:
+        async def run() -> Sequence[ChatMessage]:
+            session = MockLLM().start_chat(model="mock-model", system="sys")
+            await session.asend("one")
+            await session.asend("two")
+            return session.history
+
+        history = asyncio.run(run())
+        self.assertEqual([m.role for m in history], ["system", "user", "assistant", "user", "assistant"])
+
+    def test_client_max_concurrency(self) -> None:
+        llm = _SlowLLM()
+        client = LLMClient(llm=llm, model="m", max_concurrency=2)
+
+        async def run() -> list[LLMResponse]:
+            return await asyncio.gather(*(client.arespond(str(i)) for i in range(6)))
+
+        resps = asyncio.run(run())
+        self.assertEqual([r.text for r in resps], [str(i) for i in range(6)])
+        self.assertEqual(llm.peak, 2)
+
+        # The limiter is per event loop, so the client can be reused from a new loop.
+        asyncio.run(run())
+        with self.assertRaises(ValueError):
+            LLMClient(llm=llm, model="m", max_concurrency=0)
+
+    def test_ollama_achat_local_server(self) -> None:
+        for chunked in (False, True):
+            handler = type("Handler", (_FakeOllama,), {"chunked": chunked})
+            server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+            threading.Thread(target=server.serve_forever, daemon=True).start()
+            try:
+                llm = OllamaLLM(base_url=f"http://127.0.0.1:{server.server_address[1]}")
+
+                async def run() -> list[LLMResponse]:
+                    return await asyncio.gather(*(llm.arespond(f"q{i}", model="m") for i in range(4)))
+
+                resps = asyncio.run(run())
+                self.assertEqual([r.text for r in resps], [f"echo:q{i}" for i in range(4)])
+            finally:
+                server.shutdown()
+                server.server_close()
+
+        with self.assertRaises(RuntimeError):
+            asyncio.run(OllamaLLM(base_url="http://127.0.0.1:9", timeout_s=2).arespond("x", model="m"))
+
+    def test_ollama_error_mapping(self) -> None:
+        server = ThreadingHTTPServer(("127.0.0.1", 0), _FakeOllama)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        try:
+            llm = OllamaLLM(base_url=f"http://127.0.0.1:{server.server_address[1]}", timeout_s=0.1)
+            for call in (
+                lambda model: llm.respond("x", model=model),
+                lambda model: asyncio.run(llm.arespond("x", model=model)),
+            ):
+                with self.assertRaisesRegex(RuntimeError, "HTTP 404"):
+                    call("missing")
+                with self.assertRaises(TimeoutError):
+                    call("slow")
+        finally:
+            server.shutdown()
+            server.server_close()
+
+
+if __name__ == "__main__":
+    unittest.main()
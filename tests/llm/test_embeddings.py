@@ -0,0 +1,77 @@
+import importlib.util
+import os
+import tempfile
+import unittest
+
+from memory_base.llm.embeddings import CachedEmbedder, Embedder
+from memory_base.llm.providers import MockEmbedder
+
+
+HAS_NUMPY = importlib.util.find_spec("numpy") is not None
+
+
+class CountingEmbedder(Embedder):
+    batch_size = 2
+
+    def __init__(self) -> None:
+        self.calls = []
+
+    def _embed(self, texts, *, model):
+        self.calls.append(list(texts))
+        return [[float(len(t)), float(len(model))] for t in texts]
+
+
+@unittest.skipUnless(HAS_NUMPY, "numpy not installed")
+class TestEmbedders(unittest.TestCase):
+    def test_mock_embedder(self) -> None:
+        import numpy as np
+
+        emb = MockEmbedder(dim=32)
+        vecs = emb.embed(["rw [Nat.add_comm]", "Nat.add_comm rw", "simp fails", ""], model="any")
+        self.assertEqual((vecs.shape, vecs.dtype), ((4, 32), np.float32))
+        np.testing.assert_allclose(vecs[0], vecs[1])  # same bag of tokens
+        self.assertAlmostEqual(float(np.linalg.norm(vecs[2])), 1.0, places=5)
+        self.assertFalse(vecs[3].any())
+        np.testing.assert_array_equal(vecs, emb.embed(["rw [Nat.add_comm]", "Nat.add_comm rw", "simp fails", ""], model="x"))
+
+    def test_batching(self) -> None:
+        inner = CountingEmbedder()
+        vecs = inner.embed(["a", "bb", "ccc"], model="m")
+        self.assertEqual(inner.calls, [["a", "bb"], ["ccc"]])
+        self.assertEqual(vecs.tolist(), [[1.0, 1.0], [2.0, 1.0], [3.0, 1.0]])
+
+    def test_cache_hits_and_eviction(self) -> None:
+        inner = CountingEmbedder()
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "emb.sqlite")
+            cache = CachedEmbedder(embedder=inner, path=path, max_entries=3)
+            first = cache.embed(["a", "bb", "a"], model="m")
+            self.assertEqual(first.tolist(), [[1.0, 1.0], [2.0, 1.0], [1.0, 1.0]])
+            self.assertEqual(inner.calls, [["a", "bb"]])  # duplicates embedded once
+            self.assertEqual((cache.hits, cache.misses), (0, 2))
+
+            again = cache.embed(["bb", "a"], model="m")
+            self.assertEqual(again.tolist(), [[2.0, 1.0], [1.0, 1.0]])
+            self.assertEqual(len(inner.calls), 1)
+            cache.embed(["a"], model="other")  # model is part of the key
+            self.assertEqual(inner.calls[-1], ["a"])
+            cache.close()
+
+            # persisted across instances; bounded by max_entries (LRU)
+            cache = CachedEmbedder(embedder=inner, path=path, max_entries=3)
+            self.assertEqual(len(cache), 3)
+            cache.embed(["bb"], model="m")
+            cache.embed(["dddd"], model="m")
+            self.assertEqual(len(cache), 3)
+            calls = len(inner.calls)
+            cache.embed(["bb", "dddd"], model="m")
+            self.assertEqual(len(inner.calls), calls)
+            cache.embed(["a"], model="m")  # least recently used: evicted
+            self.assertEqual(inner.calls[-1], ["a"])
+            cache.clear()
+            self.assertEqual(len(cache), 0)
+            cache.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
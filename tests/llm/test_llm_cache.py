@@ -0,0 +1,104 @@
+import asyncio
+import os
+import tempfile
+import time
+import unittest
+from typing import Any, Sequence
+
+from memory_base.adapters import TextToNEIAdapter
+from memory_base.llm.base import LLM, LLMClient
+from memory_base.llm.cache import CachedLLM
+from memory_base.llm.types import ChatMessage, LLMResponse, LLMUsage
+
+
+class _CountingLLM(LLM):
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def _chat(self, *, messages: Sequence[ChatMessage], model: str, **_: Any) -> LLMResponse:
+        self.calls += 1
+        return LLMResponse(
+            text=f"<nei><goal>{messages[-1].content}</goal></nei> extra",
+            usage=LLMUsage(output_tokens=self.calls),
+        )
+
+
+class TestCachedLLM(unittest.TestCase):
+    def test_deterministic_only_and_bypass(self) -> None:
+        inner = _CountingLLM()
+        llm = CachedLLM(llm=inner)
+        r1 = llm.respond("hi", model="m", temperature=0)
+        r2 = llm.respond("hi", model="m", temperature=0)
+        self.assertEqual(r1.text, r2.text)
+        self.assertEqual(r2.usage, LLMUsage(output_tokens=1))
+        self.assertEqual((inner.calls, llm.hits, llm.misses), (1, 1, 1))
+
+        llm.respond("hi", model="other", temperature=0)  # model is part of the key
+        llm.respond("hi", model="m", temperature=0.7)  # non-deterministic: not cached
+        llm.respond("hi", model="m", temperature=0, metadata={"cache": False})
+        self.assertEqual(inner.calls, 4)
+
+        loose = CachedLLM(llm=inner, allow_nondeterministic=True)
+        loose.respond("hi", model="m", temperature=0.7)
+        loose.respond("hi", model="m", temperature=0.7)
+        self.assertEqual(inner.calls, 5)
+
+    def test_sqlite_tier_ttl_and_eviction(self) -> None:
+        with tempfile.TemporaryDirectory() as d:
+            path = os.path.join(d, "llm.sqlite")
+            inner = _CountingLLM()
+            llm = CachedLLM(llm=inner, path=path, max_entries=2, memory_entries=1)
+            for q in ("a", "b", "c"):
+                llm.respond(q, model="m", temperature=0)
+            self.assertEqual(len(llm), 2)  # "a" evicted (least recently used)
+            llm.close()
+
+            reopened = CachedLLM(llm=inner, path=path, max_entries=2)
+            reopened.respond("c", model="m", temperature=0)
+            reopened.respond("a", model="m", temperature=0)
+            self.assertEqual(inner.calls, 4)
+            reopened.close()
+
+            expiring = CachedLLM(llm=inner, path=path, ttl_s=0.05)
+            expiring.respond("c", model="m", temperature=0)
+            time.sleep(0.1)
+            expiring.respond("c", model="m", temperature=0)
+            self.assertEqual(inner.calls, 5)
+            expiring.close()
+
+    def test_stream_with_stop_and_adapter(self) -> None:
+        inner = _CountingLLM()
+        llm = CachedLLM(llm=inner)
+        first = "".join(llm.stream("q", model="m", temperature=0, stop=["</nei>"]))
+        again = "".join(llm.stream("q", model="m", temperature=0, stop=["</nei>"]))
+        self.assertEqual(first, "<nei><goal>q</goal></nei>")
+        self.assertEqual(again, first)
+        self.assertEqual(inner.calls, 1)
+
+        adapter = TextToNEIAdapter(llm=LLMClient(llm=llm, model="m", temperature=0))
+        self.assertEqual(adapter.ingest("text").goal, "text")
+        self.assertEqual(adapter.ingest("text").goal, "text")
+        self.assertEqual(inner.calls, 2)
+
+    def test_async_paths_share_the_cache(self) -> None:
+        async def run(llm: CachedLLM) -> list[str]:
+            out = [(await llm.arespond("a", model="m", temperature=0)).text]
+            for _ in range(2):
+                out.append("".join([d async for d in llm.astream("q", model="m", temperature=0, stop=["</nei>"])]))
+            return out
+
+        with tempfile.TemporaryDirectory() as d:
+            inner = _CountingLLM()
+            llm = CachedLLM(llm=inner, path=os.path.join(d, "llm.sqlite"), memory_entries=0)
+            first = asyncio.run(run(llm))
+            self.assertEqual(first[1:], ["<nei><goal>q</goal></nei>"] * 2)
+            self.assertEqual(inner.calls, 2)  # second astream served from SQLite
+            self.assertEqual(asyncio.run(run(llm)), first)
+            self.assertEqual(inner.calls, 2)
+            self.assertEqual(llm.respond("a", model="m", temperature=0).text, first[0])
+            self.assertEqual(inner.calls, 2)
+            llm.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -2,7 +2,7 @@ import os
 import unittest
 
 from memory_base.llm.base import LLMClient
-from memory_base.llm.providers.ollama_provider import OllamaLLM, ollama_has_model
+from memory_base.llm.providers.ollama_provider import OllamaEmbedder, OllamaLLM, ollama_has_model
 
 
 class TestOllamaLLM(unittest.TestCase):
@@ -43,6 +43,23 @@ class TestOllamaLLM(unittest.TestCase):
         r2 = session.send("What about Germany?")
         self.assertIn("berlin", r2.text.lower())
 
+    def test_ollama_embed(self) -> None:
+        if os.environ.get("RUN_OLLAMA_TESTS") != "1":
+            self.skipTest("Set RUN_OLLAMA_TESTS=1 to run Ollama integration tests.")
+
+        base_url = os.environ.get("OLLAMA_BASE_URL", "http://localhost:11434")
+        model = os.environ.get("OLLAMA_EMBED_MODEL", "nomic-embed-text")
+
+        if not ollama_has_model(base_url=base_url, model=model) and not ollama_has_model(
+            base_url=base_url, model=model + ":latest"
+        ):
+            self.skipTest(f"Ollama not reachable or model not found: {model!r} at {base_url!r}")
+
+        embedder = OllamaEmbedder(base_url=base_url, timeout_s=60.0, batch_size=2)
+        vecs = embedder.embed(["Paris is in France.", "Berlin is in Germany.", "2 + 2 = 4"], model=model)
+        self.assertEqual(vecs.shape[0], 3)
+        self.assertGreater(vecs.shape[1], 0)
+
 
 if __name__ == "__main__":
     unittest.main()
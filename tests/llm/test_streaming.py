@@ -0,0 +1,136 @@
+import asyncio
+import contextlib
+import json
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Iterator, Sequence
+
+from memory_base.llm.base import LLM, LLMClient
+from memory_base.llm.providers import MockLLM, OllamaLLM
+from memory_base.llm.transport import HTTPConnectionPool
+from memory_base.llm.types import ChatMessage, LLMResponse
+
+
+class _ChunkLLM(LLM):
+    """Streams fixed deltas and records whether the stream was closed early."""
+
+    def __init__(self, deltas: Sequence[str]) -> None:
+        self.deltas = list(deltas)
+        self.pulled = 0
+        self.closed = False
+
+    def _chat(self, *, messages: Sequence[ChatMessage], model: str, **_: Any) -> LLMResponse:
+        return LLMResponse(text="".join(self.deltas))
+
+    def _stream(self, *, messages: Sequence[ChatMessage], model: str, **_: Any) -> Iterator[str]:
+        try:
+            for d in self.deltas:
+                self.pulled += 1
+                yield d
+        finally:
+            self.closed = True
+
+
+class _NDJSONOllama(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    parts = ["<nei>", "<goal>g</goal>", "</n", "ei>", " trailing", " text"]
+
+    def do_POST(self) -> None:
+        json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        try:
+            for i, part in enumerate(self.parts + [""]):
+                done = i == len(self.parts)
+                line = json.dumps({"message": {"role": "assistant", "content": part}, "done": done}).encode() + b"\n"
+                self.wfile.write(b"%x\r\n%s\r\n" % (len(line), line))
+                self.wfile.flush()
+                time.sleep(0.01)
+            self.wfile.write(b"0\r\n\r\n")
+        except OSError:
+            self.server.cancelled += 1  # type: ignore[attr-defined]
+
+    def log_message(self, *args: Any) -> None:
+        pass
+
+
+class TestStreaming(unittest.TestCase):
+    def test_default_stream_falls_back_to_chat(self) -> None:
+        deltas = list(MockLLM().stream("hello", model="mock-model"))
+        self.assertEqual(len(deltas), 1)
+        self.assertIn("hello", deltas[0])
+
+    def test_stop_across_deltas(self) -> None:
+        llm = _ChunkLLM(["ab", "c</n", "ei>tail", "more", "never"])
+        out = list(llm.stream("x", model="m", stop=["</nei>", "zz"]))
+        self.assertEqual("".join(out), "abc</nei>")
+        self.assertEqual(llm.pulled, 3)
+        self.assertTrue(llm.closed)
+
+        client = LLMClient(llm=_ChunkLLM(["a", "STOP", "b"]), model="m", max_concurrency=1)
+
+        async def run() -> str:
+            return "".join([d async for d in client.astream("x", stop=["STOP"])])
+
+        self.assertEqual(asyncio.run(run()), "aSTOP")
+
+    def test_astream_cancel_and_aclose(self) -> None:
+        class SlowChunks(_ChunkLLM):
+            def _stream(self, **kwargs: Any) -> Iterator[str]:
+                for d in super()._stream(**kwargs):
+                    time.sleep(0.1)
+                    yield d
+
+        llm = SlowChunks(["a", "b", "c"])
+        client = LLMClient(llm=llm, model="m", max_concurrency=1)
+
+        async def run() -> None:
+            async def consume() -> None:
+                async with contextlib.aclosing(client.astream("x")) as deltas:
+                    async for _ in deltas:
+                        pass
+
+            task = asyncio.create_task(consume())
+            await asyncio.sleep(0.05)  # inside the first next()
+            task.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await task
+            self.assertTrue(llm.closed)
+            self.assertEqual(llm.pulled, 1)
+
+            deltas = client.astream("x")
+            self.assertEqual(await deltas.__anext__(), "a")
+            await deltas.aclose()  # releases the only slot
+            self.assertEqual((await asyncio.wait_for(client.arespond("x"), 1)).text, "abc")
+
+        asyncio.run(run())
+
+    def test_ollama_ndjson_stream(self) -> None:
+        server = ThreadingHTTPServer(("127.0.0.1", 0), _NDJSONOllama)
+        server.cancelled = 0  # type: ignore[attr-defined]
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        try:
+            pool = HTTPConnectionPool(base_url=f"http://127.0.0.1:{server.server_address[1]}")
+            llm = OllamaLLM(base_url=pool.base_url, pool=pool)
+
+            full = "".join(llm.stream("q", model="m"))
+            self.assertEqual(full, "".join(_NDJSONOllama.parts))
+
+            cut = "".join(llm.stream("q", model="m", stop=["</nei>"]))
+            self.assertEqual(cut, "<nei><goal>g</goal></nei>")
+            deadline = time.time() + 2
+            while server.cancelled == 0 and time.time() < deadline:  # type: ignore[attr-defined]
+                time.sleep(0.01)
+            self.assertEqual(server.cancelled, 1)  # type: ignore[attr-defined]
+            pool.close()
+        finally:
+            server.shutdown()
+            server.server_close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,119 @@
+import json
+import threading
+import time
+import unittest
+import urllib.error
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+
+from memory_base.llm.providers import OllamaLLM
+from memory_base.llm.transport import HTTPConnectionPool
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+    peers: set[Any]
+    requests: int
+    drop_next: int
+    close_idle: bool
+
+    def do_POST(self) -> None:
+        payload = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        server = self.server
+        with server.lock:  # type: ignore[attr-defined]
+            server.peers.add(self.client_address)  # type: ignore[attr-defined]
+            if server.drop_next > 0:  # type: ignore[attr-defined]
+                # Simulate a keep-alive connection reset by the server.
+                server.drop_next -= 1  # type: ignore[attr-defined]
+                self.close_connection = True
+                return
+        if self.path.endswith("/fail"):
+            body = b"boom"
+            self.send_response(500)
+        else:
+            content = payload["messages"][-1]["content"] if "messages" in payload else payload
+            body = json.dumps({"message": {"role": "assistant", "content": content}}).encode("utf-8")
+            self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+        if server.close_idle:  # type: ignore[attr-defined]
+            # Keep-alive response, but the server drops the connection right after
+            # (as on its idle timeout): the client only notices on reuse.
+            self.close_connection = True
+
+    def log_message(self, *args: Any) -> None:
+        pass
+
+
+class TestHTTPConnectionPool(unittest.TestCase):
+    def setUp(self) -> None:
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+        self.server.lock = threading.Lock()  # type: ignore[attr-defined]
+        self.server.peers = set()  # type: ignore[attr-defined]
+        self.server.drop_next = 0  # type: ignore[attr-defined]
+        self.server.close_idle = False  # type: ignore[attr-defined]
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+
+    def tearDown(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_keep_alive_reuse(self) -> None:
+        pool = HTTPConnectionPool(base_url=self.url)
+        llm = OllamaLLM(base_url=self.url, pool=pool)
+        for i in range(5):
+            self.assertEqual(llm.respond(f"q{i}", model="m").text, f"q{i}")
+        self.assertEqual(len(self.server.peers), 1)  # type: ignore[attr-defined]
+        pool.close()
+
+    def test_pool_bound_under_threads(self) -> None:
+        pool = HTTPConnectionPool(base_url=self.url, max_connections=2)
+        with ThreadPoolExecutor(max_workers=8) as ex:
+            out = list(ex.map(lambda i: pool.post_json("/api/x", {"i": i})["message"]["content"], range(32)))
+        self.assertEqual(out, [{"i": i} for i in range(32)])
+        self.assertLessEqual(len(self.server.peers), 2)  # type: ignore[attr-defined]
+        pool.close()
+
+    def test_retry_and_errors(self) -> None:
+        pool = HTTPConnectionPool(base_url=self.url, backoff_s=0.0)
+        self.server.drop_next = 2  # type: ignore[attr-defined]
+        self.assertEqual(pool.post_json("/api/x", {"a": 1})["message"]["content"], {"a": 1})
+
+        self.server.drop_next = 5  # type: ignore[attr-defined]
+        with self.assertRaises(urllib.error.URLError):
+            pool.post_json("/api/x", {})
+        self.server.drop_next = 0  # type: ignore[attr-defined]
+
+        with self.assertRaises(urllib.error.HTTPError) as ctx:
+            pool.post_json("/api/fail", {})
+        self.assertEqual(ctx.exception.code, 500)
+        pool.close()
+
+        with self.assertRaises(RuntimeError):
+            OllamaLLM(base_url="http://127.0.0.1:9", timeout_s=2).respond("x", model="m")
+
+    def test_stale_idle_connections_are_not_retries(self) -> None:
+        pool = HTTPConnectionPool(base_url=self.url, retries=1, backoff_s=0.0)
+        self.server.close_idle = True  # type: ignore[attr-defined]
+        body = json.dumps({"i": 0}).encode("utf-8")
+        headers = {"Content-Type": "application/json"}
+        streams = [pool.stream_lines("POST", "/api/x", body, headers=headers) for _ in range(4)]
+        for lines in streams:
+            next(lines)  # four connections in flight at once
+        for lines in streams:
+            list(lines)
+        self.assertEqual(len(pool._idle), 4)
+        time.sleep(0.05)  # let the server close them
+
+        self.server.close_idle = False  # type: ignore[attr-defined]
+        self.assertEqual(pool.post_json("/api/x", {"a": 1})["message"]["content"], {"a": 1})
+        self.assertEqual(len(pool._idle), 1)  # the stale ones were dropped
+        pool.close()
+
+
+if __name__ == "__main__":
+    unittest.main()